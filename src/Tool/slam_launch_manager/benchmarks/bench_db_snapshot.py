@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Copying a live RTAB-Map-sized database: shutil.copy2 vs db_snapshot
+
+Builds a synthetic SQLite database (blobs in an RTAB-Map-like Data table)
+and copies it while a separate writer process keeps committing to it, the
+way RTAB-Map does during mapping:
+
+    copy2      the former on-GUI-thread shutil.copy2, and whether the copy
+               passed PRAGMA integrity_check (a torn copy usually does not)
+    live       snapshot_database(live=True): paged online backup
+    quiescent  snapshot_database(live=False) with the writer stopped
+               (reflink or copy_file_range)
+
+For each: copy seconds, MB/s, verify seconds and the writer's worst commit
+latency during the copy (how long the copy held up RTAB-Map).
+
+    python3 benchmarks/bench_db_snapshot.py --size-mb 1024 --repeat 3 --json snapshot.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from slam_launch_manager.db_snapshot import snapshot_database  # noqa: E402
+
+# Commits a row every 1/rate s until killed; prints the worst commit latency (ms) on SIGTERM
+WRITER = r'''
+import os, signal, sqlite3, sys, time
+path, rate, journal = sys.argv[1], float(sys.argv[2]), sys.argv[3]
+connection = sqlite3.connect(path, timeout=60)
+connection.execute(f'PRAGMA journal_mode={journal}')
+worst = 0.0
+def report(signum, frame):
+    print(worst * 1000.0, flush=True)
+    sys.exit(0)
+signal.signal(signal.SIGTERM, report)
+print('ready', flush=True)
+while True:
+    t0 = time.monotonic()
+    connection.execute('INSERT INTO Data (image) VALUES (?)', (os.urandom(64 * 1024),))
+    connection.commit()
+    worst = max(worst, time.monotonic() - t0)
+    time.sleep(1.0 / rate)
+'''
+
+
+def build_database(path, size_mb, journal):
+    connection = sqlite3.connect(path)
+    connection.execute(f'PRAGMA journal_mode={journal}')
+    connection.execute('CREATE TABLE Data (id INTEGER PRIMARY KEY, image BLOB)')
+    blob = os.urandom(256 * 1024)
+    for _ in range(size_mb * 4):
+        connection.execute('INSERT INTO Data (image) VALUES (?)', (blob,))
+    connection.commit()
+    connection.close()
+
+
+def integrity_ok(path):
+    try:
+        connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        rows = connection.execute('PRAGMA integrity_check').fetchall()
+        connection.close()
+        return rows == [('ok',)]
+    except sqlite3.Error:
+        return False
+
+
+def with_writer(db_path, rate, journal, copy):
+    """Run copy() while the writer commits; returns (copy result, worst commit latency in ms)"""
+    writer = subprocess.Popen([sys.executable, '-c', WRITER, db_path, str(rate), journal],
+                              stdout=subprocess.PIPE, text=True)
+    writer.stdout.readline()
+    time.sleep(0.5)
+    try:
+        result = copy()
+    finally:
+        writer.terminate()
+        worst_ms = float(writer.stdout.readline() or 'nan')
+        writer.wait()
+    return result, worst_ms
+
+
+def run_once(workdir, args):
+    db_path = os.path.join(workdir, 'rtabmap.db')
+    build_database(db_path, args.size_mb, args.journal)
+    size = os.path.getsize(db_path)
+    results = {}
+
+    def copy2():
+        target = os.path.join(workdir, 'copy2.db')
+        t0 = time.perf_counter()
+        shutil.copy2(db_path, target)
+        seconds = time.perf_counter() - t0
+        return {'copy_s': seconds, 'verify_s': None, 'ok': integrity_ok(target), 'method': 'copy2'}
+
+    def snapshot(name, live):
+        def copy():
+            result = snapshot_database(db_path, os.path.join(workdir, f'{name}.db'), live=live)
+            return {'copy_s': result.copy_seconds, 'verify_s': result.verify_seconds,
+                    'ok': True, 'method': result.method}
+        return copy
+
+    for name, copy in (('copy2', copy2), ('live', snapshot('live', True))):
+        result, worst_ms = with_writer(db_path, args.write_hz, args.journal, copy)
+        result['writer_worst_ms'] = worst_ms
+        results[name] = result
+    result = snapshot('quiescent', False)()
+    result['writer_worst_ms'] = None
+    results['quiescent'] = result
+    for result in results.values():
+        result['mb_s'] = size / 1e6 / result['copy_s'] if result['copy_s'] > 0 else None
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=256)
+    parser.add_argument('--write-hz', type=float, default=20.0)
+    parser.add_argument('--journal', choices=['wal', 'delete'], default='wal')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--dir', help='where to build the databases (default: a temp dir)')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory(dir=args.dir, prefix='bench-db-snapshot-') as workdir:
+            runs.append(run_once(workdir, args))
+
+    summary = {}
+    for name in runs[0]:
+        entries = [run[name] for run in runs]
+        summary[name] = {
+            'method': entries[-1]['method'],
+            'copy_s': statistics.median(e['copy_s'] for e in entries),
+            'mb_s': statistics.median(e['mb_s'] for e in entries if e['mb_s'] is not None),
+            'verify_s': (statistics.median(e['verify_s'] for e in entries)
+                         if entries[0]['verify_s'] is not None else None),
+            'intact': sum(e['ok'] for e in entries),
+            'writer_worst_ms': (max(e['writer_worst_ms'] for e in entries)
+                                if entries[0]['writer_worst_ms'] is not None else None),
+        }
+    for name, s in summary.items():
+        verify = f"{s['verify_s']:.2f}s" if s['verify_s'] is not None else '-'
+        worst = f"{s['writer_worst_ms']:.0f} ms" if s['writer_worst_ms'] is not None else '-'
+        print(f"{name:<10} {s['method']:<22} copy {s['copy_s']:.2f}s ({s['mb_s']:.0f} MB/s)  "
+              f"verify {verify}  intact {s['intact']}/{args.repeat}  writer worst {worst}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': vars(args), 'summary': summary, 'runs': runs}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Time from start request to first launched process: `ros2 launch` CLI vs warm worker
+
+Needs a sourced ROS 2 environment. A stub launch file with a single
+ExecuteProcess action stands in for a node; "first node started" is the
+moment its process shows up under the launch process in /proc.
+
+    source /opt/ros/humble/setup.bash
+    python3 benchmarks/bench_launch_latency.py --repeat 10 --json launch_latency.json
+"""
+
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from slam_launch_manager.launch_worker_pool import LaunchWorkerPool  # noqa: E402
+from slam_launch_manager.proc_tree import ProcessSnapshot  # noqa: E402
+
+STUB_LAUNCH = '''
+from launch import LaunchDescription
+from launch.actions import ExecuteProcess
+
+
+def generate_launch_description():
+    return LaunchDescription([ExecuteProcess(cmd=['sleep', '600'])])
+'''
+
+
+def wait_first_child(pid, timeout=30.0):
+    """Seconds until pid has a descendant process, None on timeout"""
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < timeout:
+        if len(ProcessSnapshot.take().tree(pid)) > 1:
+            return time.perf_counter() - t0
+        time.sleep(0.001)
+    return None
+
+
+def stop(pid):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def run_cli(launch_file):
+    t0 = time.perf_counter()
+    process = subprocess.Popen(['ros2', 'launch', launch_file], stdin=subprocess.DEVNULL,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               start_new_session=True)
+    spawn = time.perf_counter() - t0
+    first_child = wait_first_child(process.pid)
+    stop(process.pid)
+    process.wait()
+    return spawn + first_child if first_child is not None else None
+
+
+def run_worker(pool, launch_file):
+    # Let the pool refill so each sample measures a warm worker, not a spawn
+    deadline = time.monotonic() + 30.0
+    while pool.idle_count() < pool.size and time.monotonic() < deadline:
+        time.sleep(0.05)
+    time.sleep(1.0)
+    t0 = time.perf_counter()
+    process = pool.launch(launch_file)
+    if process is None:
+        return None
+    spawn = time.perf_counter() - t0
+    first_child = wait_first_child(process.pid)
+    stop(process.pid)
+    process.wait()
+    return spawn + first_child if first_child is not None else None
+
+
+def summarize(samples):
+    samples = [s * 1000.0 for s in samples if s is not None]
+    if not samples:
+        return None
+    return {
+        'n': len(samples),
+        'mean_ms': statistics.mean(samples),
+        'median_ms': statistics.median(samples),
+        'min_ms': min(samples),
+        'max_ms': max(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        launch_file = os.path.join(tmp, 'stub.launch.py')
+        Path(launch_file).write_text(STUB_LAUNCH)
+
+        cli = [run_cli(launch_file) for _ in range(args.repeat)]
+
+        env = dict(os.environ)
+        pool = LaunchWorkerPool(1, lambda: env, cwd=tmp, log=print)
+        pool.start()
+        try:
+            worker = [run_worker(pool, launch_file) for _ in range(args.repeat)]
+        finally:
+            pool.shutdown()
+
+    results = {'cli': summarize(cli), 'warm_worker': summarize(worker)}
+    if results['cli'] and results['warm_worker']:
+        results['saved_ms'] = results['cli']['median_ms'] - results['warm_worker']['median_ms']
+    print(json.dumps(results, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
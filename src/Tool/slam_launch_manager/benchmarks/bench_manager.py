@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""Startup and interaction latency of the launch manager against stub launch files
+
+Builds a throwaway workspace with a stub launch file at every path
+auto_detect_launch_files() looks at: the DSS bridge stub runs a small
+publisher on the bridge sensor topics, the others only start a sleeping
+process. Its install/setup.bash only chains the ROS 2 underlay the benchmark
+runs with, and every cache lives in the temp dir, so nothing of the user's
+~/ros2_ws or ~/.cache is read or written. Each repetition is a fresh interpreter on the offscreen Qt platform
+that sets up SlamLaunchManagerUI and the node the way run_gui() does, then
+starts and stops every launch key through the supervisor and records:
+
+    startup_ms       process start to the first painted frame
+    set_node_ms      ui.set_node() (includes the first launch file detection)
+    detect_ms        a repeated auto_detect_launch_files()
+    start_ms[key]    start request to the start job finishing
+    ready_ms[key]    the node's time_to_ready, if the launch became ready
+    stop_ms[key]     stop request to the stop job finishing
+    sensor_ok_ms     DSS start request to the window showing a LiDAR rate
+
+Starts that fail or time out are listed under failed_starts; the benchmark
+exits with status 1 if there were any.
+
+Needs a sourced ROS 2 environment and PyQt5.
+
+    source /opt/ros/humble/setup.bash
+    python3 benchmarks/bench_manager.py --repeat 10 --json manager.json
+    python3 benchmarks/bench_manager.py --repeat 10 --compare manager.json
+"""
+
+import time
+
+T_START = time.perf_counter()
+
+import argparse  # noqa: E402
+import functools  # noqa: E402
+import json  # noqa: E402
+import os  # noqa: E402
+import platform  # noqa: E402
+import statistics  # noqa: E402
+import subprocess  # noqa: E402
+import sys  # noqa: E402
+import tempfile  # noqa: E402
+from pathlib import Path  # noqa: E402
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PACKAGE_DIR))
+
+# Where each backend's launch file sits in the DSS workspace, relative to src/;
+# the directory above launch/ becomes a package of that name
+STUB_LAUNCH_FILES = {
+    'dss': 'dss_ros2_bridge/dss_ros2_bridge/launch/launch.py',
+    'dss_lio_sam': 'SLAM/LIO-SAM/dss_lio_sam/launch/run.launch.py',
+    'dss_lio_sam_loc': 'SLAM/LIO-SAM/dss_lio_sam/launch/run_localization.launch.py',
+    'rtabmap': 'SLAM/RTAB-MAP/dss_rtabmap_slam/launch/rtabmap_with_rviz.launch.py',
+    'rtabmap_loc': 'SLAM/RTAB-MAP/dss_rtabmap_localization/launch/rtabmap_localization.launch.py',
+    'kissicp': 'SLAM/KISS-ICP/dss_kiss_icp/launch/run.launch.py',
+    'slamtoolbox': 'SLAM/SLAM-Toolbox/dss_slam_toolbox/launch/slam_mapping.launch.py',
+    'slamtoolbox_loc': 'SLAM/SLAM-Toolbox/dss_slam_toolbox/launch/slam_localization.launch.py',
+    'hdl_slam': 'SLAM/HDL/hdl_graph_slam_ros2/launch/hdl_graph_slam.launch.py',
+    'hdl_loc': 'SLAM/HDL/hdl_localization_ros2/hdl_localization/launch/hdl_localization.launch.py',
+}
+
+STUB_LAUNCH = '''
+from launch import LaunchDescription
+from launch.actions import ExecuteProcess
+
+
+def generate_launch_description():
+    return LaunchDescription([ExecuteProcess(cmd={cmd!r})])
+'''
+
+SENSOR_PUBLISHER = '''
+import rclpy
+from rclpy.qos import qos_profile_sensor_data
+from sensor_msgs.msg import Image, Imu, NavSatFix, PointCloud2
+
+rclpy.init()
+node = rclpy.create_node('stub_dss_bridge')
+publishers = [
+    (node.create_publisher(PointCloud2, '/dss/sensor/lidar3d', qos_profile_sensor_data), PointCloud2),
+    (node.create_publisher(Imu, '/dss/sensor/imu', qos_profile_sensor_data), Imu),
+    (node.create_publisher(Image, '/dss/sensor/camera/rgb', qos_profile_sensor_data), Image),
+    (node.create_publisher(NavSatFix, '/dss/sensor/gps/fix', qos_profile_sensor_data), NavSatFix),
+]
+
+
+def publish():
+    stamp = node.get_clock().now().to_msg()
+    for publisher, msg_type in publishers:
+        msg = msg_type()
+        msg.header.stamp = stamp
+        publisher.publish(msg)
+
+
+node.create_timer(0.1, publish)
+rclpy.spin(node)
+'''
+
+
+# Overlay of the stub workspace: the underlay only (COLCON_CURRENT_PREFIX is
+# what install_tree_fingerprint() follows)
+STUB_SETUP = '''COLCON_CURRENT_PREFIX="{underlay}"
+source "$COLCON_CURRENT_PREFIX/setup.bash"
+'''
+
+
+def ros_underlay():
+    """Prefix of the sourced ROS 2 distribution"""
+    distro = os.environ.get('ROS_DISTRO')
+    for prefix in os.environ.get('AMENT_PREFIX_PATH', '').split(os.pathsep):
+        if prefix and (distro is None or prefix.rstrip('/').endswith(distro)) \
+                and os.path.exists(os.path.join(prefix, 'setup.bash')):
+            return prefix
+    sys.exit('No sourced ROS 2 underlay found (source /opt/ros/<distro>/setup.bash first)')
+
+
+def make_workspace(root):
+    """Stub workspace under root, returns its src/ directory"""
+    src = Path(root) / 'src'
+    install = Path(root) / 'install'
+    install.mkdir()
+    (install / 'setup.bash').write_text(STUB_SETUP.format(underlay=ros_underlay()))
+    publisher = Path(root) / 'stub_sensor_publisher.py'
+    publisher.write_text(SENSOR_PUBLISHER)
+    for launch_key, relative_path in STUB_LAUNCH_FILES.items():
+        cmd = [sys.executable, str(publisher)] if launch_key == 'dss' else ['sleep', '600']
+        launch_file = src / relative_path
+        launch_file.parent.mkdir(parents=True, exist_ok=True)
+        launch_file.write_text(STUB_LAUNCH.format(cmd=cmd))
+        package_dir = launch_file.parent.parent
+        (package_dir / 'package.xml').write_text(f'<package><name>{package_dir.name}</name></package>\n')
+    return src
+
+
+def run_child(src, launch_keys, timeout):
+    """One repetition inside this interpreter, returns its timings"""
+    from PyQt5 import QtWidgets
+    import rclpy
+
+    from slam_launch_manager import slam_launch_manager_node
+    from slam_launch_manager.launch_manager_ui import SlamLaunchManagerUI
+    from slam_launch_manager.ros_env import RosEnvironmentCache
+    from slam_launch_manager.ros_executor import RosSpinThread
+    from slam_launch_manager.slam_launch_manager_node import SlamLaunchManagerNode
+
+    # The throwaway workspace's caches stay in its temp dir instead of piling
+    # up in ~/.cache/slam_launch_manager; launches source its own setup.bash
+    root = Path(src).parent
+    cache_dir = root / 'cache'
+    slam_launch_manager_node.SRC_PATH = Path(src)
+    slam_launch_manager_node.RosEnvironmentCache = functools.partial(
+        RosEnvironmentCache, setup_script=root / 'install' / 'setup.bash',
+        cache_file=cache_dir / 'ros_env.json')
+    rclpy.init()
+    app = QtWidgets.QApplication(sys.argv[:1])
+
+    def pump(predicate):
+        """Run the Qt loop until predicate() holds (ROS callbacks run on the spin thread)"""
+        deadline = time.perf_counter() + timeout
+        while not predicate():
+            if time.perf_counter() > deadline:
+                return None
+            app.processEvents()
+            time.sleep(0.001)
+        return time.perf_counter()
+
+    ui = SlamLaunchManagerUI()
+    node = SlamLaunchManagerNode(log=ui.log, defer_subscriptions=True)
+    node.launch_index.cache_path = cache_dir / node.launch_index.cache_path.name
+    node.launch_arguments.cache_path = cache_dir / node.launch_arguments.cache_path.name
+    t0 = time.perf_counter()
+    ui.set_node(node)
+    results = {'set_node_ms': (time.perf_counter() - t0) * 1000.0}
+    spin_thread = RosSpinThread(node)
+    spin_thread.start()
+    painted = []
+    ui.show()
+    ui.after_first_paint(lambda: painted.append(time.perf_counter()))
+    ui.after_first_paint(node.create_sensor_subscriptions)
+    pump(lambda: painted)
+    results['startup_ms'] = (painted[0] - T_START) * 1000.0
+
+    t0 = time.perf_counter()
+    node.auto_detect_launch_files()
+    results['detect_ms'] = (time.perf_counter() - t0) * 1000.0
+
+    results.update(start_ms={}, ready_ms={}, stop_ms={}, sensor_ok_ms=None, failed_starts={})
+    try:
+        for launch_key in launch_keys:
+            t0 = time.perf_counter()
+            job = node.start_launch_async(launch_key, node.launch_files[launch_key])
+            t_done = pump(job.done)
+            if t_done is None or not job.ok:
+                results['failed_starts'][launch_key] = (
+                    'timed out' if t_done is None else
+                    str(job.future.exception() or 'start returned False'))
+                continue
+            results['start_ms'][launch_key] = (t_done - t0) * 1000.0
+            if launch_key == 'dss':
+                t_ok = pump(lambda: not ui.lblLidarStatus.text().endswith('--'))
+                if t_ok is not None:
+                    results['sensor_ok_ms'] = (t_ok - t0) * 1000.0
+            pump(lambda: launch_key in node.time_to_ready)
+            if launch_key in node.time_to_ready:
+                results['ready_ms'][launch_key] = node.time_to_ready[launch_key] * 1000.0
+
+            t0 = time.perf_counter()
+            job = node.stop_launch_async(launch_key)
+            t_done = pump(job.done)
+            if t_done is not None and job.ok:
+                results['stop_ms'][launch_key] = (t_done - t0) * 1000.0
+    finally:
+        node.shutdown()
+        spin_thread.stop()
+        node.destroy_node()
+        rclpy.shutdown()
+    return results
+
+
+def run_repetition(src, launch_keys, timeout):
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    result = subprocess.run(
+        [sys.executable, __file__, '--child', str(src), '--timeout', str(timeout),
+         '--keys', ','.join(launch_keys)],
+        capture_output=True, text=True, env=env, timeout=timeout * (2 * len(launch_keys) + 4))
+    if result.returncode != 0:
+        raise RuntimeError(f'repetition failed:\n{result.stderr}')
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    samples = [s for s in samples if s is not None]
+    if not samples:
+        return None
+    return {
+        'n': len(samples),
+        'mean_ms': statistics.mean(samples),
+        'median_ms': statistics.median(samples),
+        'min_ms': min(samples),
+        'max_ms': max(samples),
+    }
+
+
+def aggregate(runs, launch_keys):
+    results = {name: summarize([run[name] for run in runs])
+               for name in ('startup_ms', 'set_node_ms', 'detect_ms', 'sensor_ok_ms')}
+    for name in ('start_ms', 'ready_ms', 'stop_ms'):
+        results[name] = {key: summarize([run[name].get(key) for run in runs]) for key in launch_keys}
+    failed = {}
+    for run in runs:
+        for key, reason in run['failed_starts'].items():
+            failed.setdefault(key, []).append(reason)
+    results['failed_starts'] = failed
+    return results
+
+
+def git_revision():
+    result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PACKAGE_DIR,
+                            capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def compare(baseline, current, path=''):
+    """Median differences between two result trees, as (name, baseline, current) rows"""
+    rows = []
+    for name, value in current.items():
+        old = baseline.get(name) if isinstance(baseline, dict) else None
+        if isinstance(value, dict) and 'median_ms' in value:
+            if isinstance(old, dict) and 'median_ms' in old:
+                rows.append((path + name, old['median_ms'], value['median_ms']))
+        elif isinstance(value, dict):
+            rows.extend(compare(old or {}, value, f'{path}{name}.'))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--keys', default=','.join(STUB_LAUNCH_FILES),
+                        help='comma separated launch keys to start and stop')
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help='seconds to wait for each step')
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--compare', help='print median changes against a previous --json file')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    launch_keys = [key for key in args.keys.split(',') if key]
+
+    if args.child:
+        print(json.dumps(run_child(args.child, launch_keys, args.timeout)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = make_workspace(tmp)
+        runs = [run_repetition(src, launch_keys, args.timeout) for _ in range(args.repeat)]
+
+    results = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'repeat': args.repeat,
+        'results': aggregate(runs, launch_keys),
+        'runs': runs,
+    }
+    print(json.dumps(results['results'], indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        print(f"\n{'':<32}{baseline.get('revision') or 'baseline':>12}{results['revision'] or 'current':>12}")
+        for name, old, new in compare(baseline['results'], results['results']):
+            print(f'{name:<32}{old:>10.1f}ms{new:>10.1f}ms  {(new - old) / old * 100.0:+6.1f}%')
+    failed = results['results']['failed_starts']
+    if failed:
+        for key, reasons in failed.items():
+            print(f"{key}: {len(reasons)}/{args.repeat} starts failed ({reasons[0]})", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Compare recursive `pgrep -P` tree collection with a single /proc snapshot
+
+Spawns a synthetic process tree shaped like a launch (one leader, a few
+composable containers, each with several nodes) and times both ways of
+collecting it.
+
+    python3 benchmarks/bench_proc_tree.py --fanout 4 --depth 3 --repeat 20
+"""
+
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from slam_launch_manager.proc_tree import ProcessSnapshot  # noqa: E402
+
+
+def pgrep_tree(pid):
+    """The recursive pgrep walk stop_launch_file used before the /proc snapshot"""
+    try:
+        result = subprocess.run(['pgrep', '-P', str(pid)], capture_output=True,
+                                text=True, timeout=2)
+        child_pids = [int(p) for p in result.stdout.strip().split('\n') if p]
+        all_pids = child_pids.copy()
+        for child_pid in child_pids:
+            all_pids.extend(pgrep_tree(child_pid))
+        return all_pids
+    except Exception:
+        return []
+
+
+def snapshot_tree(pid):
+    return [info.pid for info in ProcessSnapshot.take().tree(pid)][1:]
+
+
+def spawn_tree(fanout, depth):
+    """Start a bash process tree with fanout children per level, returns the leader"""
+    script = 'sleep 600'
+    for _ in range(depth):
+        children = ' '.join(f'( {script} ) &' for _ in range(fanout))
+        script = f'{children} wait'
+    return subprocess.Popen(['bash', '-c', script], start_new_session=True)
+
+
+def time_it(fn, pid, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(pid)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return result, samples
+
+
+def summarize(samples):
+    return {
+        'mean_ms': statistics.mean(samples),
+        'median_ms': statistics.median(samples),
+        'min_ms': min(samples),
+        'max_ms': max(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fanout', type=int, default=4)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    leader = spawn_tree(args.fanout, args.depth)
+    try:
+        # Let bash fork the whole tree before measuring
+        expected = sum(args.fanout ** level for level in range(1, args.depth + 1))
+        deadline = time.monotonic() + 5.0
+        while len(snapshot_tree(leader.pid)) < expected and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        pgrep_pids, pgrep_samples = time_it(pgrep_tree, leader.pid, args.repeat)
+        snap_pids, snap_samples = time_it(snapshot_tree, leader.pid, args.repeat)
+
+        results = {
+            'tree_size': len(snap_pids) + 1,
+            'same_pids': sorted(pgrep_pids) == sorted(snap_pids),
+            'pgrep': summarize(pgrep_samples),
+            'proc_snapshot': summarize(snap_samples),
+        }
+        results['speedup'] = results['pgrep']['median_ms'] / results['proc_snapshot']['median_ms']
+        print(json.dumps(results, indent=2))
+        if args.json:
+            Path(args.json).write_text(json.dumps(results, indent=2))
+    finally:
+        os.killpg(leader.pid, signal.SIGKILL)
+        leader.wait()
+
+
+if __name__ == '__main__':
+    main()
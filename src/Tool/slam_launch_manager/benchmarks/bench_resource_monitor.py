@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""CPU cost of the per-launch resource sampler on a synthetic launch tree
+
+Spawns a launch-shaped process tree (60 processes by default) whose children
+are Python processes with 16 threads each, waking every 50 ms like executor
+and DDS threads, and runs the ResourceMonitor at its normal period. Reports
+how much of one core the sampling thread used on average and how long a
+sample takes with and without the periodic /proc rescan and per-thread
+context switch read.
+
+    python3 benchmarks/bench_resource_monitor.py --processes 60 --threads 16 --seconds 10
+"""
+
+import argparse
+import json
+import os
+import shlex
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from slam_launch_manager.proc_tree import ProcessSnapshot, read_start_time  # noqa: E402
+from slam_launch_manager.resource_monitor import ResourceMonitor  # noqa: E402
+
+
+# A node stand-in: `threads` threads that wake up every 50 ms
+CHILD = '''
+import sys, threading, time
+def spin():
+    while True:
+        time.sleep(0.05)
+for _ in range(int(sys.argv[1]) - 1):
+    threading.Thread(target=spin, daemon=True).start()
+spin()
+'''
+
+
+def spawn_launch(processes, threads):
+    """Start a session leader with `processes` multi-threaded children, returns the leader"""
+    child = f"{shlex.quote(sys.executable)} -c {shlex.quote(CHILD)} {threads} &"
+    script = ' '.join(child for _ in range(processes)) + ' wait'
+    return subprocess.Popen(['bash', '-c', script], start_new_session=True)
+
+
+def time_samples(monitor, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.thread_time()
+        monitor.sample()
+        samples.append((time.thread_time() - t0) * 1000.0)
+    return samples
+
+
+def summarize(samples):
+    return {
+        'mean_ms': statistics.mean(samples),
+        'median_ms': statistics.median(samples),
+        'max_ms': max(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, default=60)
+    parser.add_argument('--threads', type=int, default=16, help='threads per child process')
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--period', type=float, default=1.0)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    leader = spawn_launch(args.processes, args.threads)
+    try:
+        deadline = time.monotonic() + 30.0
+        while (len(ProcessSnapshot.take().tree(leader.pid)) <= args.processes
+               and time.monotonic() < deadline):
+            time.sleep(0.05)
+        time.sleep(1.0)  # let the children start their threads
+        launches = {'bench': (leader.pid, read_start_time(leader.pid))}
+
+        steady = ResourceMonitor(lambda: launches, rescan_every=10 ** 9, thread_switches_every=10 ** 9)
+        steady.sample()
+        rescan = ResourceMonitor(lambda: launches, rescan_every=0, thread_switches_every=0)
+
+        monitor = ResourceMonitor(lambda: launches, period=args.period)
+        monitor.start()
+        time.sleep(args.seconds)
+        monitor.stop()
+
+        usage = monitor.latest('bench')
+        results = {
+            'processes': usage.processes if usage else None,
+            'threads': usage.threads if usage else None,
+            'ctxt_per_s': usage.ctxt_per_s if usage else None,
+            'core_fraction_percent': monitor.overhead * 100.0,
+            'sample': summarize(time_samples(steady, 20)),
+            'sample_with_rescan': summarize(time_samples(rescan, 20)),
+        }
+        print(json.dumps(results, indent=2))
+        if args.json:
+            Path(args.json).write_text(json.dumps(results, indent=2))
+    finally:
+        os.killpg(leader.pid, signal.SIGKILL)
+        leader.wait()
+
+
+if __name__ == '__main__':
+    main()
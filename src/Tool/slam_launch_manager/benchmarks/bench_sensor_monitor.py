@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""CPU cost of sensor liveness monitoring: deserializing subscriptions vs raw + header peek
+
+Two measurements:
+
+    decode        per-message cost of rclpy deserialize_message() versus
+                  peek_header_stamp() on the serialized bytes
+    subscription  CPU used by a monitoring process subscribed to the four DSS
+                  sensor topics, published at DSS rates by a separate process,
+                  once with deserializing callbacks and once with raw=True ones
+
+Needs a sourced ROS 2 environment.
+
+    source /opt/ros/humble/setup.bash
+    python3 benchmarks/bench_sensor_monitor.py --seconds 10 --json sensor_monitor.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import rclpy  # noqa: E402
+from rclpy.executors import SingleThreadedExecutor  # noqa: E402
+from rclpy.qos import qos_profile_sensor_data  # noqa: E402
+from rclpy.serialization import deserialize_message, serialize_message  # noqa: E402
+from sensor_msgs.msg import Image, Imu, NavSatFix, PointCloud2  # noqa: E402
+
+from slam_launch_manager.sensor_stats import SensorStats, peek_header_stamp  # noqa: E402
+
+TOPICS = {
+    'lidar': ('/dss/sensor/lidar3d', PointCloud2),
+    'imu': ('/dss/sensor/imu', Imu),
+    'camera': ('/dss/sensor/camera/rgb', Image),
+    'gps': ('/dss/sensor/gps/fix', NavSatFix),
+}
+
+# Publishes every topic at its rate until killed; argv[1] is a JSON config
+PUBLISHER = r'''
+import json, sys
+import rclpy
+from rclpy.qos import qos_profile_sensor_data
+from sensor_msgs.msg import Image, Imu, NavSatFix, PointCloud2, PointField
+
+config = json.loads(sys.argv[1])
+rclpy.init()
+node = rclpy.create_node('bench_sensor_publisher')
+
+cloud = PointCloud2(height=1, width=config['lidar_points'], point_step=16, is_dense=True)
+cloud.fields = [PointField(name=name, offset=4 * i, datatype=PointField.FLOAT32, count=1)
+                for i, name in enumerate('xyzi')]
+cloud.row_step = cloud.point_step * cloud.width
+cloud.data = bytes(cloud.row_step)
+width, height = config['camera_size']
+image = Image(width=width, height=height, encoding='rgb8', step=3 * width)
+image.data = bytes(image.step * height)
+
+messages = {
+    '/dss/sensor/lidar3d': (PointCloud2, cloud, config['lidar_hz']),
+    '/dss/sensor/imu': (Imu, Imu(), config['imu_hz']),
+    '/dss/sensor/camera/rgb': (Image, image, config['camera_hz']),
+    '/dss/sensor/gps/fix': (NavSatFix, NavSatFix(), config['gps_hz']),
+}
+for topic, (msg_type, msg, rate) in messages.items():
+    publisher = node.create_publisher(msg_type, topic, qos_profile_sensor_data)
+
+    def publish(publisher=publisher, msg=msg):
+        msg.header.stamp = node.get_clock().now().to_msg()
+        publisher.publish(msg)
+
+    node.create_timer(1.0 / rate, publish)
+rclpy.spin(node)
+'''
+
+
+def time_decode(msg, repeat):
+    data = serialize_message(msg)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        deserialize_message(data, type(msg))
+    deserialize_us = (time.perf_counter() - t0) / repeat * 1e6
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        peek_header_stamp(data)
+    peek_us = (time.perf_counter() - t0) / repeat * 1e6
+    return {'bytes': len(data), 'deserialize_us': deserialize_us, 'peek_us': peek_us}
+
+
+def run_monitor(raw, seconds):
+    """Process CPU (percent of one core) and messages received while monitoring"""
+    node = rclpy.create_node(f"bench_sensor_monitor_{'raw' if raw else 'deserialize'}")
+    stats = {name: SensorStats() for name in TOPICS}
+    for name, (topic, msg_type) in TOPICS.items():
+        if raw:
+            def callback(data, stats=stats[name]):
+                stats.update(time.time(), peek_header_stamp(data), len(data))
+        else:
+            def callback(msg, stats=stats[name]):
+                stats.update(time.time(), msg.header.stamp)
+        node.create_subscription(msg_type, topic, callback, qos_profile_sensor_data, raw=raw)
+    executor = SingleThreadedExecutor()
+    executor.add_node(node)
+
+    # Let discovery finish and the first messages arrive before measuring
+    warmup = time.monotonic() + 2.0
+    while time.monotonic() < warmup:
+        executor.spin_once(timeout_sec=0.1)
+    counts = {name: s.count for name, s in stats.items()}
+    cpu0, wall0 = time.process_time(), time.monotonic()
+    while time.monotonic() - wall0 < seconds:
+        executor.spin_once(timeout_sec=0.1)
+    cpu, wall = time.process_time() - cpu0, time.monotonic() - wall0
+    now = time.time()
+    result = {
+        'core_percent': cpu / wall * 100.0,
+        'messages': {name: s.count - counts[name] for name, s in stats.items()},
+        'rate_hz': {name: s.snapshot(now).rate_hz for name, s in stats.items()},
+    }
+    executor.shutdown()
+    node.destroy_node()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--lidar-points', type=int, default=131072)
+    parser.add_argument('--lidar-hz', type=float, default=10.0)
+    parser.add_argument('--camera-size', type=int, nargs=2, default=[1280, 720])
+    parser.add_argument('--camera-hz', type=float, default=15.0)
+    parser.add_argument('--imu-hz', type=float, default=200.0)
+    parser.add_argument('--gps-hz', type=float, default=10.0)
+    parser.add_argument('--decode-repeat', type=int, default=200)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+    config = {
+        'lidar_points': args.lidar_points, 'lidar_hz': args.lidar_hz,
+        'camera_size': args.camera_size, 'camera_hz': args.camera_hz,
+        'imu_hz': args.imu_hz, 'gps_hz': args.gps_hz,
+    }
+
+    rclpy.init()
+    cloud = PointCloud2(height=1, width=args.lidar_points, point_step=16)
+    cloud.data = bytes(cloud.point_step * cloud.width)
+    image = Image(width=args.camera_size[0], height=args.camera_size[1], step=3 * args.camera_size[0])
+    image.data = bytes(image.step * image.height)
+    decode = {
+        'lidar': time_decode(cloud, args.decode_repeat),
+        'imu': time_decode(Imu(), args.decode_repeat * 10),
+        'camera': time_decode(image, args.decode_repeat),
+        'gps': time_decode(NavSatFix(), args.decode_repeat * 10),
+    }
+
+    publisher = subprocess.Popen([sys.executable, '-c', PUBLISHER, json.dumps(config)])
+    try:
+        subscription = {
+            'deserialize': run_monitor(False, args.seconds),
+            'raw': run_monitor(True, args.seconds),
+        }
+    finally:
+        publisher.terminate()
+        publisher.wait()
+        rclpy.shutdown()
+
+    results = {
+        'config': config,
+        'decode': decode,
+        'subscription': subscription,
+        'decode_speedup_median': statistics.median(
+            d['deserialize_us'] / d['peek_us'] for d in decode.values()),
+    }
+    print(json.dumps(results, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
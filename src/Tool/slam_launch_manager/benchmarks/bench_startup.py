@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Time from process start to the first painted frame of the launch manager window
+
+Each run is a fresh interpreter on the offscreen Qt platform that constructs
+SlamLaunchManagerUI and the node the way run_gui() does, and reports import
+time, window construction time and the time until the deferred first-paint
+callbacks run. Runs alternate between a precompiled form (in a temporary UI
+cache) and uic.loadUi, so both paths are measured on the same machine.
+
+    python3 benchmarks/bench_startup.py --runs 10 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1]
+
+# Runs in the child interpreter; argv[1] is the UI cache dir, argv[2] 'compiled' or 'loadUi'
+CHILD = r'''
+import json, sys, time
+t_start = time.perf_counter()
+from pathlib import Path
+from slam_launch_manager import ui_compiler
+ui_compiler.UI_CACHE_DIR = Path(sys.argv[1])
+if sys.argv[2] == 'compiled':
+    ui_file = Path(ui_compiler.__file__).parent / 'ui' / 'slam_launch_manager.ui'
+    ui_compiler.compile_ui(ui_file, ui_compiler.UI_CACHE_DIR / ui_compiler.compiled_path(ui_file).name)
+    t_start = time.perf_counter()
+
+from PyQt5 import QtWidgets
+import rclpy
+t_qt = time.perf_counter()
+from slam_launch_manager.launch_manager_ui import SlamLaunchManagerUI
+from slam_launch_manager.slam_launch_manager_node import SlamLaunchManagerNode
+t_imports = time.perf_counter()
+
+rclpy.init()
+app = QtWidgets.QApplication(sys.argv[:1])
+ui = SlamLaunchManagerUI()
+t_window = time.perf_counter()
+node = SlamLaunchManagerNode(log=ui.log, defer_subscriptions=True)
+ui.set_node(node)
+ui.show()
+t_shown = time.perf_counter()
+result = {}
+
+def first_paint():
+    result['first_paint'] = time.perf_counter()
+    node.create_sensor_subscriptions()
+    result['subscribed'] = time.perf_counter()
+    app.quit()
+
+ui.after_first_paint(first_paint)
+app.exec_()
+print(json.dumps({
+    'mode': ui.ui_load_mode,
+    'qt_rclpy_import_ms': (t_qt - t_start) * 1000.0,
+    'package_import_ms': (t_imports - t_qt) * 1000.0,
+    'window_ms': (t_window - t_imports) * 1000.0,
+    'node_ms': (t_shown - t_window) * 1000.0,
+    'first_paint_ms': (result['first_paint'] - t_start) * 1000.0,
+    'deferred_subscriptions_ms': (result['subscribed'] - result['first_paint']) * 1000.0,
+}))
+node.shutdown()
+node.destroy_node()
+rclpy.shutdown()
+'''
+
+
+def run_child(cache_dir, mode):
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(PACKAGE_DIR), env.get('PYTHONPATH')]))
+    t0 = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', CHILD, cache_dir, mode],
+                            capture_output=True, text=True, env=env, timeout=60)
+    wall_ms = (time.perf_counter() - t0) * 1000.0
+    if result.returncode != 0:
+        raise RuntimeError(f'{mode} run failed:\n{result.stderr}')
+    sample = json.loads(result.stdout.strip().splitlines()[-1])
+    sample['process_wall_ms'] = wall_ms
+    return sample
+
+
+def summarize(samples):
+    return {
+        'mean_ms': statistics.mean(samples),
+        'median_ms': statistics.median(samples),
+        'max_ms': max(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    runs = {'compiled': [], 'loadUi': []}
+    for _ in range(args.runs):
+        for mode in runs:
+            # A fresh cache per run so a loadUi run never sees the compiled copy
+            with tempfile.TemporaryDirectory() as cache_dir:
+                runs[mode].append(run_child(cache_dir, mode))
+
+    results = {}
+    for mode, samples in runs.items():
+        results[mode] = {
+            'load_mode': sorted({sample['mode'] for sample in samples}),
+            **{key[:-3]: summarize([sample[key] for sample in samples])
+               for key in samples[0] if key.endswith('_ms')},
+        }
+    print(json.dumps(results, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
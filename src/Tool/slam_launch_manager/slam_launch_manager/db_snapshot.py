@@ -0,0 +1,254 @@
+"""Consistent, verified copies of an SQLite database that may be in use (the RTAB-Map map)
+
+A database that is being written is copied with SQLite's online backup API
+a few thousand pages per step, reporting progress after each. In WAL mode
+(RTAB-Map's default) the source connection holds one read transaction across
+all steps: the copy is of a single snapshot and the writer never waits. With
+a rollback journal the lock is released between steps so the writer is only
+held up for one step at a time; SQLite restarts the backup whenever the
+source was written in between, and after a few restarts the rest is copied
+in one step. A quiescent database (no writer, no WAL content or hot journal)
+is cloned with FICLONE where the filesystem shares extents (btrfs, XFS),
+otherwise copied in the kernel with copy_file_range; if it changes during
+the copy the backup API is used after all.
+
+The copy is written next to the destination, checked with PRAGMA
+integrity_check (or quick_check) and only then renamed into place.
+
+    python3 -m slam_launch_manager.db_snapshot ~/.ros/rtabmap.db /tmp/map.db --live
+"""
+
+import argparse
+import errno
+import fcntl
+import os
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+from urllib.parse import quote
+
+# phase is 'copy' or 'verify'; total_bytes is the source size (0 if unknown)
+SnapshotProgress = namedtuple('SnapshotProgress', ['phase', 'copied_bytes', 'total_bytes', 'elapsed', 'method'])
+SnapshotResult = namedtuple('SnapshotResult', ['method', 'size_bytes', 'copy_seconds', 'verify_seconds'])
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# Pages per backup step (RTAB-Map uses 4 KiB pages by default, so ~16 MiB)
+BACKUP_PAGES_PER_STEP = 4096
+# Restarts caused by writes to the source before copying in one step
+BACKUP_MAX_RESTARTS = 3
+COPY_CHUNK_BYTES = 64 * 1024 * 1024
+PROGRESS_INTERVAL = 0.5
+
+
+class SnapshotError(Exception):
+    """The copy could not be made or did not pass the integrity check"""
+
+
+class _BackupRestarted(Exception):
+    pass
+
+
+def is_quiescent(path):
+    """True if nothing committed lives outside the main file (no WAL content, no hot journal)"""
+    for suffix in ('-wal', '-journal'):
+        try:
+            if os.path.getsize(path + suffix) > 0:
+                return False
+        except OSError:
+            pass
+    return True
+
+
+def format_progress(progress):
+    """'1.2 / 3.4 GB (35%, 310 MB/s)' style text of a SnapshotProgress"""
+    rate = progress.copied_bytes / progress.elapsed / 1e6 if progress.elapsed > 0 else 0.0
+    copied = f"{progress.copied_bytes / 1e9:.2f}"
+    if progress.total_bytes:
+        percent = 100.0 * progress.copied_bytes / progress.total_bytes
+        return (f"{progress.phase} {copied} / {progress.total_bytes / 1e9:.2f} GB "
+                f"({percent:.0f}%, {rate:.0f} MB/s, {progress.method})")
+    return f"{progress.phase} {copied} GB ({rate:.0f} MB/s, {progress.method})"
+
+
+class _Reporter:
+    """Calls progress(SnapshotProgress) at most every PROGRESS_INTERVAL seconds, and checks for cancellation"""
+
+    def __init__(self, progress, check_cancelled, total_bytes):
+        self.progress = progress
+        self.check_cancelled = check_cancelled
+        self.total_bytes = total_bytes
+        self.started = time.monotonic()
+        self._last = 0.0
+
+    def __call__(self, phase, copied_bytes, method, force=False):
+        if self.check_cancelled is not None:
+            self.check_cancelled()
+        now = time.monotonic()
+        if self.progress is not None and (force or now - self._last >= PROGRESS_INTERVAL):
+            self._last = now
+            self.progress(SnapshotProgress(phase, copied_bytes, self.total_bytes, now - self.started, method))
+
+
+def _reflink(src_fd, dst_fd):
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError as e:
+        if e.errno in (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.EPERM):
+            return False
+        raise
+
+
+def _copy_file(source, partial, report):
+    """Clone or kernel-copy source to partial; returns the method used"""
+    size = os.path.getsize(source)
+    with open(source, 'rb') as src, open(partial, 'wb') as dst:
+        if _reflink(src.fileno(), dst.fileno()):
+            report('copy', size, 'reflink', force=True)
+            return 'reflink'
+        method = 'copy_file_range'
+        copied = 0
+        while True:
+            if method == 'copy_file_range':
+                try:
+                    n = os.copy_file_range(src.fileno(), dst.fileno(), COPY_CHUNK_BYTES)
+                except OSError as e:
+                    if copied or e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                        raise
+                    # Not supported between these filesystems
+                    method = 'read/write'
+                    continue
+            else:
+                chunk = src.read(COPY_CHUNK_BYTES)
+                dst.write(chunk)
+                n = len(chunk)
+            if n == 0:
+                break
+            copied += n
+            report('copy', copied, method)
+        report('copy', copied, method, force=True)
+        return method
+
+
+def _backup(source, partial, report, pages_per_step):
+    """Copy with the online backup API; returns the method used"""
+    src = sqlite3.connect(f'file:{quote(source)}?mode=ro', uri=True, timeout=30.0, isolation_level=None)
+    dst = sqlite3.connect(partial)
+    try:
+        page_size = src.execute('PRAGMA page_size').fetchone()[0]
+        wal = src.execute('PRAGMA journal_mode').fetchone()[0].lower() == 'wal'
+        if wal:
+            # A read transaction pins one WAL snapshot across all steps, so the
+            # backup never restarts and the writer is not held up at all
+            src.execute('BEGIN')
+            src.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+        state = {'remaining': None, 'restarts': 0}
+
+        def step(_status, remaining, total):
+            # SQLite starts over when another connection wrote to the source
+            if state['remaining'] is not None and remaining > state['remaining']:
+                state['restarts'] += 1
+                if state['restarts'] > BACKUP_MAX_RESTARTS:
+                    raise _BackupRestarted()
+            state['remaining'] = remaining
+            report('copy', (total - remaining) * page_size, 'backup')
+
+        try:
+            src.backup(dst, pages=pages_per_step, progress=step, sleep=0.05)
+            method = 'backup (wal snapshot)' if wal else 'backup'
+        except _BackupRestarted:
+            # Writes keep arriving: one step holds a read lock for the whole copy
+            src.backup(dst, pages=-1)
+            method = 'backup (single step)'
+        if wal:
+            src.execute('COMMIT')
+        report('copy', os.path.getsize(partial), method, force=True)
+        return method
+    finally:
+        dst.close()
+        src.close()
+
+
+def _verify(path, check):
+    connection = sqlite3.connect(f'file:{quote(path)}?mode=ro', uri=True)
+    try:
+        rows = [row[0] for row in connection.execute(f'PRAGMA {check}')]
+    finally:
+        connection.close()
+    if rows != ['ok']:
+        raise SnapshotError(f"{check} of the copy failed: {'; '.join(map(str, rows[:5]))}")
+
+
+def snapshot_database(source, destination, live=True, progress=None, check_cancelled=None,
+                      verify='integrity_check', pages_per_step=BACKUP_PAGES_PER_STEP):
+    """Copy the SQLite database source to destination and verify the copy
+
+    live: the database may be written to while copying (use the backup API).
+    progress(SnapshotProgress) is called from this thread while copying;
+    check_cancelled() is called as often and may raise to abort. verify is
+    'integrity_check', 'quick_check' or None. Returns a SnapshotResult;
+    raises SnapshotError, sqlite3.Error or OSError (destination untouched).
+    """
+    source = os.path.abspath(os.path.expanduser(source))
+    destination = os.path.abspath(os.path.expanduser(destination))
+    if not os.path.exists(source):
+        raise SnapshotError(f"Database file not found: {source}")
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        raise SnapshotError("Source and destination are the same file")
+
+    report = _Reporter(progress, check_cancelled, os.path.getsize(source))
+    partial = os.path.join(os.path.dirname(destination), f'.{os.path.basename(destination)}.partial')
+    try:
+        method = None
+        if not live and is_quiescent(source):
+            before = os.stat(source)
+            method = _copy_file(source, partial, report)
+            after = os.stat(source)
+            if (before.st_mtime_ns, before.st_size) != (after.st_mtime_ns, after.st_size) or not is_quiescent(source):
+                method = None  # written to after all
+        if method is None:
+            if os.path.exists(partial):
+                os.remove(partial)
+            method = _backup(source, partial, report, pages_per_step)
+        copy_seconds = time.monotonic() - report.started
+
+        verify_started = time.monotonic()
+        if verify:
+            report('verify', os.path.getsize(partial), method, force=True)
+            _verify(partial, verify)
+        verify_seconds = time.monotonic() - verify_started
+
+        os.replace(partial, destination)
+        return SnapshotResult(method, os.path.getsize(destination), copy_seconds, verify_seconds)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Copy an SQLite database consistently and verify the copy')
+    parser.add_argument('source')
+    parser.add_argument('destination')
+    parser.add_argument('--live', action='store_true', help='the database may be written to while copying')
+    parser.add_argument('--verify', choices=['integrity_check', 'quick_check', 'none'], default='integrity_check')
+    args = parser.parse_args(argv)
+
+    try:
+        result = snapshot_database(
+            args.source, args.destination, live=args.live,
+            progress=lambda p: print(format_progress(p), file=sys.stderr),
+            verify=None if args.verify == 'none' else args.verify)
+    except (SnapshotError, sqlite3.Error, OSError) as e:
+        print(f"snapshot failed: {e}", file=sys.stderr)
+        return 1
+    rate = result.size_bytes / result.copy_seconds / 1e6 if result.copy_seconds > 0 else 0.0
+    print(f"{result.method}: {result.size_bytes / 1e6:.1f} MB in {result.copy_seconds:.2f}s "
+          f"({rate:.0f} MB/s), verified in {result.verify_seconds:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Targeted DDS cleanup after a launch stops: graph confirmation and stale Fast DDS SHM files"""
+
+import fcntl
+import os
+import subprocess
+import time
+
+SHM_DIR = '/dev/shm'
+FASTDDS_SHM_PREFIX = 'fastrtps_'
+# Fast DDS keeps a robust lock file next to every segment/port: the owner holds
+# an exclusive flock on "<name>_el" and readers a shared one on "<name>_sl".
+# The kernel drops those locks when the owning process dies.
+_LOCK_SUFFIXES = ('_el', '_sl')
+
+
+def graph_node_names(node):
+    """Fully qualified names of all nodes currently in the ROS graph"""
+    return {f"{namespace.rstrip('/')}/{name}"
+            for name, namespace in node.get_node_names_and_namespaces()}
+
+
+def wait_nodes_gone(node, names, timeout=5.0, poll_interval=0.1):
+    """Wait until none of names is in the graph, returns the ones still present"""
+    deadline = time.monotonic() + timeout
+    remaining = set(names)
+    while remaining:
+        remaining &= graph_node_names(node)
+        if not remaining or time.monotonic() >= deadline:
+            break
+        time.sleep(poll_interval)
+    return remaining
+
+
+def _lock_is_free(path):
+    """True if nobody holds a flock on path, i.e. its owner has exited"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    except OSError:
+        return False
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return True
+    finally:
+        os.close(fd)
+
+
+def remove_stale_fastdds_segments(shm_dir=SHM_DIR):
+    """Delete Fast DDS shared-memory segments whose owning process is dead
+
+    Only files owned by this user and whose lock files nobody holds any more
+    are removed, which is the same test `fastdds shm clean` uses. Returns the
+    removed file names.
+    """
+    removed = []
+    uid = os.getuid()
+    try:
+        entries = list(os.scandir(shm_dir))
+    except OSError:
+        return removed
+
+    names = {entry.name for entry in entries}
+    for entry in entries:
+        name = entry.name
+        if not name.startswith(FASTDDS_SHM_PREFIX) or name.endswith(_LOCK_SUFFIXES):
+            continue
+        try:
+            if entry.stat(follow_symlinks=False).st_uid != uid:
+                continue
+        except OSError:
+            continue
+        locks = [name + suffix for suffix in _LOCK_SUFFIXES if name + suffix in names]
+        if not locks:
+            continue  # cannot tell whether the owner is alive
+        if not all(_lock_is_free(os.path.join(shm_dir, lock)) for lock in locks):
+            continue
+        for stale in [name] + locks:
+            try:
+                os.unlink(os.path.join(shm_dir, stale))
+                removed.append(stale)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                break
+    return removed
+
+
+def restart_ros2_daemon(delay=0.5):
+    """Heavy fallback: restart the ros2 CLI daemon so its graph cache starts fresh"""
+    subprocess.run(['ros2', 'daemon', 'stop'], timeout=5, capture_output=True)
+    time.sleep(delay)
+    subprocess.run(['ros2', 'daemon', 'start'], timeout=5, capture_output=True)
@@ -0,0 +1,235 @@
+"""Event-driven exit detection for launch processes (pidfd + epoll, waitpid fallback)"""
+
+import errno
+import os
+import select
+import threading
+import time
+from collections import namedtuple
+
+from slam_launch_manager.proc_tree import read_start_time
+
+# returncode follows the subprocess convention (-N = killed by signal N) and is
+# None when the process is not our child, so its status cannot be collected
+ExitEvent = namedtuple('ExitEvent', ['pid', 'returncode', 'exit_time'])
+
+
+def _returncode_from_waitid(result):
+    if result is None:
+        return None
+    if result.si_code == os.CLD_EXITED:
+        return result.si_status
+    return -result.si_status
+
+
+def _returncode_from_status(status):
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _settle(process, returncode):
+    """Record a status the watcher collected on the child's Popen
+
+    With returncode set, Popen.__del__ neither warns nor queues the PID for
+    subprocess._cleanup(). A status that could not be collected counts as 0,
+    as in ProcessTracker.poll().
+    """
+    if process is not None and process.returncode is None:
+        process.returncode = returncode if returncode is not None else 0
+
+
+class ProcessTracker:
+    """Popen-like handle for a launch process whose exit is reported by ExitWatcher
+
+    process is the Popen the launch was started with, if any. It is kept
+    referenced until the exit watcher reaped the PID: a dropped Popen of a
+    running child ends up in subprocess._active, and the next Popen() anywhere
+    would reap it with waitpid(WNOHANG) before the watcher could.
+    """
+
+    def __init__(self, pid, process=None):
+        self.pid = pid
+        self.process = process
+        self.start_time = read_start_time(pid)
+        self.started_at = time.time()
+        self.returncode = None
+        self.exit_time = None
+        self.exited = threading.Event()
+        self.stopping = False
+        self.cgroup = None
+        self.graph_nodes_before = None
+        self.ready_at = None
+        self.time_to_ready = None
+
+    def poll(self):
+        """None while running, otherwise the exit code (0 if it could not be collected)"""
+        if not self.exited.is_set():
+            return None
+        return self.returncode if self.returncode is not None else 0
+
+    def wait(self, timeout=None):
+        """Block until the process exited, returns False on timeout"""
+        return self.exited.wait(timeout)
+
+    def set_exited(self, event):
+        self.returncode = event.returncode
+        self.exit_time = event.exit_time
+        self.exited.set()
+
+
+class ExitWatcher:
+    """Reports process exits the moment they happen, without polling
+
+    Each watched PID gets a pidfd registered with one epoll instance serviced
+    by a single thread that sleeps until a process exits. Children are reaped
+    with waitid(P_PIDFD) so their exit status is reported. On kernels or
+    Pythons without pidfd_open, a thread blocked in waitpid() is used per
+    child instead. The watcher is the only reaper of a watched child: the
+    status it collected is written back to the child's Popen, if given, so
+    subprocess never waits on the PID itself.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_fd = {}
+        self._by_pid = {}
+        self._epoll = None
+        self._wake_r = self._wake_w = None
+        self._thread = None
+        self._closed = False
+        self._use_pidfd = hasattr(os, 'pidfd_open')
+
+    def watch(self, pid, callback, process=None):
+        """Call callback(ExitEvent) from the watcher thread once pid exits
+
+        process is pid's Popen, which must not be polled or waited on meanwhile.
+        """
+        if self._use_pidfd:
+            try:
+                pidfd = os.pidfd_open(pid)
+            except ProcessLookupError:
+                returncode = self._reap_now(pid)
+                _settle(process, returncode)
+                callback(ExitEvent(pid, returncode, time.time()))
+                return
+            except OSError as e:
+                if e.errno not in (errno.ENOSYS, errno.EPERM):
+                    raise
+                self._use_pidfd = False
+            else:
+                self._ensure_thread()
+                with self._lock:
+                    self._by_fd[pidfd] = (pid, callback, process)
+                    self._by_pid[pid] = pidfd
+                self._epoll.register(pidfd, select.EPOLLIN)
+                return
+        self._watch_with_waitpid(pid, callback, process)
+
+    def unwatch(self, pid):
+        """Stop watching pid without reporting its exit"""
+        with self._lock:
+            pidfd = self._by_pid.pop(pid, None)
+            if pidfd is None:
+                return
+            self._by_fd.pop(pidfd, None)
+        self._close_pidfd(pidfd)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            fds = list(self._by_fd)
+            self._by_fd.clear()
+            self._by_pid.clear()
+        for pidfd in fds:
+            self._close_pidfd(pidfd)
+        if self._wake_w is not None:
+            os.write(self._wake_w, b'x')
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._epoll = select.epoll()
+            self._wake_r, self._wake_w = os.pipe()
+            self._epoll.register(self._wake_r, select.EPOLLIN)
+            self._thread = threading.Thread(target=self._run, name='exit-watcher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                events = self._epoll.poll()
+            except InterruptedError:
+                continue
+            for fd, _mask in events:
+                if fd == self._wake_r:
+                    if self._closed:
+                        self._epoll.close()
+                        os.close(self._wake_r)
+                        os.close(self._wake_w)
+                        return
+                    continue
+                with self._lock:
+                    entry = self._by_fd.pop(fd, None)
+                    if entry is not None:
+                        self._by_pid.pop(entry[0], None)
+                if entry is None:
+                    continue
+                pid, callback, process = entry
+                exit_time = time.time()
+                returncode = None
+                try:
+                    returncode = _returncode_from_waitid(
+                        os.waitid(os.P_PIDFD, fd, os.WEXITED | os.WNOHANG))
+                except (ChildProcessError, AttributeError, OSError):
+                    pass  # not our child, the exit is still reported
+                self._close_pidfd(fd)
+                _settle(process, returncode)
+                self._notify(callback, ExitEvent(pid, returncode, exit_time))
+
+    def _close_pidfd(self, pidfd):
+        try:
+            if self._epoll is not None:
+                self._epoll.unregister(pidfd)
+        except (OSError, ValueError):
+            pass
+        try:
+            os.close(pidfd)
+        except OSError:
+            pass
+
+    def _watch_with_waitpid(self, pid, callback, process):
+        def wait_for_exit():
+            try:
+                _, status = os.waitpid(pid, 0)
+                returncode = _returncode_from_status(status)
+            except ChildProcessError:
+                # Not our child: waitpid cannot block on it, fall back to a slow
+                # liveness check that also catches PID reuse via the start time
+                start_time = read_start_time(pid)
+                while start_time is not None and read_start_time(pid) == start_time:
+                    time.sleep(1.0)
+                returncode = None
+            _settle(process, returncode)
+            if not self._closed:
+                self._notify(callback, ExitEvent(pid, returncode, time.time()))
+
+        threading.Thread(target=wait_for_exit, name=f'exit-watcher-{pid}', daemon=True).start()
+
+    @staticmethod
+    def _reap_now(pid):
+        try:
+            _, status = os.waitpid(pid, os.WNOHANG)
+            return _returncode_from_status(status)
+        except ChildProcessError:
+            return None
+
+    @staticmethod
+    def _notify(callback, event):
+        try:
+            callback(event)
+        except Exception:
+            pass
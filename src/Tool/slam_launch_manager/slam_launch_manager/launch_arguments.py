@@ -0,0 +1,210 @@
+"""Declared launch arguments of launch files, introspected off-process and cached by file hash"""
+
+import difflib
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+WORKER_SCRIPT = Path(__file__).resolve().parent / 'launch_arguments_worker.py'
+LAUNCH_ARGUMENTS_CACHE = Path.home() / '.cache' / 'slam_launch_manager' / 'launch_arguments.json'
+
+# Limits of the introspection worker; loading a description runs the launch
+# file's Python but must not start anything heavy
+WORKER_TIMEOUT = 20.0
+WORKER_CPU_SECONDS = 15
+WORKER_MEMORY_BYTES = 2 * 1024 ** 3
+
+# Version of the worker's result; cached results of another version are dropped
+RESULT_FORMAT = 3
+
+# errors would make `ros2 launch` fail (or are certainly typos); warnings are
+# names that may be declared where introspection could not see
+ArgumentCheck = namedtuple('ArgumentCheck', ['errors', 'warnings'])
+
+
+def file_digest(path):
+    """sha256 of the file's content, None if it cannot be read"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def validate_arguments(declared, extra_args):
+    """ArgumentCheck of extra_args (['name:=value', ...]) against declared arguments
+
+    declared is a worker result ({'arguments': ..., 'complete': ...}).
+    Malformed arguments, values outside an argument's choices and missing
+    required arguments (no default, declared unconditionally in the file
+    itself, as `ros2 launch` enforces) are errors. A name nothing declares is
+    an error only if the worker saw the whole tree (complete); otherwise
+    `ros2 launch` may pass it to an include that could not be loaded, so it
+    is a warning. Both come with the closest declared names.
+    """
+    arguments = declared['arguments']
+    errors = []
+    warnings = []
+    given = set()
+    for argument in extra_args or ():
+        name, sep, value = argument.partition(':=')
+        if not sep or not name:
+            errors.append(f"malformed launch argument '{argument}', expected 'name:=value'")
+            continue
+        given.add(name)
+        spec = arguments.get(name)
+        if spec is None:
+            close = difflib.get_close_matches(name, arguments, n=3)
+            hint = f" (did you mean {', '.join(close)}?)" if close else ''
+            if declared.get('complete', False):
+                errors.append(f"unknown launch argument '{name}'{hint}")
+            else:
+                warnings.append(f"launch argument '{name}' is not declared where it could be "
+                                f"introspected{hint}")
+        elif spec.get('choices') and value not in spec['choices']:
+            errors.append(f"'{name}' must be one of {', '.join(spec['choices'])}, got '{value}'")
+    for name, spec in arguments.items():
+        if spec.get('required') and name not in given:
+            errors.append(f"required launch argument '{name}' not given")
+    return ArgumentCheck(errors, warnings)
+
+
+class LaunchArgumentIntrospector:
+    """Declared arguments of launch files, computed in a sandboxed worker process
+
+    Each launch file is loaded (never run) by launch_arguments_worker.py in its
+    own session with CPU/memory limits, in a scratch directory, with the
+    launch environment from env_provider. Results are cached on disk by the sha256 of the file
+    content, so a lookup after the first one is a hash and a dict access.
+    A cached result also records the digests of the files it included and is
+    stale (introspected again) once any of them changed.
+    """
+
+    def __init__(self, env_provider, cache_path=LAUNCH_ARGUMENTS_CACHE, max_workers=2):
+        self.env_provider = env_provider
+        self.cache_path = Path(cache_path)
+        self._cache = None
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix='launch-arguments')
+
+    def cached(self, launch_file):
+        """Cached result for the current content of launch_file, None if not known yet"""
+        digest = file_digest(launch_file)
+        if digest is None:
+            return None
+        with self._lock:
+            result = self._load_cache().get(digest)
+        return result if result is not None and self._fresh(result) else None
+
+    @staticmethod
+    def _fresh(result):
+        """True unless a file the result included changed since it was introspected"""
+        return all(file_digest(path) == digest
+                   for path, digest in result.get('include_digests', {}).items())
+
+    def arguments(self, launch_file, timeout=WORKER_TIMEOUT):
+        """Result for launch_file, introspecting it now if needed
+
+        {'error': message} if the file could not be loaded (cached too, so a
+        broken file is not retried until it changes), None on timeout.
+        """
+        result = self.cached(launch_file)
+        if result is not None:
+            return result
+        try:
+            return self.prefetch([launch_file])[0].result(timeout)
+        except Exception:
+            return None
+
+    def prefetch(self, launch_files):
+        """Introspect launch files in the background; returns their futures"""
+        futures = []
+        for launch_file in launch_files:
+            digest = file_digest(launch_file)
+            if digest is None:
+                continue
+            with self._lock:
+                future = self._inflight.get(digest)
+                if future is None:
+                    future = self._pool.submit(self._introspect, launch_file, digest)
+                    self._inflight[digest] = future
+            futures.append(future)
+        return futures
+
+    def validate(self, launch_file, extra_args):
+        """ArgumentCheck of extra_args for launch_file, None if its arguments are not known yet
+
+        Never waits for the worker: on a cache miss the file is introspected
+        in the background, for the next start, and this start is not checked.
+        """
+        declared = self.cached(launch_file)
+        if declared is None:
+            self.prefetch([launch_file])
+            return None
+        if 'error' in declared:
+            return None
+        return validate_arguments(declared, extra_args)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _introspect(self, launch_file, digest):
+        try:
+            with self._lock:
+                result = self._load_cache().get(digest)
+            if result is not None and self._fresh(result):
+                return result
+            with tempfile.TemporaryDirectory(prefix='launch-arguments-') as scratch:
+                process = subprocess.run(
+                    [sys.executable, str(WORKER_SCRIPT), str(launch_file),
+                     str(WORKER_CPU_SECONDS), str(WORKER_MEMORY_BYTES)],
+                    env=self.env_provider(), cwd=scratch, stdin=subprocess.DEVNULL,
+                    capture_output=True, text=True, timeout=WORKER_TIMEOUT,
+                    start_new_session=True)
+            if process.returncode == 0:
+                result = json.loads(process.stdout.strip().splitlines()[-1])
+                result['include_digests'] = {path: file_digest(path)
+                                             for path in result.pop('includes', [])}
+            else:
+                stderr = process.stderr.strip()
+                result = {'format': RESULT_FORMAT,
+                          'error': stderr.splitlines()[-1] if stderr
+                          else f'introspection worker exited with {process.returncode}'}
+            with self._lock:
+                self._load_cache()[digest] = result
+                self._save_cache()
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(digest, None)
+
+    def _load_cache(self):
+        if self._cache is None:
+            try:
+                self._cache = json.loads(self.cache_path.read_text())
+            except (OSError, ValueError):
+                self._cache = {}
+            self._cache = {digest: result for digest, result in self._cache.items()
+                           if isinstance(result, dict) and result.get('format') == RESULT_FORMAT}
+        return self._cache
+
+    def _save_cache(self):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f'.{self.cache_path.name}.{os.getpid()}.tmp')
+            tmp_path.write_text(json.dumps(self._cache))
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
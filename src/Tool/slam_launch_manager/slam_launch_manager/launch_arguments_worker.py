@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Sandboxed launch-argument introspection: prints the arguments a launch file declares
+
+Started by LaunchArgumentIntrospector as `python3 launch_arguments_worker.py
+<launch_file> <cpu_seconds> <memory_bytes>` in a scratch directory; it applies
+those limits to itself before importing anything. It loads
+the file's LaunchDescription (Python, XML or YAML) without running it and
+writes one JSON object to stdout:
+
+    {"format": 3,
+     "arguments": {name: {"default": str or null, "description": str,
+                          "choices": [str] or null, "required": bool}},
+     "complete": bool,
+     "includes": [path]}
+
+default is null for arguments without a default; a default made of
+substitutions that need a running launch (e.g. another argument) is shown
+unevaluated. required mirrors what `ros2 launch` enforces: no default,
+declared in the file itself (not in an include, whose arguments the file may
+pass through launch_arguments=) and not conditionally. complete is true only
+if every include could be loaded and nothing declares entities at run time
+(OpaqueFunction); otherwise a name missing from arguments may still be
+declared somewhere and is not an error. includes are the files of the
+includes that were loaded, so the caller can tell when the result is stale.
+This file is executed by path and must not import slam_launch_manager.
+"""
+
+import json
+import os
+import resource
+import sys
+
+if __name__ == '__main__':
+    # Limit the worker before the launch file's own code gets to run
+    for limit, value in ((resource.RLIMIT_CPU, sys.argv[2]), (resource.RLIMIT_AS, sys.argv[3])):
+        resource.setrlimit(limit, (int(value), int(value)))
+
+from launch import LaunchContext, actions  # noqa: E402
+from launch.launch_description_sources import get_launch_description_from_any_launch_file  # noqa: E402
+from launch.substitutions import TextSubstitution  # noqa: E402
+from launch.utilities import perform_substitutions  # noqa: E402
+
+
+def describe_default(default_value):
+    """Text of a default; substitutions that need a running launch are shown described"""
+    if default_value is None:
+        return None
+    if all(isinstance(sub, TextSubstitution) for sub in default_value):
+        return ''.join(sub.text for sub in default_value)
+    try:
+        return perform_substitutions(LaunchContext(), default_value)
+    except Exception:
+        return ''.join(sub.describe() for sub in default_value)
+
+
+# Not in every launch release; isinstance(x, ()) is always False
+RESET_LAUNCH_CONFIGURATIONS = getattr(actions, 'ResetLaunchConfigurations', ())
+
+
+def collect_arguments(entities, declared, includes, top_level=True, conditional=False):
+    """Walk entities like LaunchDescription.get_launch_arguments(), noting where each argument sits
+
+    declared maps name -> (DeclareLaunchArgument, required by `ros2 launch`);
+    the files of loaded includes are added to the set includes. Returns False
+    if some part of the tree could not be described.
+    """
+    complete = True
+    for entity in entities:
+        if isinstance(entity, actions.DeclareLaunchArgument) and entity.name not in declared:
+            required = (top_level and not conditional and entity.condition is None
+                        and entity.default_value is None)
+            declared[entity.name] = (entity, required)
+        if isinstance(entity, RESET_LAUNCH_CONFIGURATIONS):
+            # Later arguments cannot be set from the command line
+            return complete
+        if isinstance(entity, actions.OpaqueFunction):
+            complete = False  # its entities only exist once it runs
+        include = isinstance(entity, actions.IncludeLaunchDescription)
+        try:
+            # An include that cannot be loaded describes no sub-entities, it does not raise
+            sub_entities = entity.describe_sub_entities()
+            conditional_sub_entities = entity.describe_conditional_sub_entities()
+        except Exception:
+            sub_entities, conditional_sub_entities = [], []
+            complete = False
+        if include and not sub_entities:
+            complete = False
+        elif include:
+            # Resolved by describe_sub_entities() loading it
+            location = getattr(entity.launch_description_source, 'location', None)
+            if isinstance(location, str) and os.path.isfile(location):
+                includes.add(os.path.abspath(location))
+        nested_top_level = top_level and not include
+        complete &= collect_arguments(sub_entities, declared, includes, nested_top_level, conditional)
+        for _condition, conditional_entities in conditional_sub_entities:
+            complete &= collect_arguments(conditional_entities, declared, includes, nested_top_level, True)
+    return complete
+
+
+def introspect(launch_file):
+    description = get_launch_description_from_any_launch_file(launch_file)
+    declared = {}
+    includes = set()
+    complete = collect_arguments(description.entities, declared, includes)
+    arguments = {}
+    for name, (argument, required) in declared.items():
+        arguments[name] = {
+            'default': describe_default(argument.default_value),
+            'description': argument.description,
+            'choices': list(argument.choices) if getattr(argument, 'choices', None) else None,
+            'required': required,
+        }
+    return {'format': 3, 'arguments': arguments, 'complete': complete, 'includes': sorted(includes)}
+
+
+def main():
+    result = introspect(sys.argv[1])
+    sys.stdout.write(json.dumps(result) + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""Index of launch files from the ament resource index and the workspace sources
+
+Installed packages are listed by the ament resource index of every prefix in
+AMENT_PREFIX_PATH (<prefix>/share/ament_index/resource_index/packages/<pkg>),
+their launch files are under <prefix>/share/<pkg>/launch. Workspace packages
+are found like colcon does: directories with a package.xml, not descending
+into packages or COLCON_IGNORE'd directories; their launch files are under
+<package>/launch.
+
+The index is cached on disk together with the mtime of every directory (and
+package.xml) it read. A directory's mtime changes whenever an entry is added,
+removed or renamed in it, so comparing those mtimes tells whether a rescan is
+needed without walking the trees again.
+
+    python3 -m slam_launch_manager.launch_index --backend rtabmap
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# source is 'workspace' or 'installed'; package_dir is the package directory
+# (for a workspace package its name may differ from the package name)
+LaunchFile = namedtuple('LaunchFile', ['package', 'package_dir', 'path', 'source'])
+
+LAUNCH_INDEX_CACHE_DIR = Path.home() / '.cache' / 'slam_launch_manager'
+CACHE_VERSION = 1
+
+LAUNCH_EXTENSIONS = ('.py', '.xml', '.yaml', '.yml')
+SKIP_DIRS = {'build', 'install', 'log', '__pycache__', 'node_modules'}
+IGNORE_MARKERS = ('COLCON_IGNORE', 'AMENT_IGNORE')
+PACKAGE_INDEX = Path('share') / 'ament_index' / 'resource_index' / 'packages'
+
+# Packages holding each backend's launch files
+BACKEND_PACKAGES = {
+    'dss': ('dss_ros2_bridge',),
+    'dss_lio_sam': ('dss_lio_sam',),
+    'dss_lio_sam_loc': ('dss_lio_sam',),
+    'rtabmap': ('dss_rtabmap_slam',),
+    'rtabmap_loc': ('dss_rtabmap_localization',),
+    'kissicp': ('dss_kiss_icp',),
+    'slamtoolbox': ('dss_slam_toolbox',),
+    'slamtoolbox_loc': ('dss_slam_toolbox',),
+    'hdl_slam': ('hdl_graph_slam', 'hdl_graph_slam_ros2'),
+    'hdl_loc': ('hdl_localization',),
+}
+
+
+def _package_name(package_xml):
+    """<name> of a package.xml, None if it cannot be read"""
+    try:
+        text = Path(package_xml).read_text(errors='replace')
+    except OSError:
+        return None
+    start = text.find('<name>')
+    end = text.find('</name>', start)
+    if start < 0 or end < 0:
+        return None
+    return text[start + len('<name>'):end].strip() or None
+
+
+def _stamp(path, stamps):
+    try:
+        stamps[str(path)] = os.stat(path).st_mtime_ns
+        return True
+    except OSError:
+        stamps[str(path)] = None
+        return False
+
+
+def _package_launch_files(package, package_dir, source):
+    """Launch files under package_dir/launch and the stamps of the directories read"""
+    files = []
+    stamps = {}
+    launch_dir = os.path.join(package_dir, 'launch')
+    if not _stamp(launch_dir, stamps):
+        return files, stamps
+    for dirpath, dirnames, filenames in os.walk(launch_dir):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.')]
+        for dirname in dirnames:
+            _stamp(os.path.join(dirpath, dirname), stamps)
+        for filename in filenames:
+            if filename.endswith(LAUNCH_EXTENSIONS) and filename != '__init__.py':
+                files.append(LaunchFile(package, str(package_dir), os.path.join(dirpath, filename), source))
+    return files, stamps
+
+
+def _scan_workspace_tree(root):
+    """Launch files of the workspace packages under root, and the stamps read"""
+    files = []
+    stamps = {}
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        if not _stamp(directory, stamps):
+            continue
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        names = {entry.name for entry in entries}
+        if any(marker in names for marker in IGNORE_MARKERS):
+            continue
+        if 'package.xml' in names:
+            package_xml = os.path.join(directory, 'package.xml')
+            _stamp(package_xml, stamps)
+            package = _package_name(package_xml) or os.path.basename(directory)
+            package_files, package_stamps = _package_launch_files(package, directory, 'workspace')
+            files.extend(package_files)
+            stamps.update(package_stamps)
+            continue
+        for entry in entries:
+            if (entry.name not in SKIP_DIRS and not entry.name.startswith('.')
+                    and entry.is_dir(follow_symlinks=False)):
+                stack.append(entry.path)
+    return files, stamps
+
+
+def _installed_packages(prefixes):
+    """(package, share directory) of every package in the ament index, and the stamps read"""
+    packages = []
+    stamps = {}
+    for prefix in prefixes:
+        index_dir = Path(prefix) / PACKAGE_INDEX
+        if not _stamp(index_dir, stamps):
+            continue
+        try:
+            names = os.listdir(index_dir)
+        except OSError:
+            continue
+        packages.extend((name, Path(prefix) / 'share' / name) for name in names if not name.startswith('.'))
+    return packages, stamps
+
+
+def _ament_prefixes():
+    return [p for p in os.environ.get('AMENT_PREFIX_PATH', '').split(os.pathsep) if p]
+
+
+class LaunchIndex:
+    """Launch files by package, loaded from the disk cache and refreshed in the background
+
+    A workspace package shadows an installed one of the same name, like
+    sourcing the workspace overlay does.
+    """
+
+    def __init__(self, workspace_src, prefixes=None, cache_dir=LAUNCH_INDEX_CACHE_DIR, max_workers=8):
+        self.workspace_src = str(workspace_src)
+        self.prefixes = list(prefixes) if prefixes is not None else _ament_prefixes()
+        key = hashlib.sha1('\0'.join([self.workspace_src] + self.prefixes).encode()).hexdigest()[:12]
+        self.cache_path = Path(cache_dir) / f'launch_index_{key}.json'
+        self.max_workers = max_workers
+        self._files = []
+        self._by_package = {}
+        self._stamps = {}
+        self._refresh_lock = threading.Lock()
+
+    def load(self):
+        """Fill the index from the cache file (even if stale); False if there is none"""
+        try:
+            data = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return False
+        if (data.get('version') != CACHE_VERSION or data.get('workspace') != self.workspace_src
+                or data.get('prefixes') != self.prefixes):
+            return False
+        self._set([LaunchFile(*entry) for entry in data['files']], data['stamps'])
+        return True
+
+    def is_stale(self):
+        """True if any directory read by the last scan changed since"""
+        if not self._stamps:
+            return True
+        for path, mtime in self._stamps.items():
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime:
+                return True
+        return False
+
+    def rebuild(self):
+        """Rescan everything in parallel and save the cache; returns True if the files changed"""
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='launch-index') as pool:
+            installed, stamps = _installed_packages(self.prefixes)
+            tasks = [pool.submit(_package_launch_files, name, share, 'installed')
+                     for name, share in installed]
+            _stamp(self.workspace_src, stamps)
+            try:
+                roots = [entry.path for entry in os.scandir(self.workspace_src)
+                         if entry.is_dir(follow_symlinks=False) and entry.name not in SKIP_DIRS
+                         and not entry.name.startswith('.')]
+            except OSError:
+                roots = []
+            tasks += [pool.submit(_scan_workspace_tree, root) for root in roots]
+            files = []
+            for task in tasks:
+                task_files, task_stamps = task.result()
+                files.extend(task_files)
+                stamps.update(task_stamps)
+
+        files.sort(key=lambda f: (f.package, f.source != 'workspace', f.path))
+        changed = files != self._files
+        self._set(files, stamps)
+        self._save()
+        return changed
+
+    def refresh_async(self, callback=None):
+        """Rebuild in a background thread if stale, then call callback(index) if files changed"""
+        def refresh():
+            if not self._refresh_lock.acquire(blocking=False):
+                return  # a refresh is already running
+            try:
+                if self.is_stale() and self.rebuild() and callback is not None:
+                    callback(self)
+            finally:
+                self._refresh_lock.release()
+
+        thread = threading.Thread(target=refresh, name='launch-index-refresh', daemon=True)
+        thread.start()
+        return thread
+
+    def files(self, package=None):
+        """Launch files of package (name or workspace directory name), or all of them"""
+        if package is None:
+            return list(self._files)
+        return list(self._by_package.get(package, ()))
+
+    def packages(self):
+        return sorted({f.package for f in self._files})
+
+    def for_backend(self, launch_key):
+        """Launch files of the packages a backend (launch key) is made of"""
+        files = []
+        for package in BACKEND_PACKAGES.get(launch_key, ()):
+            files.extend(self.files(package))
+        return files
+
+    def find(self, package, filename):
+        """Path of filename in package's launch files, workspace sources first; None if absent"""
+        for launch_file in self.files(package):
+            if os.path.basename(launch_file.path) == filename:
+                return launch_file.path
+        return None
+
+    def _set(self, files, stamps):
+        by_package = {}
+        for launch_file in files:
+            by_package.setdefault(launch_file.package, []).append(launch_file)
+            directory_name = os.path.basename(launch_file.package_dir)
+            if directory_name != launch_file.package:
+                by_package.setdefault(directory_name, []).append(launch_file)
+        # Workspace packages shadow installed packages of the same name
+        for package, package_files in by_package.items():
+            if any(f.source == 'workspace' for f in package_files):
+                by_package[package] = [f for f in package_files if f.source == 'workspace']
+        self._files, self._by_package, self._stamps = files, by_package, stamps
+
+    def _save(self):
+        data = {
+            'version': CACHE_VERSION,
+            'workspace': self.workspace_src,
+            'prefixes': self.prefixes,
+            'stamps': self._stamps,
+            'files': [list(f) for f in self._files],
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f'.{self.cache_path.name}.{os.getpid()}.tmp')
+            tmp_path.write_text(json.dumps(data))
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='List indexed launch files')
+    parser.add_argument('--workspace', default=str(Path.home() / 'ros2_ws' / 'src'))
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--package', help='launch files of this package')
+    group.add_argument('--backend', help='launch files of this launch key, e.g. rtabmap')
+    parser.add_argument('--rebuild', action='store_true', help='rescan even if the cache is fresh')
+    args = parser.parse_args(argv)
+
+    index = LaunchIndex(args.workspace)
+    if args.rebuild or not index.load() or index.is_stale():
+        index.rebuild()
+    files = index.for_backend(args.backend) if args.backend else index.files(args.package)
+    for launch_file in files:
+        print(f'{launch_file.package:<32} {launch_file.source:<10} {launch_file.path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,1236 @@
+"""Qt window of the launch manager, a thin client of SlamLaunchManagerNode"""
+
+import os
+import re
+import codecs
+from collections import namedtuple
+from pathlib import Path
+
+from PyQt5 import QtWidgets
+from PyQt5.QtCore import Qt, QEvent, QObject, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QMessageBox
+
+from slam_launch_manager.launch_arguments import validate_arguments
+from slam_launch_manager.launch_stacks import STACKS, conflicting_keys, dependencies
+from slam_launch_manager.launch_state import LaunchStateModel
+from slam_launch_manager.log_sink import LEVELS, LogFilter, LogSink, format_event
+from slam_launch_manager.map_saver import MAP_SERVICES
+from slam_launch_manager.sensor_stats import format_sensor_stats, sensor_degraded
+from slam_launch_manager.slam_launch_manager_node import MAP_PATH, SRC_PATH
+from slam_launch_manager.ui_compiler import load_ui
+
+# The log widget keeps at most this many lines and is refreshed at this rate
+LOG_MAX_BLOCKS = 5000
+LOG_FRAME_RATE = 20
+
+# Start buttons and sensor labels are styled by dynamic properties through
+# this one window stylesheet; a state change re-polishes only that widget
+STATE_STYLE = """
+QPushButton[launchRole="start"] { color: white; font-weight: bold; padding: 10px; }
+QPushButton[accent="blue"] { background-color: #2196F3; }
+QPushButton[accent="deep-orange"] { background-color: #FF5722; }
+QPushButton[accent="orange"] { background-color: #FF9800; }
+QPushButton[accent="cyan"] { background-color: #00BCD4; }
+QPushButton[accent="pink"] { background-color: #E91E63; }
+QPushButton[accent="purple"] { background-color: #673AB7; }
+QPushButton[accent="teal"] { background-color: #009688; }
+QPushButton[launchRole="start"][running="true"] { background-color: #4CAF50; }
+QPushButton[launchRole="start"][running="false"]:disabled { background-color: #cccccc; color: #666666; }
+QLabel[sensorState="inactive"] { color: #666666; }
+QLabel[sensorState="ok"] { color: #4CAF50; font-weight: bold; }
+QLabel[sensorState="degraded"] { color: #FF9800; font-weight: bold; }
+"""
+
+# Widgets of one launch key; what gates its Start button is declared in
+# launch_stacks.LAUNCH_DEPENDENCIES. accent is the Start button color while
+# stopped (None: unstyled)
+LaunchControl = namedtuple('LaunchControl', ['start', 'stop', 'save', 'accent'])
+
+
+class LaunchJobSignals(QObject):
+    """Carries supervisor and executor events from worker threads to the Qt thread"""
+    job_finished = pyqtSignal(object)
+    job_submitted = pyqtSignal(object)
+    launch_exited = pyqtSignal(str, object)
+    launch_ready = pyqtSignal(str, float)
+    sensor_active = pyqtSignal(str)
+    launch_index_changed = pyqtSignal()
+    stack_finished = pyqtSignal(object)
+    map_save_progress = pyqtSignal(str, str)
+    log_pending = pyqtSignal()
+
+
+# Color and cursor escape sequences nodes print because they write to a pty
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+
+
+class LaunchOutputViewer(QtWidgets.QDialog):
+    """Tails the captured output of one launch straight from its ring buffer"""
+
+    def __init__(self, output_capture, launch_key, parent=None):
+        super().__init__(parent)
+        self.output_capture = output_capture
+        self.launch_key = launch_key
+        self.ring = None
+        self.offset = 0
+        self.decoder = None
+
+        self.setWindowTitle(f"Output: {launch_key}")
+        self.resize(900, 500)
+        self.text = QtWidgets.QPlainTextEdit(self)
+        self.text.setReadOnly(True)
+        self.text.setMaximumBlockCount(5000)
+        self.text.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.text)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(200)
+        self.refresh()
+
+    def refresh(self):
+        ring = self.output_capture.ring(self.launch_key)
+        if ring is None:
+            return
+        if ring is not self.ring:
+            # New run of the launch: start over on its buffer
+            self.ring = ring
+            self.offset = 0
+            self.decoder = codecs.getincrementaldecoder('utf-8')('replace')
+            self.text.clear()
+        if ring.written == self.offset:
+            return
+        # Decode directly from the ring's memory; the writer only waits for this
+        with ring.view(self.offset) as (segments, end, dropped):
+            text = ''.join(self.decoder.decode(segment) for segment in segments)
+        self.offset = end
+        if dropped:
+            text = f"... {dropped} bytes dropped ...\n" + text
+        text = ANSI_ESCAPE.sub('', text).replace('\r\n', '\n')
+        at_bottom = (self.text.verticalScrollBar().value()
+                     == self.text.verticalScrollBar().maximum())
+        cursor = self.text.textCursor()
+        cursor.movePosition(cursor.End)
+        cursor.insertText(text)
+        if at_bottom:
+            self.text.verticalScrollBar().setValue(self.text.verticalScrollBar().maximum())
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        super().closeEvent(event)
+
+
+class SlamLaunchManagerUI(QtWidgets.QMainWindow):
+    def __init__(self):
+        super().__init__()
+
+        # Load UI file (precompiled form if available, see ui_compiler)
+        ui_file = Path(__file__).parent / 'ui' / 'slam_launch_manager.ui'
+        self.ui_load_mode = load_ui(ui_file, self)
+        self._first_paint_callbacks = []
+
+        # ROS2 node (will be initialized later)
+        self.node = None
+
+        # Signals emitted from supervisor threads are delivered on the Qt thread
+        self.job_signals = LaunchJobSignals()
+        self.job_signals.job_finished.connect(self.on_launch_job_finished)
+        self.job_signals.job_submitted.connect(self.update_button_states)
+        self.job_signals.launch_exited.connect(self.on_launch_exited)
+        self.job_signals.launch_ready.connect(self.on_launch_ready)
+        self.job_signals.sensor_active.connect(self.on_sensor_active)
+        self.job_signals.launch_index_changed.connect(self.update_launch_file_completer)
+        self.job_signals.stack_finished.connect(self.on_stack_finished)
+        self.job_signals.map_save_progress.connect(self.on_map_save_progress)
+        self._job_messages = {}
+        self._map_save_dialogs = {}
+
+        # Set when the process is asked to quit (SIGINT/SIGTERM): close
+        # without asking, still stopping every launch
+        self.shutdown_requested = False
+
+        # Connect buttons - DSS Bridge
+        self.btnStartDSS.clicked.connect(self.on_start_dss)
+        self.btnStopDSS.clicked.connect(self.on_stop_dss)
+
+        # Livox and LIO-SAM tabs removed (DSS-only environment)
+
+        self.btnStartDssLioSam.clicked.connect(self.on_start_dss_lio_sam)
+        self.btnStopDssLioSam.clicked.connect(self.on_stop_dss_lio_sam)
+        self.btnSaveDssLioSamMap.clicked.connect(self.on_save_dss_lio_sam_map)
+
+        self.btnBrowseDssLioSamMap.clicked.connect(self.on_browse_dss_lio_sam_map)
+        self.btnStartDssLioSamLoc.clicked.connect(self.on_start_dss_lio_sam_loc)
+        self.btnStopDssLioSamLoc.clicked.connect(self.on_stop_dss_lio_sam_loc)
+
+        # Connect buttons - RTAB-MAP SLAM
+        self.btnBrowseRtabmapDb.clicked.connect(self.on_browse_rtabmap_db)
+        self.btnStartRtabmap.clicked.connect(self.on_start_rtabmap)
+        self.btnStopRtabmap.clicked.connect(self.on_stop_rtabmap)
+        self.btnSaveRtabmapMap.clicked.connect(self.on_save_rtabmap_map)
+
+        # Connect buttons - RTAB-MAP Localization
+        self.btnBrowseRtabmapLocDb.clicked.connect(self.on_browse_rtabmap_loc_db)
+        self.btnStartRtabmapLoc.clicked.connect(self.on_start_rtabmap_loc)
+        self.btnStopRtabmapLoc.clicked.connect(self.on_stop_rtabmap_loc)
+
+        # Connect buttons - KISS-ICP
+        self.btnStartKissIcp.clicked.connect(self.on_start_kissicp)
+        self.btnStopKissIcp.clicked.connect(self.on_stop_kissicp)
+        self.btnSaveKissIcpMap.clicked.connect(self.on_save_kissicp_map)
+
+        # Connect buttons - SLAM-Toolbox
+        self.btnStartSlamToolbox.clicked.connect(self.on_start_slamtoolbox)
+        self.btnStopSlamToolbox.clicked.connect(self.on_stop_slamtoolbox)
+        self.btnSaveSlamToolboxMap.clicked.connect(self.on_save_slamtoolbox_map)
+        self.btnBrowseSlamToolboxMap.clicked.connect(self.on_browse_slamtoolbox_map)
+        self.btnStartSlamToolboxLoc.clicked.connect(self.on_start_slamtoolbox_loc)
+        self.btnStopSlamToolboxLoc.clicked.connect(self.on_stop_slamtoolbox_loc)
+
+        # Connect buttons - HDL Graph SLAM
+        self.btnStartHdlSlam.clicked.connect(self.on_start_hdl_slam)
+        self.btnStopHdlSlam.clicked.connect(self.on_stop_hdl_slam)
+        self.btnSaveHdlMap.clicked.connect(self.on_save_hdl_map)
+        self.btnBrowseHdlMap.clicked.connect(self.on_browse_hdl_map)
+        self.btnStartHdlLoc.clicked.connect(self.on_start_hdl_loc)
+        self.btnStopHdlLoc.clicked.connect(self.on_stop_hdl_loc)
+
+        self.btnStartCustom.clicked.connect(self.on_start_custom)
+        self.btnStopCustom.clicked.connect(self.on_stop_custom)
+        self.btnBrowse.clicked.connect(self.on_browse)
+
+        self.btnStopAll.clicked.connect(self.on_stop_all)
+
+        # One-click stacks (bridge + backend) next to Stop All
+        self._add_stack_controls()
+
+        # Start/stop buttons per launch key, used to lock out keys with a pending job
+        self.launch_buttons = {
+            'dss': (self.btnStartDSS, self.btnStopDSS),
+            'dss_lio_sam': (self.btnStartDssLioSam, self.btnStopDssLioSam),
+            'dss_lio_sam_loc': (self.btnStartDssLioSamLoc, self.btnStopDssLioSamLoc),
+            'rtabmap': (self.btnStartRtabmap, self.btnStopRtabmap),
+            'rtabmap_loc': (self.btnStartRtabmapLoc, self.btnStopRtabmapLoc),
+            'kissicp': (self.btnStartKissIcp, self.btnStopKissIcp),
+            'slamtoolbox': (self.btnStartSlamToolbox, self.btnStopSlamToolbox),
+            'slamtoolbox_loc': (self.btnStartSlamToolboxLoc, self.btnStopSlamToolboxLoc),
+            'hdl_slam': (self.btnStartHdlSlam, self.btnStopHdlSlam),
+            'hdl_loc': (self.btnStartHdlLoc, self.btnStopHdlLoc),
+            'custom': (self.btnStartCustom, self.btnStopCustom),
+        }
+
+        # Right-click on a launch's Start/Stop button opens its captured output
+        self.output_viewers = {}
+        for key, buttons in self.launch_buttons.items():
+            for button in buttons:
+                button.setContextMenuPolicy(Qt.CustomContextMenu)
+                button.customContextMenuRequested.connect(
+                    lambda pos, key=key, button=button: self._show_launch_menu(key, button, pos))
+
+        # Resource usage shown next to each launch's Stop button (tooltip only
+        # where the buttons do not sit in a box layout)
+        self.usage_labels = {key: self._add_usage_label(btn_stop)
+                             for key, (_btn_start, btn_stop) in self.launch_buttons.items()}
+        self.usage_timer = QTimer()
+        self.usage_timer.timeout.connect(self.update_resource_usage)
+        self.usage_timer.start(1000)
+
+        # Buttons follow a launch state model refreshed on supervisor, exit
+        # and readiness events, so nothing is polled and unchanged widgets
+        # are never touched
+        self.launch_controls = {
+            'dss': LaunchControl(self.btnStartDSS, self.btnStopDSS, None, 'blue'),
+            'dss_lio_sam': LaunchControl(self.btnStartDssLioSam, self.btnStopDssLioSam,
+                                         self.btnSaveDssLioSamMap, 'deep-orange'),
+            'dss_lio_sam_loc': LaunchControl(self.btnStartDssLioSamLoc, self.btnStopDssLioSamLoc,
+                                             None, 'orange'),
+            'rtabmap': LaunchControl(self.btnStartRtabmap, self.btnStopRtabmap,
+                                     self.btnSaveRtabmapMap, 'cyan'),
+            'rtabmap_loc': LaunchControl(self.btnStartRtabmapLoc, self.btnStopRtabmapLoc,
+                                         None, 'orange'),
+            'kissicp': LaunchControl(self.btnStartKissIcp, self.btnStopKissIcp,
+                                     self.btnSaveKissIcpMap, 'pink'),
+            'slamtoolbox': LaunchControl(self.btnStartSlamToolbox, self.btnStopSlamToolbox,
+                                         self.btnSaveSlamToolboxMap, 'purple'),
+            'slamtoolbox_loc': LaunchControl(self.btnStartSlamToolboxLoc, self.btnStopSlamToolboxLoc,
+                                             None, 'orange'),
+            'hdl_slam': LaunchControl(self.btnStartHdlSlam, self.btnStopHdlSlam,
+                                      self.btnSaveHdlMap, 'teal'),
+            'hdl_loc': LaunchControl(self.btnStartHdlLoc, self.btnStopHdlLoc,
+                                     None, 'orange'),
+            'custom': LaunchControl(self.btnStartCustom, self.btnStopCustom, None, None),
+        }
+        self.setStyleSheet(self.styleSheet() + STATE_STYLE)
+        for control in self.launch_controls.values():
+            if control.accent is not None:
+                control.start.setStyleSheet("")
+                control.start.setProperty('launchRole', 'start')
+                control.start.setProperty('accent', control.accent)
+        self.sensor_labels = {
+            'lidar': (self.lblLidarStatus, 'LiDAR'),
+            'imu': (self.lblImuStatus, 'IMU'),
+            'camera': (self.lblCameraStatus, 'Camera'),
+            'gps': (self.lblGpsStatus, 'GPS'),
+        }
+        for label, _title in self.sensor_labels.values():
+            label.setStyleSheet("")
+        self.launch_state = None
+        self._applied = {}
+
+        # Timer to update sensor status
+        self.sensor_timer = QTimer()
+        self.sensor_timer.timeout.connect(self.update_sensor_status)
+        self.sensor_timer.start(500)  # Check every 500ms
+
+        # Log messages from any thread are queued and drawn in batches at a
+        # fixed frame rate; the widget is capped and can be filtered. The
+        # timer only runs while messages are pending, so an idle window
+        # does not wake up for it
+        self.log_timer = QTimer()
+        self.log_timer.setInterval(1000 // LOG_FRAME_RATE)
+        self.log_timer.timeout.connect(self._flush_log)
+        self.job_signals.log_pending.connect(self.log_timer.start)
+        self.log_sink = LogSink(history=LOG_MAX_BLOCKS, wake=self.job_signals.log_pending.emit)
+        self.log_filter = LogFilter()
+        self.txtLog.document().setMaximumBlockCount(LOG_MAX_BLOCKS)
+        self._add_log_filters()
+
+        self.log("Launch Manager UI Ready")
+
+    def after_first_paint(self, callback):
+        """Run callback once the window has drawn its first frame
+
+        Used to defer work that is not needed to show the window (sensor
+        subscriptions, services). Falls back to a timer in case no paint
+        event reaches the central widget.
+        """
+        if not self._first_paint_callbacks:
+            (self.centralWidget() or self).installEventFilter(self)
+            QTimer.singleShot(1000, self._run_first_paint_callbacks)
+        self._first_paint_callbacks.append(callback)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and self._first_paint_callbacks:
+            watched.removeEventFilter(self)
+            # Let the paint finish (and be flushed to the screen) first
+            QTimer.singleShot(0, self._run_first_paint_callbacks)
+        return super().eventFilter(watched, event)
+
+    def _run_first_paint_callbacks(self):
+        callbacks, self._first_paint_callbacks = self._first_paint_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def set_node(self, node):
+        """Set the ROS2 node"""
+        self.node = node
+        self.node.supervisor.add_listener(self.job_signals.job_finished.emit)
+        self.node.supervisor.add_submit_listener(self.job_signals.job_submitted.emit)
+        self.node.exit_listeners.append(self.job_signals.launch_exited.emit)
+        self.node.ready_listeners.append(self.job_signals.launch_ready.emit)
+        self.node.sensor_listeners.append(self.job_signals.sensor_active.emit)
+        self.node.launch_index_listeners.append(self.job_signals.launch_index_changed.emit)
+        self.node.stacks.add_listener(self.job_signals.stack_finished.emit)
+        self.launch_state = LaunchStateModel(node)
+        self.launch_state.add_listener(self._on_launch_states_changed)
+        self.launch_state.refresh()
+        self._on_launch_states_changed({}, self.launch_state.states)
+
+        log_file = self.node.get_parameter('ui_log_file').value
+        if log_file:
+            try:
+                self.log_sink.open_mirror(os.path.expanduser(log_file))
+            except OSError as e:
+                self.log(f"Warning: Could not open log file {log_file}: {e}")
+
+        # Try to auto-detect launch files
+        self.auto_detect_launch_files()
+
+    def auto_detect_launch_files(self):
+        """Auto-detect launch files in the workspace"""
+        self.node.auto_detect_launch_files()
+        self.update_launch_file_completer()
+
+    def update_launch_file_completer(self):
+        """Offer every indexed launch file in the custom launch field (matched anywhere in the path)"""
+        from PyQt5.QtWidgets import QCompleter
+        paths = [launch_file.path for launch_file in self.node.launch_index.files()]
+        completer = QCompleter(paths, self.txtLaunchFile)
+        completer.setFilterMode(Qt.MatchContains)
+        completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.txtLaunchFile.setCompleter(completer)
+
+    def log(self, message, level=None, launch_key=None):
+        """Add message to log (safe to call from any thread)
+
+        level is one of LEVELS and guessed from the message when omitted;
+        launch_key tags messages about one launch so they can be filtered.
+        """
+        self.log_sink.emit(message, level, launch_key)
+
+    def _flush_log(self):
+        """Append everything logged since the last frame in one edit"""
+        events = self.log_sink.drain()
+        if not self.log_sink.pending:
+            # Started again by the next message (log_pending)
+            self.log_timer.stop()
+        lines = [format_event(event) for event in events if self.log_filter.matches(event)]
+        if lines:
+            self._append_log_lines(lines)
+
+    def _append_log_lines(self, lines):
+        scrollbar = self.txtLog.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
+        cursor = self.txtLog.textCursor()
+        cursor.movePosition(cursor.End)
+        if not self.txtLog.document().isEmpty():
+            cursor.insertBlock()
+        cursor.insertText('\n'.join(lines))
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def _add_log_filters(self):
+        """Level and launch filter boxes above the log (if it sits in a box layout)"""
+        layout = self._box_layout_of(self.txtLog)
+        if layout is None:
+            return
+        self.cmbLogLevel = QtWidgets.QComboBox()
+        self.cmbLogLevel.addItems(LEVELS)
+        self.cmbLogLevel.setCurrentText('INFO')
+        self.cmbLogLaunch = QtWidgets.QComboBox()
+        self.cmbLogLaunch.addItem("All launches", None)
+        for key in self.launch_buttons:
+            self.cmbLogLaunch.addItem(key, key)
+        row = QtWidgets.QHBoxLayout()
+        row.addWidget(QtWidgets.QLabel("Level:"))
+        row.addWidget(self.cmbLogLevel)
+        row.addWidget(QtWidgets.QLabel("Launch:"))
+        row.addWidget(self.cmbLogLaunch)
+        row.addStretch()
+        layout.insertLayout(layout.indexOf(self.txtLog), row)
+        self.log_filter.min_level = 'INFO'
+        self.cmbLogLevel.currentTextChanged.connect(self._on_log_filter_changed)
+        self.cmbLogLaunch.currentIndexChanged.connect(self._on_log_filter_changed)
+
+    def _on_log_filter_changed(self, *_args):
+        """Redraw the log from the sink's history with the new filter"""
+        self.log_filter = LogFilter(self.cmbLogLevel.currentText(), self.cmbLogLaunch.currentData())
+        self.log_sink.drain()
+        self.txtLog.clear()
+        lines = [format_event(event) for event in self.log_sink.history
+                 if self.log_filter.matches(event)]
+        if lines:
+            self._append_log_lines(lines)
+
+    def start_launch(self, launch_key, launch_file_path, extra_args=None, success_messages=()):
+        """Queue a launch start; success_messages are logged once the start succeeded"""
+        # Arguments that would make the start fail are reported right away when
+        # the file's declarations are already cached (the node checks again
+        # either way and also logs the warnings)
+        declared = self.node.launch_arguments.cached(launch_file_path) if launch_file_path else None
+        if declared is not None and 'error' not in declared:
+            problems = validate_arguments(declared, extra_args).errors
+            if problems:
+                self.log(f"Not starting '{launch_key}': {'; '.join(problems)}", level='ERROR',
+                         launch_key=launch_key)
+                QMessageBox.warning(self, "Invalid launch arguments", "\n".join(problems))
+                return None
+        job = self.node.start_launch_async(launch_key, launch_file_path, extra_args)
+        self._job_messages[job] = list(success_messages)
+        self.update_button_states()
+        return job
+
+    def stop_launch(self, launch_key):
+        """Queue a launch stop, cancelling a start that has not spawned anything yet"""
+        for job in self.node.supervisor.pending_jobs(launch_key):
+            if job.action == 'start':
+                job.cancel()
+        job = self.node.stop_launch_async(launch_key)
+        self.update_button_states()
+        return job
+
+    def on_launch_job_finished(self, job):
+        """Called on the Qt thread when a supervisor job completed"""
+        if job in self._map_save_dialogs:
+            self._on_map_save_finished(job)
+            self.update_button_states()
+            return
+        messages = self._job_messages.pop(job, [])
+        if job.ok:
+            for message in messages:
+                self.log(message)
+        elif job.future.cancelled():
+            self.log(f"Cancelled queued {job.action} of '{job.launch_key}'")
+        elif not job.cancelled and job.future.exception() is not None:
+            self.log(f"{job.action} '{job.launch_key}' failed: {job.future.exception()}")
+        self.update_button_states()
+
+    def on_launch_exited(self, launch_key, event):
+        """Called on the Qt thread as soon as a launch process exits"""
+        self.update_button_states()
+
+    def on_launch_ready(self, launch_key, time_to_ready):
+        """Called on the Qt thread once a launch's interfaces are in the graph"""
+        self.update_button_states()
+
+    def on_sensor_active(self, sensor_name):
+        """Called on the Qt thread when a sensor starts publishing, ahead of the next poll"""
+        self.update_sensor_status()
+
+    def on_start_dss(self):
+        if self.node.launch_files['dss']:
+            extra_args = ['use_sim_time:=true']
+            self.start_launch('dss', self.node.launch_files['dss'], extra_args)
+        else:
+            self.log("DSS launch file not configured!")
+            QMessageBox.warning(self, "Error", "DSS launch file not found!")
+
+    def on_stop_dss(self):
+        self.stop_launch('dss')
+
+    def on_start_dss_lio_sam(self):
+        if self.node.launch_files['dss_lio_sam']:
+            self.start_launch('dss_lio_sam', self.node.launch_files['dss_lio_sam'])
+        else:
+            self.log("DSS LIO-SAM launch file not configured!")
+            QMessageBox.warning(self, "Error", "DSS LIO-SAM launch file not found!")
+
+    def on_stop_dss_lio_sam(self):
+        self.stop_launch('dss_lio_sam')
+
+    def on_save_dss_lio_sam_map(self):
+        """Save DSS LIO-SAM map using service call with folder selection"""
+        from PyQt5.QtWidgets import QFileDialog
+        try:
+            # Open folder selection dialog
+            default_path = str(SRC_PATH / "SLAM/LIO-SAM/dss_lio_sam/map")
+            save_dir = QFileDialog.getExistingDirectory(
+                self,
+                "Select Directory to Save Map",
+                default_path,
+                QFileDialog.ShowDirsOnly
+            )
+
+            if not save_dir:
+                self.log("Map save cancelled by user")
+                return
+
+            # Ask for map name
+            from PyQt5.QtWidgets import QInputDialog
+            map_name, ok = QInputDialog.getText(
+                self,
+                "Map Name",
+                "Enter map name (without extension):",
+                text="dss_map"
+            )
+
+            if not ok or not map_name:
+                self.log("Map save cancelled by user")
+                return
+
+            # Full save path
+            save_path = os.path.join(save_dir, map_name)
+            self.save_map('dss_lio_sam', save_path)
+
+        except Exception as e:
+            self.log(f"Failed to save map: {str(e)}")
+            QMessageBox.critical(self, "Error", f"Failed to save map:\n{str(e)}")
+
+    def on_browse_dss_lio_sam_map(self):
+        """Browse for DSS LIO-SAM map folder"""
+        from PyQt5.QtWidgets import QFileDialog
+        default_path = str(MAP_PATH)
+        map_dir = QFileDialog.getExistingDirectory(
+            self,
+            "Select Map Folder (containing GlobalMap.pcd)",
+            default_path,
+            QFileDialog.ShowDirsOnly
+        )
+        if map_dir:
+            # Check if GlobalMap.pcd exists
+            global_map_path = os.path.join(map_dir, "GlobalMap.pcd")
+            if os.path.exists(global_map_path):
+                self.txtDssLioSamMapPath.setText(global_map_path)
+                self.log(f"Selected map: {global_map_path}")
+            else:
+                self.log(f"Warning: GlobalMap.pcd not found in {map_dir}")
+                QMessageBox.warning(self, "Warning", f"GlobalMap.pcd not found in:\n{map_dir}\n\nPlease select a valid map folder.")
+
+    def on_start_dss_lio_sam_loc(self):
+        """Start DSS LIO-SAM Localization mode"""
+        map_path = self.txtDssLioSamMapPath.text()
+        if not map_path:
+            self.log("Please select a map file first!")
+            QMessageBox.warning(self, "Error", "Please select a map file first!")
+            return
+
+        if not os.path.exists(map_path):
+            self.log(f"Map file not found: {map_path}")
+            QMessageBox.warning(self, "Error", f"Map file not found:\n{map_path}")
+            return
+
+        if self.node.launch_files.get('dss_lio_sam_loc'):
+            extra_args = [f'map_path:={map_path}']
+            self.start_launch('dss_lio_sam_loc', self.node.launch_files['dss_lio_sam_loc'], extra_args, success_messages=[
+                f"Started DSS LIO-SAM Localization with map: {map_path}",
+            ])
+        else:
+            self.log("DSS LIO-SAM Localization launch file not found!")
+            QMessageBox.warning(self, "Error", "DSS LIO-SAM Localization launch file not found!")
+
+    def on_stop_dss_lio_sam_loc(self):
+        """Stop DSS LIO-SAM Localization mode"""
+        self.stop_launch('dss_lio_sam_loc')
+
+    def on_browse_rtabmap_db(self):
+        """Browse for RTAB-MAP database path (SLAM mode)"""
+        from PyQt5.QtWidgets import QFileDialog
+        default_path = str(MAP_PATH)
+        db_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Select RTAB-MAP Database Path",
+            os.path.join(default_path, "rtabmap.db"),
+            "Database Files (*.db);;All Files (*)"
+        )
+        if db_path:
+            self.txtRtabmapDbPath.setText(db_path)
+            self.log(f"Selected RTAB-MAP database: {db_path}")
+
+    def on_start_rtabmap(self):
+        """Start RTAB-MAP SLAM mode"""
+        db_path = self.txtRtabmapDbPath.text()
+
+        if self.node.launch_files.get('rtabmap'):
+            extra_args = self._rtabmap_args()
+            success_messages = [f"Started RTAB-MAP SLAM mode"]
+            if db_path:
+                success_messages.append(f"  Database: {db_path}")
+            self.start_launch('rtabmap', self.node.launch_files['rtabmap'], extra_args,
+                              success_messages=success_messages)
+        else:
+            self.log("RTAB-MAP launch file not found!")
+            QMessageBox.warning(self, "Error", "RTAB-MAP launch file not found!")
+
+    def _rtabmap_args(self):
+        """Arguments of an RTAB-MAP SLAM start, with the database chosen in the window"""
+        extra_args = ['use_sim_time:=true']  # Always use simulation time
+        db_path = self.txtRtabmapDbPath.text()
+        if db_path:
+            extra_args.append(f'database_path:={db_path}')
+            extra_args.append('delete_db_on_start:=true')
+        return extra_args
+
+    def on_stop_rtabmap(self):
+        """Stop RTAB-MAP SLAM mode"""
+        self.stop_launch('rtabmap')
+
+    def on_save_rtabmap_map(self):
+        """Save RTAB-MAP map as a verified snapshot of its database, taken in the background"""
+        from PyQt5.QtWidgets import QFileDialog
+        try:
+            # Open folder selection dialog
+            default_path = str(MAP_PATH)
+            save_dir = QFileDialog.getExistingDirectory(
+                self,
+                "Select Directory to Save Map",
+                default_path,
+                QFileDialog.ShowDirsOnly
+            )
+
+            if not save_dir:
+                self.log("Map save cancelled by user")
+                return
+
+            # Ask for map name
+            from PyQt5.QtWidgets import QInputDialog
+            map_name, ok = QInputDialog.getText(
+                self,
+                "Map Name",
+                "Enter map name (without extension):",
+                text="rtabmap_map"
+            )
+
+            if not ok or not map_name:
+                self.log("Map save cancelled by user")
+                return
+
+            # Full save path
+            save_path = os.path.join(save_dir, f"{map_name}.db")
+
+            # Current database path from UI (map_saver falls back to ~/.ros/rtabmap.db)
+            self.save_map('rtabmap', save_path, rtabmap_db=self.txtRtabmapDbPath.text())
+
+        except Exception as e:
+            self.log(f"Failed to save map: {str(e)}")
+            QMessageBox.critical(self, "Error", f"Failed to save map:\n{str(e)}")
+
+    def on_browse_rtabmap_loc_db(self):
+        """Browse for existing RTAB-MAP database (Localization mode)"""
+        from PyQt5.QtWidgets import QFileDialog
+        default_path = str(MAP_PATH)
+        db_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select RTAB-MAP Database for Localization",
+            default_path,
+            "Database Files (*.db);;All Files (*)"
+        )
+        if db_path:
+            if os.path.exists(db_path):
+                self.txtRtabmapLocDbPath.setText(db_path)
+                self.log(f"Selected RTAB-MAP map database: {db_path}")
+            else:
+                self.log(f"Database file not found: {db_path}")
+                QMessageBox.warning(self, "Error", f"Database file not found:\n{db_path}")
+
+    def on_start_rtabmap_loc(self):
+        """Start RTAB-MAP Localization mode"""
+        db_path = self.txtRtabmapLocDbPath.text()
+        if not db_path:
+            self.log("Please select a database file first!")
+            QMessageBox.warning(self, "Error", "Please select a database file first!")
+            return
+
+        if not os.path.exists(db_path):
+            self.log(f"Database file not found: {db_path}")
+            QMessageBox.warning(self, "Error", f"Database file not found:\n{db_path}")
+            return
+
+        if self.node.launch_files.get('rtabmap_loc'):
+            # New dedicated localization launch file only needs database_path
+            extra_args = [f'database_path:={db_path}']
+            self.start_launch('rtabmap_loc', self.node.launch_files['rtabmap_loc'], extra_args, success_messages=[
+                f"Started RTAB-MAP Localization with database: {db_path}",
+            ])
+        else:
+            self.log("RTAB-MAP Localization launch file not found!")
+            QMessageBox.warning(self, "Error", "RTAB-MAP Localization launch file not found!")
+
+    def on_stop_rtabmap_loc(self):
+        """Stop RTAB-MAP Localization mode"""
+        self.stop_launch('rtabmap_loc')
+
+    def on_start_kissicp(self):
+        """Start KISS-ICP odometry"""
+        if self.node.launch_files.get('kissicp'):
+            extra_args = ['use_sim_time:=true']
+            self.start_launch('kissicp', self.node.launch_files['kissicp'], extra_args, success_messages=[
+                "Started KISS-ICP odometry",
+            ])
+        else:
+            self.log("KISS-ICP launch file not found!")
+            QMessageBox.warning(self, "Error", "KISS-ICP launch file not found!")
+
+    def on_stop_kissicp(self):
+        """Stop KISS-ICP odometry"""
+        self.stop_launch('kissicp')
+
+    def on_save_kissicp_map(self):
+        """Save KISS-ICP map by calling save_map service"""
+        from PyQt5.QtWidgets import QFileDialog
+        try:
+            # Open folder selection dialog
+            default_path = str(Path.home() / "ros2_ws/map/kiss_icp_map")
+            save_dir = QFileDialog.getExistingDirectory(
+                self,
+                "Select Directory to Save Map",
+                default_path,
+                QFileDialog.ShowDirsOnly
+            )
+
+            if not save_dir:
+                self.log("Map save cancelled by user")
+                return
+
+            # Ask for map name
+            from PyQt5.QtWidgets import QInputDialog
+            map_name, ok = QInputDialog.getText(
+                self,
+                "Map Name",
+                "Enter map name (without extension):",
+                text="kiss_icp_map"
+            )
+
+            if not ok or not map_name:
+                self.log("Map save cancelled by user")
+                return
+
+            # Full save path
+            save_path = os.path.join(save_dir, f"{map_name}.pcd")
+            self.save_map('kissicp', save_path)
+
+        except Exception as e:
+            self.log(f"Failed to save map: {str(e)}")
+            QMessageBox.critical(self, "Error", f"Failed to save map:\n{str(e)}")
+
+    def on_start_slamtoolbox(self):
+        """Start SLAM-Toolbox mapping mode"""
+        if self.node.launch_files.get('slamtoolbox'):
+            extra_args = ['use_sim_time:=true']
+            self.start_launch('slamtoolbox', self.node.launch_files['slamtoolbox'], extra_args, success_messages=[
+                "Started SLAM-Toolbox mapping",
+            ])
+        else:
+            self.log("SLAM-Toolbox launch file not found!")
+            QMessageBox.warning(self, "Error", "SLAM-Toolbox launch file not found!")
+
+    def on_stop_slamtoolbox(self):
+        """Stop SLAM-Toolbox mapping mode"""
+        self.stop_launch('slamtoolbox')
+
+    def on_save_slamtoolbox_map(self):
+        """Save SLAM-Toolbox map using service call"""
+        from PyQt5.QtWidgets import QFileDialog
+        try:
+            # Create default map directory if it doesn't exist
+            default_map_dir = MAP_PATH / "slam_toolbox_map"
+            default_map_dir.mkdir(parents=True, exist_ok=True)
+
+            # Open folder selection dialog
+            save_dir = QFileDialog.getExistingDirectory(
+                self,
+                "Select Directory to Save Map",
+                str(default_map_dir),
+                QFileDialog.ShowDirsOnly
+            )
+
+            if not save_dir:
+                self.log("Map save cancelled by user")
+                return
+
+            # Ask for map name
+            from PyQt5.QtWidgets import QInputDialog
+            map_name, ok = QInputDialog.getText(
+                self,
+                "Map Name",
+                "Enter map name (without extension):",
+                text="slam_toolbox_map"
+            )
+
+            if not ok or not map_name:
+                self.log("Map save cancelled by user")
+                return
+
+            # Full save path (without extension - SLAM Toolbox adds .posegraph and .data)
+            save_path = os.path.join(save_dir, map_name)
+            self.save_map('slamtoolbox', save_path)
+
+        except Exception as e:
+            self.log(f"Failed to save map: {str(e)}")
+            QMessageBox.critical(self, "Error", f"Failed to save map:\n{str(e)}")
+
+    def on_browse_slamtoolbox_map(self):
+        """Browse for SLAM-Toolbox map file"""
+        from PyQt5.QtWidgets import QFileDialog
+        default_path = str(MAP_PATH)
+        map_file, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select SLAM-Toolbox Map File",
+            default_path,
+            "PoseGraph Files (*.posegraph);;All Files (*)"
+        )
+        if map_file:
+            # Remove .posegraph extension for SLAM-Toolbox
+            if map_file.endswith('.posegraph'):
+                map_file = map_file[:-10]  # Remove .posegraph
+            self.txtSlamToolboxMapPath.setText(map_file)
+            self.node.slamtoolbox_map_path = map_file
+            self.log(f"Selected SLAM-Toolbox map: {map_file}")
+
+    def on_start_slamtoolbox_loc(self):
+        """Start SLAM-Toolbox localization mode"""
+        map_file = self.txtSlamToolboxMapPath.text()
+        if not map_file:
+            self.log("Please select a map file first!")
+            QMessageBox.warning(self, "Error", "Please select a map file first!")
+            return
+
+        # Check if map files exist
+        if not os.path.exists(f"{map_file}.posegraph"):
+            self.log(f"Map file not found: {map_file}.posegraph")
+            QMessageBox.warning(self, "Error", f"Map file not found:\n{map_file}.posegraph")
+            return
+
+        if self.node.launch_files.get('slamtoolbox_loc'):
+            extra_args = ['use_sim_time:=true', f'map_file:={map_file}']
+            self.start_launch('slamtoolbox_loc', self.node.launch_files['slamtoolbox_loc'], extra_args, success_messages=[
+                f"Started SLAM-Toolbox Localization with map: {map_file}",
+            ])
+        else:
+            self.log("SLAM-Toolbox Localization launch file not found!")
+            QMessageBox.warning(self, "Error", "SLAM-Toolbox Localization launch file not found!")
+
+    def on_stop_slamtoolbox_loc(self):
+        """Stop SLAM-Toolbox localization mode"""
+        self.stop_launch('slamtoolbox_loc')
+
+    def on_start_hdl_slam(self):
+        """Start HDL Graph SLAM"""
+        if self.node.launch_files.get('hdl_slam'):
+            self.start_launch('hdl_slam', self.node.launch_files['hdl_slam'], success_messages=[
+                "Started HDL Graph SLAM",
+            ])
+        else:
+            self.log("HDL Graph SLAM launch file not found!")
+            QMessageBox.warning(self, "Error", "HDL Graph SLAM launch file not found!")
+
+    def on_stop_hdl_slam(self):
+        """Stop HDL Graph SLAM"""
+        self.stop_launch('hdl_slam')
+
+    def on_save_hdl_map(self):
+        """Save HDL Graph SLAM map using service call"""
+        from PyQt5.QtWidgets import QFileDialog
+        try:
+            # Create default map directory if it doesn't exist
+            default_map_dir = Path.home() / "ros2_ws/src/SLAM/HDL/hdl_graph_slam_ros2/map"
+            default_map_dir.mkdir(parents=True, exist_ok=True)
+
+            # Open folder selection dialog
+            save_dir = QFileDialog.getExistingDirectory(
+                self,
+                "Select Directory to Save Map",
+                str(default_map_dir),
+                QFileDialog.ShowDirsOnly
+            )
+
+            if not save_dir:
+                self.log("Map save cancelled by user")
+                return
+
+            # The map goes into a new timestamped folder inside save_dir
+            self.save_map('hdl_slam', save_dir)
+
+        except Exception as e:
+            self.log(f"Failed to save map: {str(e)}")
+            QMessageBox.critical(self, "Error", f"Failed to save map:\n{str(e)}")
+
+    def save_map(self, launch_key, save_path, rtabmap_db=None):
+        """Queue a map save; a cancellable progress dialog shows its messages until it ends"""
+        if launch_key in MAP_SERVICES and not self.node.map_saver.available(launch_key):
+            message = f"{MAP_SERVICES[launch_key].name} service not found! Make sure it is running."
+            self.log(message, launch_key=launch_key)
+            QMessageBox.warning(self, "Error", message)
+            return None
+
+        def progress(message):
+            self.job_signals.map_save_progress.emit(launch_key, message)
+
+        def log(message):
+            self.log(message, launch_key=launch_key)
+            progress(message)
+
+        job = self.node.map_saver.save_async(launch_key, save_path, log, rtabmap_db=rtabmap_db,
+                                             progress=progress)
+        dialog = QtWidgets.QProgressDialog(f"Saving {launch_key} map...", "Cancel", 0, 0, self)
+        dialog.setWindowTitle("Saving map")
+        dialog.setMinimumDuration(300)
+        dialog.canceled.connect(job.cancel)
+        self._map_save_dialogs[job] = dialog
+        self.update_button_states()
+        return job
+
+    def on_map_save_progress(self, launch_key, message):
+        for job, dialog in self._map_save_dialogs.items():
+            if job.launch_key == launch_key:
+                dialog.setLabelText(message)
+
+    def _on_map_save_finished(self, job):
+        dialog = self._map_save_dialogs.pop(job)
+        dialog.canceled.disconnect()
+        dialog.reset()
+        dialog.deleteLater()
+        if job.cancelled:
+            self.log(f"Map save of '{job.launch_key}' cancelled", launch_key=job.launch_key)
+        elif job.future.exception() is not None:
+            self.log(f"Failed to save map: {job.future.exception()}", launch_key=job.launch_key)
+            QMessageBox.critical(self, "Error", f"Failed to save map:\n{job.future.exception()}")
+        else:
+            self._show_map_save_result(job.future.result())
+
+    def _show_map_save_result(self, result):
+        """Log a MapSaveResult and tell the user where the map went"""
+        self.log(result.message)
+        if result.success:
+            details = "\n".join(result.paths) if result.paths else result.message
+            QMessageBox.information(self, "Success", f"Map saved successfully!\n\n{details}")
+        else:
+            QMessageBox.warning(self, "Error", result.message)
+
+    def on_browse_hdl_map(self):
+        """Browse for HDL map PCD file"""
+        from PyQt5.QtWidgets import QFileDialog
+        default_path = str(SRC_PATH / "SLAM/HDL/hdl_graph_slam_ros2/map")
+        map_file, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select HDL Map File",
+            default_path,
+            "PCD Files (*.pcd);;All Files (*)"
+        )
+        if map_file:
+            self.txtHdlMapPath.setText(map_file)
+            self.log(f"Selected HDL map: {map_file}")
+
+    def on_start_hdl_loc(self):
+        """Start HDL Localization"""
+        map_file = self.txtHdlMapPath.text()
+        if not map_file:
+            self.log("Please select a map file first!")
+            QMessageBox.warning(self, "Error", "Please select a map file first!")
+            return
+
+        if not os.path.exists(map_file):
+            self.log(f"Map file not found: {map_file}")
+            QMessageBox.warning(self, "Error", f"Map file not found:\n{map_file}")
+            return
+
+        if self.node.launch_files.get('hdl_loc'):
+            # HDL Localization uses params.yaml for map path, so we need to update it
+            # For now, just launch and user can configure params.yaml manually
+            self.start_launch('hdl_loc', self.node.launch_files['hdl_loc'], success_messages=[
+                f"Started HDL Localization",
+                f"Note: Set initial pose in RViz using '2D Pose Estimate'",
+            ])
+        else:
+            self.log("HDL Localization launch file not found!")
+            QMessageBox.warning(self, "Error", "HDL Localization launch file not found!")
+
+    def on_stop_hdl_loc(self):
+        """Stop HDL Localization"""
+        self.stop_launch('hdl_loc')
+
+    def on_start_custom(self):
+        custom_path = self.txtLaunchFile.text()
+        if custom_path:
+            with self.node.launch_files_lock:
+                self.node.launch_files['custom'] = custom_path
+            self.start_launch('custom', custom_path)
+        else:
+            self.log("Please specify a launch file!")
+            QMessageBox.warning(self, "Error", "Please specify a launch file path!")
+
+    def on_stop_custom(self):
+        self.stop_launch('custom')
+
+    def on_browse(self):
+        from PyQt5.QtWidgets import QFileDialog
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select Launch File",
+            str(SRC_PATH),
+            "Launch Files (*.py *.launch.py);;All Files (*)"
+        )
+        if file_path:
+            self.txtLaunchFile.setText(file_path)
+
+    def on_stop_all(self):
+        reply = QMessageBox.question(
+            self,
+            "Confirm",
+            "Stop all running launch files?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            self.node.stop_all_async()
+            self.update_button_states()
+
+    def _add_stack_controls(self):
+        """Stack selector and Start Stack button before Stop All (if it sits in a box layout)"""
+        self.cmbStack = None
+        self.btnStartStack = None
+        layout = self._box_layout_of(self.btnStopAll)
+        if layout is None:
+            return
+        self.cmbStack = QtWidgets.QComboBox()
+        for name, spec in STACKS.items():
+            self.cmbStack.addItem(spec.description, name)
+        self.btnStartStack = QtWidgets.QPushButton("Start Stack")
+        self.btnStartStack.setToolTip("Start every launch of the stack, each as soon as "
+                                      "the launches it requires are ready")
+        self.btnStartStack.clicked.connect(self.on_start_stack)
+        index = layout.indexOf(self.btnStopAll)
+        layout.insertWidget(index, self.btnStartStack)
+        layout.insertWidget(index, self.cmbStack)
+
+    def on_start_stack(self):
+        name = self.cmbStack.currentData()
+        problems = self.node.stacks.check(name)
+        if problems:
+            self.log(f"Cannot start stack '{name}': {'; '.join(problems)}", level='WARN')
+            QMessageBox.warning(self, "Cannot start stack", "\n".join(problems))
+            return
+        # The window's own arguments where a launch takes some from its widgets
+        args = {'rtabmap': self._rtabmap_args()} if 'rtabmap' in STACKS[name].components else None
+        if self.node.stacks.start(name, args) is not None:
+            self.btnStartStack.setEnabled(False)
+        self.update_button_states()
+
+    def on_stack_finished(self, run):
+        """Called on the Qt thread when a stack is up, failed or was cancelled"""
+        if self.btnStartStack is not None:
+            self.btnStartStack.setEnabled(not self.node.stacks.active_runs())
+        if run.ok is False:
+            failed = [c for c in run.components.values() if c.state == 'failed']
+            if failed:
+                QMessageBox.warning(self, "Stack failed", "\n".join(
+                    f"{c.launch_key}: {c.error}" for c in failed))
+        self.update_button_states()
+
+    def update_sensor_status(self):
+        """Update sensor status labels with rate, latency and drop estimates"""
+        if self.node is None:
+            return
+
+        for sensor_name, (label, title) in self.sensor_labels.items():
+            stats = self.node.get_sensor_stats(sensor_name)
+            self._apply(label, 'toolTip', format_sensor_stats(stats))
+            if not stats.active:
+                self._apply(label, 'text', f"{title}: --")
+                self._apply(label, 'sensorState', 'inactive')
+                continue
+            text = f"{title}: {stats.rate_hz:.1f} Hz" if stats.rate_hz else f"{title}: OK"
+            if stats.latency_ms is not None:
+                text += f" / {stats.latency_ms:.0f} ms"
+            self._apply(label, 'text', text)
+            self._apply(label, 'sensorState', 'degraded' if sensor_degraded(stats) else 'ok')
+
+    def update_button_states(self, *_args):
+        """Re-read launch states; only widgets of launches that changed are updated"""
+        if self.launch_state is not None:
+            self.launch_state.refresh()
+
+    def _on_launch_states_changed(self, changes, states):
+        """Derive every launch widget's state from the model and apply the differences"""
+        for key, control in self.launch_controls.items():
+            state = states[key]
+            blocked = any(states[other].running for other in conflicting_keys(key))
+            # Required launches must be ready (e.g. the bridge actually
+            # publishing), not just spawned
+            requirements_ready = all(states[required].ready for required in dependencies(key).requires)
+            # A key with a queued/running job cannot be started again; Stop stays
+            # enabled only while a start is pending so that it can be cancelled
+            start_enabled = not (state.running or state.pending or blocked) and requirements_ready
+            stop_enabled = state.starting if state.pending else state.running
+            self._apply(control.start, 'enabled', start_enabled)
+            self._apply(control.stop, 'enabled', stop_enabled)
+            if control.save is not None:
+                self._apply(control.save, 'enabled', state.running)
+            if control.accent is not None:
+                self._apply(control.start, 'running', 'true' if state.running else 'false')
+
+    def _apply(self, widget, name, value):
+        """Set enabled/text/toolTip or a style property unless the widget already has value"""
+        if self._applied.get((widget, name)) == value:
+            return
+        self._applied[(widget, name)] = value
+        if name == 'enabled':
+            widget.setEnabled(value)
+        elif name == 'text':
+            widget.setText(value)
+        elif name == 'toolTip':
+            widget.setToolTip(value)
+        else:
+            # Property selectors are only re-evaluated on a re-polish
+            widget.setProperty(name, value)
+            widget.style().unpolish(widget)
+            widget.style().polish(widget)
+
+    def _show_launch_menu(self, launch_key, button, pos):
+        menu = QtWidgets.QMenu(self)
+        action = menu.addAction("Show output...")
+        action.setEnabled(self.node is not None
+                          and self.node.output_capture.ring(launch_key) is not None)
+        if menu.exec_(button.mapToGlobal(pos)) is action:
+            self.show_launch_output(launch_key)
+
+    def show_launch_output(self, launch_key):
+        """Open (or raise) the output viewer of a launch"""
+        viewer = self.output_viewers.get(launch_key)
+        if viewer is None:
+            viewer = LaunchOutputViewer(self.node.output_capture, launch_key, self)
+            self.output_viewers[launch_key] = viewer
+        viewer.show()
+        viewer.raise_()
+        viewer.timer.start(200)
+
+    @staticmethod
+    def _box_layout_of(widget):
+        """The QBoxLayout that directly holds widget, None if it is not in one"""
+        def find_layout(layout):
+            if layout is None:
+                return None
+            if layout.indexOf(widget) >= 0:
+                return layout
+            for i in range(layout.count()):
+                found = find_layout(layout.itemAt(i).layout())
+                if found is not None:
+                    return found
+            return None
+
+        parent = widget.parentWidget()
+        layout = find_layout(parent.layout() if parent is not None else None)
+        return layout if isinstance(layout, QtWidgets.QBoxLayout) else None
+
+    def _add_usage_label(self, button):
+        """Insert an empty usage label right after button in its box layout"""
+        layout = self._box_layout_of(button)
+        if layout is None:
+            return None
+        label = QtWidgets.QLabel()
+        label.setStyleSheet("color: #666666;")
+        layout.insertWidget(layout.indexOf(button) + 1, label)
+        return label
+
+    def update_resource_usage(self):
+        """Show the latest CPU/memory/thread sample of each launch
+
+        Runs every second, so labels go through _apply and are only repainted when they changed.
+        """
+        if self.node is None:
+            return
+        monitor = self.node.resource_monitor
+        for key, (_btn_start, btn_stop) in self.launch_buttons.items():
+            label = self.usage_labels.get(key)
+            usage = monitor.latest(key) if self.node.is_running(key) else None
+            if usage is None:
+                if label is not None:
+                    self._apply(label, 'text', "")
+                    self._apply(label, 'toolTip', "")
+                self._apply(btn_stop, 'toolTip', "")
+                continue
+            history = monitor.samples(key)
+            peak_cpu = max(sample.cpu_percent for sample in history)
+            peak_rss = max(sample.rss_bytes for sample in history)
+            text = (f"CPU {usage.cpu_percent:.0f}%  "
+                    f"RSS {usage.rss_bytes / 1048576:.0f} MB  "
+                    f"{usage.threads} thr")
+            tooltip = (f"{usage.processes} processes, {usage.threads} threads\n"
+                       f"CPU {usage.cpu_percent:.1f}% (peak {peak_cpu:.1f}%)\n"
+                       f"RSS {usage.rss_bytes / 1048576:.1f} MB "
+                       f"(peak {peak_rss / 1048576:.1f} MB)\n"
+                       f"{usage.ctxt_per_s:.0f} context switches/s\n"
+                       f"last {len(history)} samples")
+            if label is not None:
+                self._apply(label, 'text', text)
+                self._apply(label, 'toolTip', tooltip)
+            self._apply(btn_stop, 'toolTip', tooltip)
+
+    def closeEvent(self, event):
+        """Handle window close event"""
+        if self.shutdown_requested:
+            reply = QMessageBox.Yes
+        else:
+            reply = QMessageBox.question(
+                self,
+                "Confirm Exit",
+                "Stop all launches and exit?",
+                QMessageBox.Yes | QMessageBox.No
+            )
+
+        if reply == QMessageBox.Yes:
+            if self.node:
+                self.node.shutdown()
+            self.log_sink.close()
+            event.accept()
+        else:
+            event.ignore()
@@ -0,0 +1,160 @@
+"""ROS 2 service interface of the launch manager: start/stop launches, status, save maps"""
+
+import json
+import os
+import shlex
+import time
+
+from std_srvs.srv import Trigger
+
+from slam_launch_manager.launch_stacks import STACKS
+from slam_launch_manager.map_saver import MAP_SAVING_LAUNCH_KEYS, MAP_SERVICES, default_save_path
+
+# Arguments a launch gets when started through a service (the Qt window builds
+# them from its widgets instead); override per key with launch_args.<key>
+DEFAULT_LAUNCH_ARGS = {
+    'dss': ['use_sim_time:=true'],
+    'rtabmap': ['use_sim_time:=true'],
+    'kissicp': ['use_sim_time:=true'],
+    'slamtoolbox': ['use_sim_time:=true'],
+}
+
+
+class LaunchServices:
+    """std_srvs/Trigger services driving a SlamLaunchManagerNode
+
+        ~/start/<key>         queue a start of <key>
+        ~/stop/<key>          queue a stop of <key> (cancels a pending start)
+        ~/start_stack/<name>  bring up a stack from launch_stacks.STACKS
+        ~/stop_all            queue stopping every launch, consumers first
+        ~/status              JSON status of every launch in the response message
+        ~/save_map/<key>      save the map of <key> to a timestamped path in map_dir
+
+    Start, stop and save only submit a supervisor job and answer right away,
+    so the executor never blocks; results go to the node's log and ~/status.
+    """
+
+    def __init__(self, node, map_dir):
+        self.node = node
+        self.services = []
+        for launch_key in node.processes:
+            default_args = ' '.join(DEFAULT_LAUNCH_ARGS.get(launch_key, []))
+            node.declare_parameter(f'launch_args.{launch_key}', default_args)
+            self._add(f'~/start/{launch_key}', lambda req, res, key=launch_key: self._start(key, res))
+            self._add(f'~/stop/{launch_key}', lambda req, res, key=launch_key: self._stop(key, res))
+        for name in STACKS:
+            self._add(f'~/start_stack/{name}', lambda req, res, name=name: self._start_stack(name, res))
+        for launch_key in MAP_SAVING_LAUNCH_KEYS:
+            self._add(f'~/save_map/{launch_key}',
+                      lambda req, res, key=launch_key: self._save_map(key, res))
+        self._add('~/stop_all', lambda req, res: self._stop_all(res))
+        self._add('~/status', lambda req, res: self._status(res))
+        node.declare_parameter('map_dir', str(map_dir))
+        node.declare_parameter('custom_launch_file', '')
+
+    def destroy(self):
+        for service in self.services:
+            self.node.destroy_service(service)
+        self.services = []
+
+    def _add(self, name, callback):
+        self.services.append(self.node.create_service(Trigger, name, callback))
+
+    def _start(self, launch_key, response):
+        if launch_key == 'custom':
+            custom_file = self.node.get_parameter('custom_launch_file').value
+            if custom_file:
+                self.node.launch_files['custom'] = custom_file
+        launch_file = self.node.launch_files.get(launch_key)
+        if not launch_file:
+            response.success = False
+            response.message = f"No launch file configured for '{launch_key}'"
+            return response
+        if self.node.is_running(launch_key) or self.node.supervisor.is_busy(launch_key):
+            response.success = False
+            response.message = f"'{launch_key}' is already running or busy"
+            return response
+        extra_args = shlex.split(self.node.get_parameter(f'launch_args.{launch_key}').value)
+        self.node.start_launch_async(launch_key, launch_file, extra_args or None)
+        response.success = True
+        response.message = f"Start of '{launch_key}' queued"
+        return response
+
+    def _start_stack(self, name, response):
+        problems = self.node.stacks.check(name)
+        if problems:
+            response.success = False
+            response.message = '; '.join(problems)
+            return response
+        # launch_args.<key> replaces the stack's arguments for <key> when set
+        args = {}
+        for key in STACKS[name].components:
+            key_args = shlex.split(self.node.get_parameter(f'launch_args.{key}').value)
+            if key_args:
+                args[key] = key_args
+        self.node.stacks.start(name, args)
+        response.success = True
+        response.message = f"Stack '{name}' starting"
+        return response
+
+    def _stop(self, launch_key, response):
+        for job in self.node.supervisor.pending_jobs(launch_key):
+            if job.action == 'start':
+                job.cancel()
+        self.node.stop_launch_async(launch_key)
+        response.success = True
+        response.message = f"Stop of '{launch_key}' queued"
+        return response
+
+    def _stop_all(self, response):
+        self.node.stop_all_async()
+        response.success = True
+        response.message = "Stop of all launches queued"
+        return response
+
+    def _save_map(self, launch_key, response):
+        if not self.node.is_running(launch_key):
+            response.success = False
+            response.message = f"'{launch_key}' is not running"
+            return response
+        if launch_key in MAP_SERVICES and not self.node.map_saver.available(launch_key):
+            response.success = False
+            response.message = f"{MAP_SERVICES[launch_key].name} is not offered (yet)"
+            return response
+        map_dir = os.path.expanduser(self.node.get_parameter('map_dir').value)
+        os.makedirs(map_dir, exist_ok=True)
+        save_path = default_save_path(launch_key, map_dir)
+
+        def run_save(job=None):
+            result = self.node.map_saver.save(
+                launch_key, save_path,
+                lambda message: self.node.log(message, launch_key=launch_key),
+                rtabmap_db=self.node.launch_argument('rtabmap', 'database_path'), job=job)
+            self.node.log(result.message, level='INFO' if result.success else 'ERROR',
+                          launch_key=launch_key)
+            return result.success
+
+        self.node.supervisor.submit('save_map', launch_key, run_save)
+        response.success = True
+        response.message = f"Saving map of '{launch_key}' to {save_path}"
+        return response
+
+    def _status(self, response):
+        now = time.time()
+        status = {}
+        for launch_key in list(self.node.processes):
+            running = self.node.is_running(launch_key)
+            tracker = self.node.processes.get(launch_key)
+            running = running and tracker is not None
+            status[launch_key] = {
+                'running': running,
+                'ready': self.node.is_ready(launch_key),
+                'pid': tracker.pid if running else None,
+                'uptime': now - tracker.started_at if running else None,
+                'time_to_ready': self.node.time_to_ready.get(launch_key),
+                'pending': [job.action for job in self.node.supervisor.pending_jobs(launch_key)],
+                'launch_file': self.node.launch_files.get(launch_key),
+            }
+        response.success = True
+        response.message = json.dumps(status)
+        return response
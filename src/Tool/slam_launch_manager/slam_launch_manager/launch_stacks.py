@@ -0,0 +1,399 @@
+"""Launch stacks: launches brought up together, ordered by what they depend on
+
+Which launch needs which other launch ready, and which launches cannot run
+side by side, is declared once per key in LAUNCH_DEPENDENCIES; the Start
+buttons are gated by the same table. A stack (STACKS) lists the launch keys
+of one session and the arguments each gets. StackOrchestrator starts every
+component whose prerequisites are ready at once, as parallel supervisor jobs,
+and each remaining one the moment its last prerequisite becomes ready, then
+reports where the bring-up time went along the critical path.
+"""
+
+import threading
+import time
+
+
+class DependencySpec:
+    """Launches a launch needs ready before it starts, and launches it excludes"""
+
+    def __init__(self, requires=(), conflicts_with=()):
+        self.requires = tuple(requires)
+        self.conflicts_with = tuple(conflicts_with)
+
+
+# Per launch key; keys without an entry have no dependencies. Mapping and
+# localization of the same backend exclude each other
+LAUNCH_DEPENDENCIES = {
+    'dss_lio_sam': DependencySpec(requires=['dss'], conflicts_with=['dss_lio_sam_loc']),
+    'dss_lio_sam_loc': DependencySpec(requires=['dss'], conflicts_with=['dss_lio_sam']),
+    'rtabmap': DependencySpec(requires=['dss'], conflicts_with=['rtabmap_loc']),
+    'rtabmap_loc': DependencySpec(requires=['dss'], conflicts_with=['rtabmap']),
+    'kissicp': DependencySpec(requires=['dss']),
+    'slamtoolbox': DependencySpec(requires=['dss'], conflicts_with=['slamtoolbox_loc']),
+    'slamtoolbox_loc': DependencySpec(requires=['dss'], conflicts_with=['slamtoolbox']),
+    'hdl_slam': DependencySpec(requires=['dss'], conflicts_with=['hdl_loc']),
+    'hdl_loc': DependencySpec(requires=['dss'], conflicts_with=['hdl_slam']),
+}
+
+NO_DEPENDENCIES = DependencySpec()
+
+
+def dependencies(launch_key):
+    return LAUNCH_DEPENDENCIES.get(launch_key, NO_DEPENDENCIES)
+
+
+def conflicting_keys(launch_key):
+    """Keys that cannot run alongside launch_key, declared on either side"""
+    keys = set(dependencies(launch_key).conflicts_with)
+    keys.update(key for key, spec in LAUNCH_DEPENDENCIES.items() if launch_key in spec.conflicts_with)
+    return keys
+
+
+class StackComponent:
+    """One launch of a stack
+
+    requires adds ordering inside the stack on top of LAUNCH_DEPENDENCIES;
+    ready (a ReadinessSpec) is checked after the launch's own readiness
+    (LAUNCH_READINESS).
+    """
+
+    def __init__(self, launch_key, args=(), requires=(), ready=None):
+        self.launch_key = launch_key
+        self.args = list(args)
+        self.requires = tuple(requires)
+        self.ready = ready
+
+
+class StackSpec:
+    def __init__(self, description, components):
+        self.description = description
+        self.components = {component.launch_key: component for component in components}
+
+    def prerequisites(self, launch_key):
+        """Keys that must be ready before launch_key starts (in the stack or not)"""
+        component = self.components[launch_key]
+        return tuple(dict.fromkeys(dependencies(launch_key).requires + component.requires))
+
+    def problems(self):
+        """Conflicts and dependency cycles inside the stack"""
+        problems = []
+        keys = list(self.components)
+        for index, key in enumerate(keys):
+            for other in keys[index + 1:]:
+                if other in conflicting_keys(key):
+                    problems.append(f"'{key}' and '{other}' cannot run together")
+        # Kahn's algorithm: whatever is left never gets all its prerequisites
+        remaining = {key: {r for r in self.prerequisites(key) if r in self.components} for key in keys}
+        while True:
+            free = [key for key, requires in remaining.items() if not requires]
+            if not free:
+                break
+            for key in free:
+                del remaining[key]
+            for requires in remaining.values():
+                requires.difference_update(free)
+        if remaining:
+            problems.append(f"dependency cycle between {', '.join(sorted(remaining))}")
+        return problems
+
+
+SIM_TIME = ['use_sim_time:=true']
+
+# One-click sessions: the DSS bridge and a mapping backend
+STACKS = {
+    'dss_lio_sam': StackSpec('DSS + LIO-SAM', [
+        StackComponent('dss', SIM_TIME), StackComponent('dss_lio_sam')]),
+    'rtabmap': StackSpec('DSS + RTAB-MAP', [
+        StackComponent('dss', SIM_TIME), StackComponent('rtabmap', SIM_TIME)]),
+    'kissicp': StackSpec('DSS + KISS-ICP', [
+        StackComponent('dss', SIM_TIME), StackComponent('kissicp', SIM_TIME)]),
+    'slamtoolbox': StackSpec('DSS + SLAM-Toolbox', [
+        StackComponent('dss', SIM_TIME), StackComponent('slamtoolbox', SIM_TIME)]),
+    'hdl_slam': StackSpec('DSS + HDL Graph SLAM', [
+        StackComponent('dss', SIM_TIME), StackComponent('hdl_slam')]),
+}
+
+
+class ComponentRun:
+    """Progress of one component; times are time.monotonic() values
+
+    state is 'waiting', 'starting', 'ready', 'failed', 'skipped' or
+    'cancelled'. gated_by is the prerequisite in the stack that became ready
+    last before the component was queued.
+    """
+
+    def __init__(self, launch_key):
+        self.launch_key = launch_key
+        self.state = 'waiting'
+        self.job = None
+        self.queued_at = None
+        self.spawned_at = None
+        self.ready_at = None
+        self.gated_by = None
+        self.error = None
+        self.launch_ready = False
+
+
+class StackRun:
+    """One bring-up of a stack, driven by StackOrchestrator"""
+
+    def __init__(self, name, spec, args=None):
+        self.name = name
+        self.spec = spec
+        self.args = {key: list(component.args) for key, component in spec.components.items()}
+        self.args.update(args or {})
+        self.components = {key: ComponentRun(key) for key in spec.components}
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.ok = None
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the run finished; True if every component became ready"""
+        self._done.wait(timeout)
+        return bool(self.ok)
+
+    @property
+    def duration(self):
+        if self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def critical_path(self):
+        """ComponentRuns whose waits added up to the bring-up time, first to last"""
+        ready = [c for c in self.components.values() if c.ready_at is not None]
+        if not ready:
+            return []
+        path = [max(ready, key=lambda c: c.ready_at)]
+        while path[0].gated_by is not None:
+            path.insert(0, self.components[path[0].gated_by])
+        return path
+
+    def summary(self):
+        """One line: total time and the start/ready split of each step on the critical path"""
+        steps = []
+        for component in self.critical_path():
+            spawned = component.spawned_at if component.spawned_at is not None else component.ready_at
+            start = max(0.0, spawned - component.queued_at)
+            ready = max(0.0, component.ready_at - spawned)
+            steps.append(f"{component.launch_key} (start {start:.2f}s + ready {ready:.2f}s)")
+        total = (self.finished_at or time.monotonic()) - self.started_at
+        if self.ok:
+            outcome = 'up'
+        elif any(c.state == 'cancelled' for c in self.components.values()):
+            outcome = 'cancelled'
+        else:
+            outcome = 'failed'
+        text = f"Stack '{self.name}' {outcome} after {total:.2f}s"
+        if steps:
+            text += f"; critical path: {' -> '.join(steps)}"
+        return text
+
+
+class StackOrchestrator:
+    """Starts stacks on a SlamLaunchManagerNode, each launch as early as possible
+
+    Everything is event driven: start jobs finishing (supervisor listener),
+    launches becoming ready (ready listeners) and launches exiting (exit
+    listeners) advance every active run; nothing waits or polls. A component
+    whose launch is already running is not started again. When a component
+    fails, components depending on it are skipped; launches already started
+    keep running. Listeners get (run) from whichever thread finished it.
+    """
+
+    def __init__(self, node):
+        self.node = node
+        self._runs = []
+        self._lock = threading.RLock()
+        self._listeners = []
+        node.supervisor.add_listener(self._on_job_finished)
+        node.ready_listeners.append(self._on_launch_ready)
+        node.exit_listeners.append(self._on_launch_exit)
+
+    def add_listener(self, callback):
+        """Register callback(run) to be called when a run finished, failed or was cancelled"""
+        self._listeners.append(callback)
+
+    def active_runs(self):
+        with self._lock:
+            return list(self._runs)
+
+    def check(self, name):
+        """Reasons the stack cannot be started right now (empty if it can)"""
+        spec = STACKS.get(name)
+        if spec is None:
+            return [f"unknown stack '{name}'"]
+        problems = spec.problems()
+        active = {key for run in self.active_runs() for key in run.components}
+        for key in spec.components:
+            if key in active:
+                problems.append(f"'{key}' is already being started by another stack")
+            if not self.node.is_running(key) and not self.node.launch_files.get(key):
+                problems.append(f"no launch file configured for '{key}'")
+            for other in conflicting_keys(key):
+                if other not in spec.components and (
+                        self.node.is_running(other) or self.node.supervisor.is_busy(other)):
+                    problems.append(f"'{key}' conflicts with running '{other}'")
+            for required in spec.prerequisites(key):
+                if required not in spec.components and not self.node.is_ready(required):
+                    problems.append(f"'{key}' requires '{required}', which is not part of the stack or ready")
+        return problems
+
+    def start(self, name, args=None):
+        """Start the stack, returns its StackRun; None (with the problems logged) if it cannot start
+
+        args maps launch keys to the arguments replacing the stack's defaults.
+        """
+        problems = self.check(name)
+        if problems:
+            for problem in problems:
+                self.node.log(f"Not starting stack '{name}': {problem}", level='ERROR')
+            return None
+        run = StackRun(name, STACKS[name], args)
+        self.node.log(f"Starting stack '{name}': {', '.join(run.components)}")
+        with self._lock:
+            self._runs.append(run)
+            self._advance(run)
+        return run
+
+    def cancel(self, run):
+        """Stop starting further components of run; a start not yet spawned is cancelled too"""
+        with self._lock:
+            if run not in self._runs:
+                return
+            for component in run.components.values():
+                if component.state == 'waiting':
+                    component.state = 'cancelled'
+                elif component.state == 'starting':
+                    if component.job is not None and not component.job.done():
+                        component.job.cancel()
+                    component.state = 'cancelled'
+            self._finish(run)
+
+    def cancel_all(self):
+        for run in self.active_runs():
+            self.cancel(run)
+
+    def _advance(self, run):
+        """Queue every waiting component whose prerequisites are ready, then finish if done"""
+        progressed = True
+        while progressed:
+            progressed = False
+            for key, component in run.components.items():
+                if component.state != 'waiting':
+                    continue
+                prerequisites = run.spec.prerequisites(key)
+                in_stack = [run.components[r] for r in prerequisites if r in run.components]
+                if any(r.state in ('failed', 'skipped', 'cancelled') for r in in_stack):
+                    component.state = 'skipped'
+                    progressed = True
+                    continue
+                if any(r.state != 'ready' for r in in_stack):
+                    continue
+                if not all(self.node.is_ready(r) for r in prerequisites if r not in run.components):
+                    continue
+                if in_stack:
+                    component.gated_by = max(in_stack, key=lambda r: r.ready_at).launch_key
+                self._launch(run, component)
+                progressed = True
+        if all(c.state != 'waiting' and c.state != 'starting' for c in run.components.values()):
+            self._finish(run)
+
+    def _launch(self, run, component):
+        key = component.launch_key
+        component.queued_at = time.monotonic()
+        component.state = 'starting'
+        if self.node.is_running(key):
+            component.spawned_at = component.queued_at
+            if self.node.is_ready(key):
+                self._component_ready(run, component)
+            return
+        component.job = self.node.start_launch_async(key, self.node.launch_files[key], run.args.get(key) or None)
+
+    def _component_ready(self, run, component):
+        """The launch's own readiness is met; wait for the component's extra condition if any"""
+        if component.launch_ready:
+            return
+        component.launch_ready = True
+        spec = run.spec.components[component.launch_key].ready
+        if spec is not None and not spec.empty():
+            self.node.readiness.wait(
+                (run.name, id(run), component.launch_key), spec,
+                lambda _key, _elapsed, timed_out: self._extra_ready(run, component, spec, timed_out))
+            return
+        component.ready_at = time.monotonic()
+        component.state = 'ready'
+
+    def _extra_ready(self, run, component, spec, timed_out):
+        with self._lock:
+            if component.state != 'starting':
+                return
+            if timed_out:
+                missing = ', '.join(self.node.readiness.missing(spec))
+                self.node.log(f"Warning: stack '{run.name}' gave up waiting for {missing}, "
+                              f"treating '{component.launch_key}' as ready", launch_key=component.launch_key)
+            component.ready_at = time.monotonic()
+            component.state = 'ready'
+            self._advance(run)
+
+    def _fail(self, run, component, error):
+        component.state = 'failed'
+        component.error = error
+        self.node.log(f"Stack '{run.name}': {error}", level='ERROR', launch_key=component.launch_key)
+        self._advance(run)
+
+    def _finish(self, run):
+        if run not in self._runs:
+            return
+        self._runs.remove(run)
+        run.finished_at = time.monotonic()
+        run.ok = all(c.state == 'ready' for c in run.components.values())
+        self.node.log(run.summary(), level='INFO' if run.ok else 'WARN')
+        left_running = [c.launch_key for c in run.components.values()
+                        if not run.ok and c.state in ('ready', 'cancelled') and self.node.is_running(c.launch_key)]
+        if left_running:
+            self.node.log(f"Stack '{run.name}' left running: {', '.join(left_running)}")
+        run._done.set()
+        for callback in list(self._listeners):
+            try:
+                callback(run)
+            except Exception:
+                pass
+
+    def _components(self, launch_key, states):
+        """(run, component) of every active run whose launch_key component is in states"""
+        for run in list(self._runs):
+            component = run.components.get(launch_key)
+            if component is not None and component.state in states:
+                yield run, component
+
+    def _on_job_finished(self, job):
+        if job.action != 'start':
+            return
+        with self._lock:
+            for run, component in self._components(job.launch_key, ('starting',)):
+                if component.job is not job:
+                    continue
+                if job.ok:
+                    component.spawned_at = job.finished_at
+                    # Launches without readiness interfaces were ready before the job ended
+                    if self.node.is_ready(job.launch_key):
+                        self._component_ready(run, component)
+                    self._advance(run)
+                else:
+                    self._fail(run, component, f"start of '{job.launch_key}' failed")
+
+    def _on_launch_ready(self, launch_key, _time_to_ready):
+        with self._lock:
+            for run, component in self._components(launch_key, ('starting',)):
+                self._component_ready(run, component)
+                self._advance(run)
+
+    def _on_launch_exit(self, launch_key, _event):
+        with self._lock:
+            for run, component in self._components(launch_key, ('starting', 'ready')):
+                self._fail(run, component, f"'{launch_key}' exited during the bring-up")
@@ -0,0 +1,52 @@
+"""Per-launch state snapshots that report only what changed since the last refresh"""
+
+from collections import namedtuple
+
+# pending: a supervisor job for the key is queued or running;
+# starting: one of those jobs is a start (so Stop can cancel it)
+LaunchState = namedtuple('LaunchState', ['running', 'ready', 'pending', 'starting'])
+
+STOPPED = LaunchState(running=False, ready=False, pending=False, starting=False)
+
+
+class LaunchStateModel:
+    """Launch states of a SlamLaunchManagerNode, diffed on every refresh
+
+    refresh() is cheap (field reads on the node and the supervisor) and is
+    called whenever something may have changed: a job was submitted or
+    finished, a launch exited or became ready. Listeners get only the keys
+    whose state differs from the previous refresh, so widgets are touched
+    only when their launch actually changed.
+    """
+
+    def __init__(self, node):
+        self.node = node
+        self.states = {key: STOPPED for key in node.processes}
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """Register callback(changes, states); changes maps key -> (old, new) state"""
+        self._listeners.append(callback)
+
+    def state(self, launch_key):
+        jobs = self.node.supervisor.pending_jobs(launch_key)
+        running = self.node.is_running(launch_key)
+        return LaunchState(
+            running=running,
+            ready=running and self.node.is_ready(launch_key),
+            pending=bool(jobs),
+            starting=any(job.action == 'start' for job in jobs))
+
+    def refresh(self):
+        """Re-read every key, notify listeners of changes and return them"""
+        changes = {}
+        for launch_key in list(self.node.processes):
+            new = self.state(launch_key)
+            old = self.states.get(launch_key, STOPPED)
+            if new != old:
+                changes[launch_key] = (old, new)
+                self.states[launch_key] = new
+        if changes:
+            for callback in list(self._listeners):
+                callback(changes, self.states)
+        return changes
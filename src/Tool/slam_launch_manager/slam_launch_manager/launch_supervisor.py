@@ -0,0 +1,181 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LaunchJobCancelled(Exception):
+    """Raised inside a job when it was cancelled before reaching a point of no return"""
+
+
+class LaunchJob:
+    """A single start/stop request for one launch key"""
+
+    def __init__(self, action, launch_key):
+        self.action = action
+        self.launch_key = launch_key
+        self.future = None
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel_event = threading.Event()
+        self._cancel_callbacks = []
+        self._cancel_guard = threading.Lock()
+
+    def cancel(self):
+        """Request cancellation; queued jobs never run, running jobs stop at the next checkpoint"""
+        with self._cancel_guard:
+            already = self._cancel_event.is_set()
+            self._cancel_event.set()
+            callbacks, self._cancel_callbacks = self._cancel_callbacks, []
+        if self.future is not None:
+            self.future.cancel()
+        if not already:
+            for callback in callbacks:
+                callback()
+
+    def add_cancel_callback(self, callback):
+        """Call callback() when cancellation is requested (right away if it already was)
+
+        For jobs blocked on something other than sleep(), e.g. a service response.
+        """
+        with self._cancel_guard:
+            if not self._cancel_event.is_set():
+                self._cancel_callbacks.append(callback)
+                return
+        callback()
+
+    @property
+    def cancel_requested(self):
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Raise LaunchJobCancelled if cancellation was requested"""
+        if self._cancel_event.is_set():
+            raise LaunchJobCancelled(f"{self.action} '{self.launch_key}' cancelled")
+
+    def sleep(self, seconds):
+        """Interruptible sleep, raises LaunchJobCancelled if cancelled while waiting"""
+        if self._cancel_event.wait(seconds):
+            self.check_cancelled()
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    @property
+    def cancelled(self):
+        if self.future is None:
+            return False
+        if self.future.cancelled():
+            return True
+        return self.future.done() and isinstance(self.future.exception(), LaunchJobCancelled)
+
+    @property
+    def ok(self):
+        """True if the job finished and its function returned a truthy result"""
+        if not self.done() or self.cancelled or self.future.exception() is not None:
+            return False
+        return bool(self.future.result())
+
+    @property
+    def duration(self):
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+class LaunchSupervisor:
+    """Owns launch start/stop jobs and runs them on a small worker pool
+
+    Jobs for the same launch key are serialized by a per-key lock, so a stop
+    can never overtake the start it follows, while different keys run in
+    parallel. Listeners are called from the worker thread when a job ends,
+    submit listeners from whichever thread submitted it; the UI forwards
+    both through a Qt signal.
+    """
+
+    def __init__(self, max_workers=4):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='launch-supervisor')
+        self._key_locks = {}
+        self._key_locks_guard = threading.Lock()
+        self._pending = {}
+        self._pending_guard = threading.Lock()
+        self._listeners = []
+        self._submit_listeners = []
+
+    def add_listener(self, callback):
+        """Register callback(job) to be called whenever a job finishes or is cancelled"""
+        self._listeners.append(callback)
+
+    def add_submit_listener(self, callback):
+        """Register callback(job) to be called whenever a job is queued"""
+        self._submit_listeners.append(callback)
+
+    def key_lock(self, launch_key):
+        """Lock serializing every job that touches the given launch key"""
+        with self._key_locks_guard:
+            lock = self._key_locks.get(launch_key)
+            if lock is None:
+                lock = threading.RLock()
+                self._key_locks[launch_key] = lock
+            return lock
+
+    def submit(self, action, launch_key, fn, *args, **kwargs):
+        """Queue fn(*args, job=job, **kwargs) and return the LaunchJob tracking it"""
+        job = LaunchJob(action, launch_key)
+        with self._pending_guard:
+            self._pending.setdefault(launch_key, set()).add(job)
+        job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+        job.future.add_done_callback(lambda _future: self._finish(job))
+        self._notify(self._submit_listeners, job)
+        return job
+
+    def is_busy(self, launch_key):
+        """True while a job for the launch key is queued or running"""
+        with self._pending_guard:
+            return bool(self._pending.get(launch_key))
+
+    def pending_jobs(self, launch_key=None):
+        with self._pending_guard:
+            if launch_key is not None:
+                return list(self._pending.get(launch_key, ()))
+            return [job for jobs in self._pending.values() for job in jobs]
+
+    def cancel_all(self):
+        for job in self.pending_jobs():
+            job.cancel()
+
+    def shutdown(self, wait=True):
+        self.cancel_all()
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job, fn, args, kwargs):
+        job.check_cancelled()
+        lock = self.key_lock(job.launch_key) if job.launch_key is not None else None
+        if lock is not None:
+            lock.acquire()
+        try:
+            job.started_at = time.monotonic()
+            job.check_cancelled()
+            return fn(*args, job=job, **kwargs)
+        finally:
+            job.finished_at = time.monotonic()
+            if lock is not None:
+                lock.release()
+
+    def _finish(self, job):
+        if job.finished_at is None:
+            job.finished_at = time.monotonic()
+        with self._pending_guard:
+            jobs = self._pending.get(job.launch_key)
+            if jobs is not None:
+                jobs.discard(job)
+        self._notify(self._listeners, job)
+
+    @staticmethod
+    def _notify(listeners, job):
+        for callback in list(listeners):
+            try:
+                callback(job)
+            except Exception:
+                pass
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Pre-warmed launch worker: imports the launch API up front, then runs one launch
+
+Started by LaunchWorkerPool as `python3 launch_worker.py <status_fd>`. The
+worker imports launch/launch_ros, writes "ready" to status_fd and blocks on
+stdin for a single JSON request {"launch_file", "arguments", "cwd",
+"cgroup_procs", "output"}; output, if set, is the path of the manager's
+capture pty/pipe and replaces stdout/stderr. It then runs a LaunchService for that file in this process,
+so the session/PID the manager tracks behaves exactly like `ros2 launch`.
+This file is executed by path and must not import slam_launch_manager.
+"""
+
+import json
+import os
+import sys
+
+# The expensive part of a `ros2 launch` cold start, paid before any click
+import launch
+import launch.actions
+import launch.launch_description_sources
+import launch_ros  # noqa: F401  (imported for its side effects and warm caches)
+
+
+def parse_launch_arguments(arguments):
+    """Turn ['name:=value', ...] into [(name, value), ...] like ros2 launch does"""
+    parsed = []
+    for argument in arguments:
+        name, sep, value = argument.partition(':=')
+        if not sep or not name:
+            raise ValueError(f"malformed launch argument '{argument}', expected 'name:=value'")
+        parsed.append((name, value))
+    return parsed
+
+
+def run_launch(request):
+    if request.get('cgroup_procs'):
+        with open(request['cgroup_procs'], 'w') as f:
+            f.write(str(os.getpid()))
+    os.chdir(request.get('cwd') or os.path.expanduser('~'))
+
+    launch_file = request['launch_file']
+    arguments = request.get('arguments') or []
+    sys.argv = ['ros2', 'launch', launch_file] + arguments
+
+    launch_service = launch.LaunchService(argv=arguments, noninteractive=True)
+    launch_service.include_launch_description(launch.LaunchDescription([
+        launch.actions.IncludeLaunchDescription(
+            launch.launch_description_sources.AnyLaunchDescriptionSource(launch_file),
+            launch_arguments=parse_launch_arguments(arguments),
+        ),
+    ]))
+    return launch_service.run()
+
+
+def main():
+    status_fd = int(sys.argv[1])
+    os.write(status_fd, b'ready\n')
+
+    line = sys.stdin.readline()
+    if not line:
+        return 0  # pool discarded this worker
+    request = json.loads(line)
+    if request.get('output'):
+        # Opened before reporting "running" so a failure falls back to the CLI
+        output = os.open(request['output'], os.O_WRONLY | os.O_NOCTTY)
+        os.dup2(output, 1)
+        os.dup2(output, 2)
+        os.close(output)
+    os.write(status_fd, b'running\n')
+    os.close(status_fd)
+    # Nodes inherit stdin: point it at /dev/null like the CLI path does
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    return run_launch(request)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
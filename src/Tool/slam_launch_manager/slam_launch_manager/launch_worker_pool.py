@@ -0,0 +1,196 @@
+"""Pool of pre-warmed launch worker processes that skip the `ros2 launch` cold start"""
+
+import json
+import os
+import select
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+WORKER_SCRIPT = Path(__file__).resolve().parent / 'launch_worker.py'
+
+
+class LaunchWorker:
+    """One idle worker process waiting for a launch request"""
+
+    def __init__(self, process, status_fd, env):
+        self.process = process
+        self.pid = process.pid
+        self.status_fd = status_fd
+        self.env = env
+        self.ready = False
+        self.spawned_at = time.monotonic()
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def wait_for(self, expected, timeout):
+        """Wait for a status line from the worker, returns True if it matched"""
+        ready, _, _ = select.select([self.status_fd], [], [], timeout)
+        if not ready:
+            return False
+        line = b''
+        while not line.endswith(b'\n'):
+            chunk = os.read(self.status_fd, 64)
+            if not chunk:
+                return False
+            line += chunk
+        return line.strip().decode() == expected
+
+    def wait_ready(self, timeout):
+        if not self.ready:
+            self.ready = self.wait_for('ready', timeout)
+        return self.ready
+
+    def send(self, request):
+        self.process.stdin.write((json.dumps(request) + '\n').encode())
+        self.process.stdin.flush()
+        self.process.stdin.close()
+
+    def close_status(self):
+        try:
+            os.close(self.status_fd)
+        except OSError:
+            pass
+
+    def discard(self):
+        """Terminate an idle worker (closing stdin makes it exit on its own)"""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self.close_status()
+        try:
+            os.killpg(self.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        self.process.wait()
+
+
+class LaunchWorkerPool:
+    """Keeps `size` worker processes with the launch API already imported
+
+    A launch request is handed to an idle worker over its stdin; the worker
+    becomes the launch process itself (own session, our child), so it is
+    tracked and torn down exactly like a `ros2 launch` process. Workers are
+    spawned with the environment from env_provider and are replaced whenever
+    that environment changes. If no warm worker is available the caller falls
+    back to the CLI.
+    """
+
+    def __init__(self, size, env_provider, cwd=None, log=None):
+        self.size = size
+        self.env_provider = env_provider
+        self.cwd = cwd or os.path.expanduser('~')
+        self.log = log
+        self._idle = []
+        self._lock = threading.Lock()
+        self._refill_event = threading.Event()
+        self._closed = False
+        self._thread = None
+
+    def start(self):
+        if self.size <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._refill_loop, name='launch-worker-pool',
+                                        daemon=True)
+        self._thread.start()
+        self._refill_event.set()
+
+    def launch(self, launch_file, arguments=None, cgroup_procs=None, output=None, timeout=2.0):
+        """Run a launch file in a warm worker, returns its Popen or None to use the CLI
+
+        The caller keeps the Popen referenced until the worker has been reaped
+        (ExitWatcher.watch with process=), otherwise subprocess reaps it first.
+        """
+        worker = self._acquire()
+        self._refill_event.set()
+        if worker is None:
+            return None
+        request = {
+            'launch_file': launch_file,
+            'arguments': list(arguments or []),
+            'cwd': self.cwd,
+            'cgroup_procs': cgroup_procs,
+            'output': output,
+        }
+        try:
+            worker.send(request)
+            accepted = worker.wait_for('running', timeout)
+        except OSError:
+            accepted = False
+        worker.close_status()
+        if not accepted:
+            self._log(f"Launch worker {worker.pid} did not accept the request")
+            worker.discard()
+            return None
+        return worker.process
+
+    def idle_count(self):
+        with self._lock:
+            return len(self._idle)
+
+    def shutdown(self):
+        self._closed = True
+        self._refill_event.set()
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.discard()
+
+    def _acquire(self):
+        try:
+            env = self.env_provider()
+        except Exception as e:
+            self._log(f"Launch worker pool unavailable: {e}")
+            return None
+        with self._lock:
+            candidates, self._idle = self._idle, []
+        chosen = None
+        for worker in candidates:
+            if chosen is None and worker.env == env and worker.alive() and worker.wait_ready(0.5):
+                chosen = worker
+            elif worker.env == env and worker.alive():
+                with self._lock:
+                    self._idle.append(worker)
+            else:
+                # Stale environment (install tree changed) or dead worker
+                worker.discard()
+        return chosen
+
+    def _spawn(self, env):
+        status_r, status_w = os.pipe()
+        try:
+            process = subprocess.Popen(
+                [sys.executable, str(WORKER_SCRIPT), str(status_w)],
+                env=env,
+                stdin=subprocess.PIPE,
+                cwd=self.cwd,
+                pass_fds=(status_w,),
+                start_new_session=True
+            )
+        finally:
+            os.close(status_w)
+        return LaunchWorker(process, status_r, env)
+
+    def _refill_loop(self):
+        while True:
+            self._refill_event.wait()
+            self._refill_event.clear()
+            if self._closed:
+                return
+            try:
+                env = self.env_provider()
+                while not self._closed and self.idle_count() < self.size:
+                    worker = self._spawn(env)
+                    with self._lock:
+                        self._idle.append(worker)
+            except Exception as e:
+                self._log(f"Could not spawn launch worker: {e}")
+
+    def _log(self, message):
+        if self.log is not None:
+            self.log(message)
@@ -0,0 +1,121 @@
+"""Structured, bounded log sink: producers enqueue events, the UI drains them in batches"""
+
+import json
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+
+from slam_launch_manager.output_capture import RotatingOutputFile
+
+LogEvent = namedtuple('LogEvent', ['timestamp', 'level', 'launch_key', 'message'])
+
+LEVELS = ('DEBUG', 'INFO', 'WARN', 'ERROR')
+_LEVEL_RANK = {level: rank for rank, level in enumerate(LEVELS)}
+
+
+def infer_level(message):
+    """Level of a message logged without one, from the wording the manager uses"""
+    lowered = message.lower()
+    if lowered.startswith(('error', 'failed')) or ' failed' in lowered:
+        return 'ERROR'
+    if lowered.startswith('warning') or 'not available' in lowered:
+        return 'WARN'
+    return 'INFO'
+
+
+class LogFilter:
+    """Minimum level and (optionally) a single launch key; None matches everything"""
+
+    def __init__(self, min_level='DEBUG', launch_key=None):
+        self.min_level = min_level
+        self.launch_key = launch_key
+
+    def matches(self, event):
+        if _LEVEL_RANK[event.level] < _LEVEL_RANK[self.min_level]:
+            return False
+        return self.launch_key is None or event.launch_key == self.launch_key
+
+
+def format_event(event):
+    stamp = time.strftime('%H:%M:%S', time.localtime(event.timestamp))
+    prefix = f"[{stamp}]"
+    if event.level != 'INFO':
+        prefix += f" {event.level}"
+    if event.launch_key:
+        prefix += f" [{event.launch_key}]"
+    return f"{prefix} {event.message}"
+
+
+class LogSink:
+    """Thread-safe log sink with bounded memory
+
+    emit() may be called from any thread; it only puts the event on a
+    SimpleQueue. The consumer (the UI's frame timer) calls drain() to take
+    everything queued so far in one batch, which also appends the batch to the
+    rotating JSONL mirror with a single write. The last `history` events are
+    kept so a view can be re-filtered. wake() is called (from the emitting
+    thread) when an event is queued while nothing was pending, so the
+    consumer only needs to run while pending is set.
+    """
+
+    def __init__(self, history=5000, wake=None):
+        self.history = deque(maxlen=history)
+        self.wake = wake
+        self._queue = queue.SimpleQueue()
+        self._mirror = None
+        self._pending = False
+        self._pending_lock = threading.Lock()
+
+    @property
+    def pending(self):
+        """True from the first queued event until a drain() found nothing left"""
+        return self._pending
+
+    def open_mirror(self, path, max_bytes=5 << 20, backups=3):
+        """Mirror drained events to path as JSON lines, rotating at max_bytes"""
+        if self._mirror is not None:
+            self._mirror.close()
+        self._mirror = RotatingOutputFile(path, max_bytes, backups) if path else None
+
+    def emit(self, message, level=None, launch_key=None):
+        self._queue.put(LogEvent(time.time(), level or infer_level(message), launch_key, message))
+        if self._pending:
+            return
+        with self._pending_lock:
+            if self._pending:
+                return
+            self._pending = True
+        if self.wake is not None:
+            self.wake()
+
+    def drain(self, max_events=1000):
+        """Events queued since the last drain (at most max_events), oldest first"""
+        # Cleared before reading: an event queued after this point wakes the
+        # consumer again, one queued before it is in this batch
+        with self._pending_lock:
+            self._pending = False
+        events = []
+        while len(events) < max_events:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        else:
+            with self._pending_lock:
+                self._pending = True  # more than max_events were queued
+        if events:
+            self.history.extend(events)
+            if self._mirror is not None:
+                try:
+                    self._mirror.write(''.join(
+                        json.dumps(event._asdict()) + '\n' for event in events).encode())
+                except OSError:
+                    self._mirror = None
+        return events
+
+    def close(self):
+        self.drain()
+        if self._mirror is not None:
+            self._mirror.close()
+            self._mirror = None
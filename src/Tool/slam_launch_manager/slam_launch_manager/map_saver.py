@@ -0,0 +1,271 @@
+"""Map saving for each SLAM launch, shared by the Qt window and the headless services
+
+Backends that save through a service are called with typed rclpy clients on
+the manager node: the service type is looked up from the graph (or
+MAP_SERVICES) with rosidl_runtime_py, the request goes out with call_async
+and success is read from the response fields. MapSaver.save() waits on the
+calling thread, normally a supervisor worker (save_async), so neither the Qt
+thread nor the executor ever blocks. A save can time out or be cancelled;
+either only stops waiting, the backend may still write the map.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from rclpy.callback_groups import ReentrantCallbackGroup
+from rosidl_runtime_py.utilities import get_service
+
+from slam_launch_manager.db_snapshot import SnapshotError, format_progress, snapshot_database
+
+# success is False when the map was definitely not written; paths are the
+# files (or directory) the map should now be in
+MapSaveResult = namedtuple('MapSaveResult', ['success', 'message', 'paths'])
+
+DEFAULT_RTABMAP_DB = os.path.expanduser('~/.ros/rtabmap.db')
+
+# Service each backend saves through: name, type (used when the graph lists
+# none for the name) and how long a save may take in seconds
+MapService = namedtuple('MapService', ['name', 'type', 'timeout'])
+
+MAP_SERVICES = {
+    'dss_lio_sam': MapService('/lio_sam/save_map', 'dss_lio_sam/srv/SaveMap', 120.0),
+    'kissicp': MapService('/kiss_icp/save_map', 'std_srvs/srv/Empty', 30.0),
+    'slamtoolbox': MapService('/slam_toolbox/serialize_map', 'slam_toolbox/srv/SerializePoseGraph', 60.0),
+    'hdl_slam': MapService('/hdl_graph_slam/save_map', 'hdl_graph_slam/srv/SaveMap', 120.0),
+}
+
+# RTAB-Map keeps its map in its database and is saved by snapshotting it
+MAP_SAVING_LAUNCH_KEYS = tuple(MAP_SERVICES) + ('rtabmap',)
+
+MAP_NAMES = {
+    'dss_lio_sam': 'DSS LIO-SAM',
+    'kissicp': 'KISS-ICP',
+    'slamtoolbox': 'SLAM-Toolbox',
+    'hdl_slam': 'HDL',
+    'rtabmap': 'RTAB-MAP',
+}
+
+# How long a client may take to match a server the graph already lists
+SERVICE_MATCH_TIMEOUT = 5.0
+# Interval of the "still waiting" progress messages
+PROGRESS_INTERVAL = 5.0
+
+
+class ServiceGraphCache:
+    """Service names and types of the ROS graph, re-read at most every max_age seconds
+
+    A name missing from the cached view triggers one early re-read (at most
+    every min_age seconds), so a service that just appeared is not missed.
+    """
+
+    def __init__(self, node, max_age=2.0, min_age=0.2):
+        self.node = node
+        self.max_age = max_age
+        self.min_age = min_age
+        self._services = {}
+        self._read_at = None
+        self._lock = threading.Lock()
+
+    def services(self):
+        """{service name: [type names]}"""
+        with self._lock:
+            now = time.monotonic()
+            if self._read_at is None or now - self._read_at >= self.max_age:
+                self._read(now)
+            return self._services
+
+    def types(self, service_name):
+        """Type names the service is offered with, None if it is not in the graph"""
+        types = self.services().get(service_name)
+        if types is None:
+            with self._lock:
+                now = time.monotonic()
+                if now - self._read_at >= self.min_age:
+                    self._read(now)
+                types = self._services.get(service_name)
+        return types
+
+    def _read(self, now):
+        self._services = dict(self.node.get_service_names_and_types())
+        self._read_at = now
+
+
+def _destination(launch_key, save_path):
+    """Path the backend is asked to write; HDL gets a new timestamped folder inside save_path"""
+    if launch_key == 'hdl_slam':
+        from datetime import datetime
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        folder = os.path.join(save_path, f"map_21_{timestamp}")
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, "map.pcd")
+    return save_path
+
+
+def _request_fields(launch_key, destination):
+    if launch_key == 'dss_lio_sam':
+        return {'resolution': 0.2, 'destination': destination}
+    if launch_key == 'slamtoolbox':
+        return {'filename': destination}
+    if launch_key == 'hdl_slam':
+        return {'utm': False, 'resolution': 0.05, 'destination': destination}
+    return {}
+
+
+def _interpret(launch_key, response, destination, log):
+    """MapSaveResult of a service response"""
+    if launch_key == 'kissicp':
+        # KISS-ICP only offers an Empty trigger and picks the location itself
+        return MapSaveResult(True, "KISS-ICP map save triggered; check KISS-ICP output for the saved map location.", [])
+    if launch_key == 'slamtoolbox':
+        # SLAM-Toolbox writes <destination>.posegraph and <destination>.data;
+        # RESULT_SUCCESS=0, RESULT_FAILED_TO_WRITE_FILE=255
+        if response.result == 255:
+            return MapSaveResult(False, "Failed to save map: Could not write to file", [])
+        if response.result != 0:
+            return MapSaveResult(False, f"Failed to save map: result={response.result}", [])
+        posegraph_file = f"{destination}.posegraph"
+        data_file = f"{destination}.data"
+        if not (os.path.exists(posegraph_file) and os.path.exists(data_file)):
+            return MapSaveResult(False, "Warning: Service returned success but files not found", [])
+        log(f"  - {posegraph_file} ({os.path.getsize(posegraph_file)} bytes)")
+        log(f"  - {data_file} ({os.path.getsize(data_file)} bytes)")
+        return MapSaveResult(True, "SLAM-Toolbox map saved successfully!", [posegraph_file, data_file])
+    # LIO-SAM and HDL answer with a success flag
+    if response.success:
+        return MapSaveResult(True, f"{MAP_NAMES[launch_key]} map saved successfully to: {destination}", [destination])
+    return MapSaveResult(False, f"{MAP_NAMES[launch_key]} reported that saving to {destination} failed", [])
+
+
+def save_rtabmap_map(db_path, save_path, log, live=True, progress=None, job=None):
+    """RTAB-Map keeps the whole map in its database, so saving is a verified snapshot of it"""
+    db_path = os.path.expanduser(db_path or DEFAULT_RTABMAP_DB)
+    if not os.path.exists(db_path):
+        return MapSaveResult(False, f"Database file not found: {db_path}", [])
+    log(f"Saving RTAB-MAP map to: {save_path}")
+    try:
+        result = snapshot_database(
+            db_path, save_path, live=live,
+            progress=(lambda p: progress(f"RTAB-MAP database: {format_progress(p)}")) if progress else None,
+            check_cancelled=job.check_cancelled if job is not None else None)
+    except (SnapshotError, sqlite3.Error, OSError) as e:
+        return MapSaveResult(False, f"Failed to save map: {e}", [])
+    rate = result.size_bytes / result.copy_seconds / 1e6 if result.copy_seconds > 0 else 0.0
+    log(f"Copied {result.size_bytes / 1e6:.1f} MB in {result.copy_seconds:.1f}s ({rate:.0f} MB/s, "
+        f"{result.method}), integrity check {result.verify_seconds:.1f}s")
+    return MapSaveResult(True, f"RTAB-MAP map saved successfully to: {save_path}", [save_path])
+
+
+def default_save_path(launch_key, map_dir):
+    """Timestamped destination under map_dir for saves without a file dialog"""
+    from datetime import datetime
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    names = {
+        'dss_lio_sam': f"dss_map_{timestamp}",
+        'kissicp': f"kiss_icp_map_{timestamp}.pcd",
+        'slamtoolbox': f"slam_toolbox_map_{timestamp}",
+        'hdl_slam': "",
+        'rtabmap': f"rtabmap_map_{timestamp}.db",
+    }
+    return os.path.join(map_dir, names[launch_key]) if names[launch_key] else map_dir
+
+
+class MapSaver:
+    """Saves the maps of running launches through service clients on the manager node
+
+    Clients are created on first use and kept. Their responses are handled in
+    a reentrant callback group, so a long save does not hold up other
+    callbacks on the multi-threaded executor.
+    """
+
+    def __init__(self, node, graph_max_age=2.0):
+        self.node = node
+        self.graph = ServiceGraphCache(node, graph_max_age)
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+        self._callback_group = ReentrantCallbackGroup()
+
+    def available(self, launch_key):
+        """True if launch_key's save service is in the (cached) graph"""
+        spec = MAP_SERVICES.get(launch_key)
+        return spec is not None and self.graph.types(spec.name) is not None
+
+    def save_async(self, launch_key, save_path, log, rtabmap_db=None, timeout=None, progress=None):
+        """Queue save() as a supervisor job (serialized with stops of launch_key), returns the LaunchJob
+
+        The job's result is the MapSaveResult; cancelling the job cancels the save.
+        """
+        return self.node.supervisor.submit('save_map', launch_key, self.save, launch_key, save_path, log,
+                                           rtabmap_db=rtabmap_db, timeout=timeout, progress=progress)
+
+    def save(self, launch_key, save_path, log, rtabmap_db=None, timeout=None, progress=None, job=None):
+        """Save the map of launch_key to save_path (a directory for hdl_slam), blocking the caller
+
+        log(message) gets progress messages, progress(message) the frequent
+        transient ones (copy progress); timeout defaults to the backend's.
+        """
+        if launch_key == 'rtabmap':
+            # Either RTAB-Map launch may still be writing to the database
+            live = self.node.is_running('rtabmap') or self.node.is_running('rtabmap_loc')
+            return save_rtabmap_map(rtabmap_db, save_path, log, live=live, progress=progress, job=job)
+        spec = MAP_SERVICES.get(launch_key)
+        if spec is None:
+            return MapSaveResult(False, f"'{launch_key}' cannot save a map", [])
+
+        types = self.graph.types(spec.name)
+        if not types:
+            return MapSaveResult(
+                False, f"{spec.name} service not found! Make sure {MAP_NAMES[launch_key]} is running.", [])
+        type_name = spec.type if spec.type in types else types[0]
+        try:
+            client = self._client(spec.name, type_name)
+        except (AttributeError, ModuleNotFoundError, ValueError) as e:
+            return MapSaveResult(False, f"Cannot load service type {type_name}: {e}", [])
+        if not client.wait_for_service(timeout_sec=SERVICE_MATCH_TIMEOUT):
+            return MapSaveResult(False, f"{spec.name} is in the graph but does not answer", [])
+
+        destination = _destination(launch_key, save_path)
+        request = client.srv_type.Request()
+        for field, value in _request_fields(launch_key, destination).items():
+            setattr(request, field, value)
+        if job is not None:
+            job.check_cancelled()
+
+        log(f"Saving {MAP_NAMES[launch_key]} map to: {destination}")
+        log(f"Calling {spec.name.rsplit('/', 1)[-1]} service...")
+        timeout = spec.timeout if timeout is None else timeout
+        answered = threading.Event()
+        started = time.monotonic()
+        future = client.call_async(request)
+        future.add_done_callback(lambda _future: answered.set())
+        if job is not None:
+            job.add_cancel_callback(answered.set)
+        deadline = started + timeout
+        while not answered.wait(max(0.0, min(deadline - time.monotonic(), PROGRESS_INTERVAL))):
+            if time.monotonic() >= deadline:
+                break
+            log(f"Still waiting for {spec.name} ({time.monotonic() - started:.0f}s)")
+
+        if not future.done():
+            # Forget the request so a late response is dropped
+            client.remove_pending_request(future)
+            future.cancel()
+            if job is not None and job.cancel_requested:
+                log("Map save cancelled; the backend may still write the map")
+                job.check_cancelled()
+            return MapSaveResult(False, f"Map save timed out after {timeout:.0f}s - service call took too long", [])
+        if future.exception() is not None:
+            return MapSaveResult(False, f"Failed to save map: {future.exception()}", [])
+        log(f"{spec.name} answered after {time.monotonic() - started:.1f}s")
+        return _interpret(launch_key, future.result(), destination, log)
+
+    def _client(self, service_name, type_name):
+        with self._clients_lock:
+            client = self._clients.get((service_name, type_name))
+            if client is None:
+                client = self.node.create_client(get_service(type_name), service_name,
+                                                 callback_group=self._callback_group)
+                self._clients[(service_name, type_name)] = client
+            return client
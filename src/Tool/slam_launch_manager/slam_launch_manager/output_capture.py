@@ -0,0 +1,269 @@
+"""Capture of launch stdout/stderr into per-launch ring buffers (pty/pipe + epoll)"""
+
+import contextlib
+import errno
+import os
+import pty
+import select
+import threading
+
+READ_CHUNK = 65536
+
+
+class OutputRing:
+    """Fixed-size byte ring holding the most recent output of one launch
+
+    `written` counts every byte ever written, so a reader remembers the offset
+    it has seen and asks for what came after it; bytes that were overwritten in
+    the meantime are reported as dropped instead of blocking the writer.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.written = 0
+        self.closed = False
+        self._buf = bytearray(capacity)
+        self._lock = threading.Lock()
+
+    def write(self, data):
+        data = memoryview(data)
+        with self._lock:
+            total = len(data)
+            if total > self.capacity:
+                data = data[-self.capacity:]
+            pos = (self.written + total - len(data)) % self.capacity
+            first = min(len(data), self.capacity - pos)
+            self._buf[pos:pos + first] = data[:first]
+            if first < len(data):
+                self._buf[:len(data) - first] = data[first:]
+            self.written += total
+
+    @contextlib.contextmanager
+    def view(self, since=0):
+        """Yield (segments, end, dropped) for the bytes written after offset since
+
+        segments are memoryviews into the ring itself, valid only inside the
+        with block (the writer waits until it is left), so keep it short.
+        """
+        with self._lock:
+            start = max(since, self.written - self.capacity, 0)
+            dropped = start - since if since < start else 0
+            segments = []
+            if start < self.written:
+                buf = memoryview(self._buf)
+                begin = start % self.capacity
+                end = self.written % self.capacity or self.capacity
+                if begin < end:
+                    segments.append(buf[begin:end])
+                else:
+                    segments.append(buf[begin:])
+                    segments.append(buf[:end])
+            try:
+                yield segments, self.written, dropped
+            finally:
+                for segment in segments:
+                    segment.release()
+
+
+class RotatingOutputFile:
+    """Append-only log file rotated to <path>.1 .. <path>.N once it gets too big"""
+
+    def __init__(self, path, max_bytes, backups):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, 'ab', buffering=0)
+        self._size = self._file.tell()
+
+    def write(self, data):
+        if self._size and self._size + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._size += len(data)
+
+    def close(self):
+        self._file.close()
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            source = f'{self.path}.{index}'
+            if os.path.exists(source):
+                os.replace(source, f'{self.path}.{index + 1}')
+        if self.backups > 0:
+            os.replace(self.path, f'{self.path}.1')
+        self._file = open(self.path, 'wb', buffering=0)
+        self._size = 0
+
+
+class LaunchOutput:
+    """Capture endpoint of one launch: the child writes, the capture thread reads"""
+
+    def __init__(self, launch_key, read_fd, child_fd, ring, log_file):
+        self.launch_key = launch_key
+        self.read_fd = read_fd
+        self.child_fd = child_fd
+        self.ring = ring
+        self.log_file = log_file
+
+    @property
+    def child_path(self):
+        """Path another process can open to write into this capture"""
+        return f'/proc/{os.getpid()}/fd/{self.child_fd}'
+
+    def close_child_end(self):
+        """Drop our copy of the write end once the launch holds its own"""
+        fd, self.child_fd = self.child_fd, None
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class OutputCapture:
+    """Reads the output of every launch on one epoll thread
+
+    Each launch writes to a pty (so nodes keep line-buffered, tty-style
+    output) or a pipe. The read ends are non-blocking and drained straight
+    into the launch's OutputRing and optional rotating file; nothing here ever
+    waits on the GUI, so a slow viewer cannot back up into the nodes.
+    log(message, launch_key=...) is told about captures that end on a read
+    error rather than at end of output.
+    """
+
+    def __init__(self, ring_bytes=1 << 20, log_dir=None, max_log_bytes=10 << 20,
+                 log_backups=3, use_pty=True, log=None):
+        self.ring_bytes = ring_bytes
+        self.log_dir = log_dir
+        self.max_log_bytes = max_log_bytes
+        self.log_backups = log_backups
+        self.use_pty = use_pty
+        self.log = log
+        self.rings = {}
+        self._by_fd = {}
+        self._lock = threading.Lock()
+        self._epoll = None
+        self._thread = None
+        self._wake_r = self._wake_w = None
+        self._closed = False
+
+    def attach(self, launch_key):
+        """Create the capture for a new run of launch_key, returns a LaunchOutput"""
+        if self.use_pty:
+            read_fd, child_fd = pty.openpty()
+        else:
+            read_fd, child_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        ring = OutputRing(self.ring_bytes)
+        log_file = None
+        if self.log_dir:
+            log_file = RotatingOutputFile(os.path.join(self.log_dir, f'{launch_key}.log'),
+                                          self.max_log_bytes, self.log_backups)
+        output = LaunchOutput(launch_key, read_fd, child_fd, ring, log_file)
+        self._ensure_thread()
+        with self._lock:
+            self.rings[launch_key] = ring
+            self._by_fd[read_fd] = output
+        self._epoll.register(read_fd, select.EPOLLIN)
+        return output
+
+    def detach(self, output):
+        """Drop a capture whose launch never started, closing both ends"""
+        with self._lock:
+            attached = self._by_fd.pop(output.read_fd, None) is output
+            if attached and self.rings.get(output.launch_key) is output.ring:
+                del self.rings[output.launch_key]
+        if attached:
+            self._finish(output)
+        else:
+            output.close_child_end()
+
+    def ring(self, launch_key):
+        """Ring of the latest run of launch_key (kept after it exits), or None"""
+        with self._lock:
+            return self.rings.get(launch_key)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            outputs = list(self._by_fd.values())
+            self._by_fd.clear()
+        for output in outputs:
+            self._finish(output)
+        if self._wake_w is not None:
+            os.write(self._wake_w, b'x')
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._epoll = select.epoll()
+            self._wake_r, self._wake_w = os.pipe()
+            self._epoll.register(self._wake_r, select.EPOLLIN)
+            self._thread = threading.Thread(target=self._run, name='output-capture', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                events = self._epoll.poll()
+            except InterruptedError:
+                continue
+            for fd, _mask in events:
+                if fd == self._wake_r:
+                    if self._closed:
+                        self._epoll.close()
+                        os.close(self._wake_r)
+                        os.close(self._wake_w)
+                        return
+                    continue
+                with self._lock:
+                    output = self._by_fd.get(fd)
+                if output is not None and not self._drain(output):
+                    with self._lock:
+                        self._by_fd.pop(fd, None)
+                    self._finish(output)
+
+    def _drain(self, output):
+        """Read everything available, returns False once the writers are gone"""
+        while True:
+            try:
+                data = os.read(output.read_fd, READ_CHUNK)
+            except BlockingIOError:
+                return True
+            except OSError as e:
+                # A pty master reports EIO once the last slave fd is closed. Any
+                # other error also ends this launch's capture; raising would
+                # end the thread, and with it the capture of every launch
+                if e.errno != errno.EIO and self.log is not None:
+                    self.log(f"Output capture of '{output.launch_key}' stopped: {e}",
+                             launch_key=output.launch_key)
+                return False
+            if not data:
+                return False
+            output.ring.write(data)
+            if output.log_file is not None:
+                try:
+                    output.log_file.write(data)
+                except OSError:
+                    output.log_file = None
+
+    def _finish(self, output):
+        output.ring.closed = True
+        try:
+            if self._epoll is not None:
+                self._epoll.unregister(output.read_fd)
+        except (OSError, ValueError):
+            pass
+        try:
+            os.close(output.read_fd)
+        except OSError:
+            pass
+        if output.log_file is not None:
+            output.log_file.close()
+            output.log_file = None
+        output.close_child_end()
@@ -0,0 +1,118 @@
+"""Single-pass /proc scanner used to find every process belonging to a launch"""
+
+import os
+from collections import namedtuple
+
+# start_time is in clock ticks since boot; (pid, start_time) identifies a
+# process uniquely even after its PID has been reused
+ProcessInfo = namedtuple('ProcessInfo',
+                         ['pid', 'ppid', 'pgid', 'sid', 'start_time', 'state', 'comm'])
+
+
+def parse_stat(pid, data):
+    """Build a ProcessInfo from the raw contents of /proc/<pid>/stat"""
+    # comm is wrapped in parentheses and may itself contain spaces or ')'
+    lpar = data.find(b'(')
+    rpar = data.rfind(b')')
+    comm = data[lpar + 1:rpar].decode('utf-8', 'replace')
+    fields = data[rpar + 2:].split()
+    # fields[0] is state (stat field 3), so stat field N is fields[N - 3]
+    return ProcessInfo(pid, int(fields[1]), int(fields[2]), int(fields[3]),
+                       int(fields[19]), fields[0].decode(), comm)
+
+
+def read_process(pid):
+    """ProcessInfo for a single PID, or None if it does not exist"""
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            return parse_stat(pid, f.read())
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def read_start_time(pid):
+    """Start time of a process in clock ticks since boot, None if it does not exist"""
+    info = read_process(pid)
+    return info.start_time if info is not None else None
+
+
+def is_alive(info):
+    """True if the process described by info still runs (not a zombie, not a reused PID)"""
+    current = read_process(info.pid)
+    return (current is not None and current.start_time == info.start_time
+            and current.state != 'Z')
+
+
+class ProcessSnapshot:
+    """Point-in-time view of all processes with a parent -> children index"""
+
+    def __init__(self, processes):
+        self.processes = processes
+        self._children = {}
+        for info in processes.values():
+            self._children.setdefault(info.ppid, []).append(info.pid)
+
+    @classmethod
+    def take(cls, proc_root='/proc'):
+        """Read every /proc/<pid>/stat once"""
+        processes = {}
+        for entry in os.scandir(proc_root):
+            name = entry.name
+            if not name.isdigit():
+                continue
+            try:
+                with open(f'{proc_root}/{name}/stat', 'rb') as f:
+                    data = f.read()
+            except OSError:
+                continue  # exited while scanning
+            try:
+                processes[int(name)] = parse_stat(int(name), data)
+            except (ValueError, IndexError):
+                continue
+        return cls(processes)
+
+    def get(self, pid):
+        return self.processes.get(pid)
+
+    def children(self, pid):
+        return [self.processes[child] for child in self._children.get(pid, ())]
+
+    def tree(self, pid, start_time=None):
+        """The process and all of its descendants, parents before children
+
+        If start_time is given and does not match, the PID has been reused by an
+        unrelated process and an empty list is returned.
+        """
+        root = self.processes.get(pid)
+        if root is None or (start_time is not None and root.start_time != start_time):
+            return []
+        result = [root]
+        index = 0
+        while index < len(result):
+            for child in self._children.get(result[index].pid, ()):
+                result.append(self.processes[child])
+            index += 1
+        return result
+
+    def process_group(self, pgid):
+        return [info for info in self.processes.values() if info.pgid == pgid]
+
+    def session(self, sid):
+        return [info for info in self.processes.values() if info.sid == sid]
+
+    def match_cmdline(self, pattern):
+        """Processes whose command line contains pattern (like pgrep -f)"""
+        matches = []
+        needle = pattern.encode()
+        own_pid = os.getpid()
+        for pid, info in self.processes.items():
+            if pid == own_pid:
+                continue
+            try:
+                with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                    cmdline = f.read().replace(b'\0', b' ')
+            except OSError:
+                continue
+            if needle in cmdline:
+                matches.append(info)
+        return matches
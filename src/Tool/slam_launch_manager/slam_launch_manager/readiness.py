@@ -0,0 +1,112 @@
+"""Readiness of launches judged from the ROS graph (nodes, published topics, services)"""
+
+import threading
+import time
+
+
+class ReadinessSpec:
+    """Interfaces a launch must expose before it counts as ready"""
+
+    def __init__(self, nodes=(), topics=(), services=(), timeout=30.0):
+        self.nodes = tuple(nodes)
+        self.topics = tuple(topics)
+        self.services = tuple(services)
+        self.timeout = timeout
+
+    def empty(self):
+        return not (self.nodes or self.topics or self.services)
+
+
+# Per launch key; keys without an entry are ready as soon as they are spawned
+LAUNCH_READINESS = {
+    'dss': ReadinessSpec(topics=['/dss/sensor/lidar3d', '/dss/sensor/imu']),
+    'dss_lio_sam': ReadinessSpec(services=['/lio_sam/save_map']),
+    'slamtoolbox': ReadinessSpec(services=['/slam_toolbox/serialize_map']),
+    'slamtoolbox_loc': ReadinessSpec(services=['/slam_toolbox/clear_localization_buffer']),
+    'hdl_slam': ReadinessSpec(services=['/hdl_graph_slam/save_map']),
+    'kissicp': ReadinessSpec(services=['/kiss_icp/save_map']),
+}
+
+
+class _PendingWait:
+    def __init__(self, launch_key, spec, callback):
+        self.launch_key = launch_key
+        self.spec = spec
+        self.callback = callback
+        self.started = time.monotonic()
+
+
+class ReadinessWaiter:
+    """Marks launches ready the moment their interfaces appear in the graph
+
+    This polls: rclpy on Humble exposes the graph guard condition only
+    through its private C extension, so rather than waiting on graph events
+    the graph is queried every check_period seconds. A launch can therefore
+    be seen ready up to check_period late. Each check reads the rmw's local
+    graph cache (no network traffic), and the node timer driving it only
+    exists while at least one launch is waiting, so there is no cost once
+    everything is up. Topics must have a publisher: the manager's own sensor
+    subscriptions already put the topic names in the graph.
+    """
+
+    def __init__(self, node, check_period=0.1):
+        self.node = node
+        self.check_period = check_period
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def wait(self, launch_key, spec, callback):
+        """Call callback(launch_key, time_to_ready, timed_out) once spec is satisfied"""
+        with self._lock:
+            self._pending[launch_key] = _PendingWait(launch_key, spec, callback)
+            if self._timer is None:
+                self._timer = self.node.create_timer(self.check_period, self._check)
+            else:
+                self._timer.reset()
+
+    def cancel(self, launch_key):
+        with self._lock:
+            self._pending.pop(launch_key, None)
+
+    def pending(self, launch_key):
+        with self._lock:
+            return launch_key in self._pending
+
+    def missing(self, spec):
+        """Interfaces of spec that are not in the graph yet"""
+        missing = []
+        if spec.nodes:
+            names = set()
+            for name, namespace in self.node.get_node_names_and_namespaces():
+                names.add(name)
+                names.add(f"{namespace.rstrip('/')}/{name}")
+            missing.extend(n for n in spec.nodes if n not in names)
+        for topic in spec.topics:
+            if self.node.count_publishers(topic) == 0:
+                missing.append(topic)
+        if spec.services:
+            services = {name for name, _types in self.node.get_service_names_and_types()}
+            missing.extend(s for s in spec.services if s not in services)
+        return missing
+
+    def _check(self):
+        with self._lock:
+            waits = list(self._pending.values())
+        now = time.monotonic()
+        for pending in waits:
+            elapsed = now - pending.started
+            timed_out = elapsed >= pending.spec.timeout
+            if not timed_out and self.missing(pending.spec):
+                continue
+            with self._lock:
+                if self._pending.get(pending.launch_key) is not pending:
+                    continue
+                del self._pending[pending.launch_key]
+            try:
+                pending.callback(pending.launch_key, elapsed, timed_out)
+            except Exception:
+                pass
+        with self._lock:
+            if not self._pending and self._timer is not None:
+                self._timer.cancel()
@@ -0,0 +1,233 @@
+"""Per-launch CPU, memory, thread and context-switch sampling from /proc"""
+
+import os
+import threading
+import time
+from collections import deque, namedtuple
+
+from slam_launch_manager.proc_tree import ProcessSnapshot
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+# One aggregated sample of a launch. cpu_percent is relative to one core
+# (200 = two cores busy); ctxt_per_s counts voluntary + involuntary switches
+# of all threads (see ResourceMonitor for how often each part is measured)
+LaunchUsage = namedtuple('LaunchUsage', [
+    'timestamp', 'cpu_percent', 'rss_bytes', 'threads', 'ctxt_per_s', 'processes'])
+
+# Raw counters of one process, kept between samples to compute rates
+_ProcessCounters = namedtuple('_ProcessCounters', ['cpu_ticks', 'ctxt_switches'])
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _context_switches(status):
+    """voluntary + nonvoluntary context switches in a /proc status file"""
+    ctxt = 0
+    index = status.find(b'voluntary_ctxt_switches:')
+    if index >= 0:
+        for line in status[index:].splitlines()[:2]:
+            ctxt += int(line.rsplit(b'\t', 1)[-1] or 0)
+    return ctxt
+
+
+def read_process_usage(pid):
+    """(cpu_ticks, rss_bytes, threads, ctxt_switches) of one process, None if gone
+
+    Reads /proc/<pid>/stat for CPU time and threads, statm for the resident set
+    and status for context switches, which only counts the main thread there
+    (read_thread_switches has all of them, at one read per thread).
+    """
+    try:
+        stat = _read(f'/proc/{pid}/stat')
+        statm = _read(f'/proc/{pid}/statm')
+        status = _read(f'/proc/{pid}/status')
+    except OSError:
+        return None
+    # Skip past comm, which may contain spaces; fields[0] is stat field 3
+    fields = stat[stat.rfind(b')') + 2:].split()
+    try:
+        cpu_ticks = int(fields[11]) + int(fields[12])   # utime + stime
+        threads = int(fields[17])
+        rss_bytes = int(statm.split()[1]) * PAGE_SIZE
+    except (IndexError, ValueError):
+        return None
+    return cpu_ticks, rss_bytes, threads, _context_switches(status)
+
+
+def read_thread_switches(pid):
+    """Context switches of every thread of a process summed, None if it is gone"""
+    try:
+        tasks = os.listdir(f'/proc/{pid}/task')
+    except OSError:
+        return None
+    ctxt = 0
+    for task in tasks:
+        try:
+            ctxt += _context_switches(_read(f'/proc/{pid}/task/{task}/status'))
+        except OSError:
+            pass  # thread exited meanwhile
+    return ctxt
+
+
+class ResourceMonitor:
+    """Samples every process of every running launch into fixed-size histories
+
+    Launch membership (the session of the launch process plus its descendants)
+    comes from a full /proc scan, which is only repeated every rescan_every
+    samples or when the set of launches changes; in between only the known
+    PIDs are read. That keeps a sample of ~50 processes around a millisecond.
+
+    A ROS node switches mostly in its executor and DDS threads, but reading
+    every thread's status costs one open per thread (hundreds per launch).
+    So the main thread's switches are read every sample, and every thread's
+    only every thread_switches_every samples: the other threads' rate over
+    that interval is added to the live main-thread rate.
+    """
+
+    def __init__(self, launches_provider, period=1.0, history=120, rescan_every=5,
+                 thread_switches_every=15):
+        # launches_provider() -> {launch_key: (pid, start_time)} of running launches
+        self.launches_provider = launches_provider
+        self.period = period
+        self.history_size = history
+        self.rescan_every = rescan_every
+        self.thread_switches_every = thread_switches_every
+        self.history = {}
+        self.overhead = 0.0  # fraction of one core spent sampling, averaged since start()
+        self._members = {}
+        self._roots = {}
+        self._counters = {}
+        self._thread_switches = {}    # member -> (all threads, main thread) at the last read
+        self._thread_switches_at = None
+        self._samples_since_threads = None
+        self._other_threads_rate = {}  # launch_key -> switches/s of all but the main threads
+        self._samples_since_scan = 0
+        self._last_sample = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='resource-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def latest(self, launch_key):
+        """Most recent LaunchUsage of a launch, None if it has not been sampled"""
+        with self._lock:
+            samples = self.history.get(launch_key)
+            return samples[-1] if samples else None
+
+    def samples(self, launch_key):
+        """Copy of the sample history of a launch, oldest first"""
+        with self._lock:
+            return list(self.history.get(launch_key, ()))
+
+    def sample(self):
+        """Take one sample of all running launches"""
+        now = time.monotonic()
+        launches = self.launches_provider()
+        if launches != self._roots or self._samples_since_scan >= self.rescan_every:
+            self._rescan(launches)
+        self._samples_since_scan += 1
+        read_threads = (self._samples_since_threads is None
+                        or self._samples_since_threads >= self.thread_switches_every)
+        self._samples_since_threads = 1 if read_threads else self._samples_since_threads + 1
+
+        elapsed = now - self._last_sample if self._last_sample is not None else None
+        self._last_sample = now
+        thread_elapsed = None
+        if read_threads:
+            if self._thread_switches_at is not None:
+                thread_elapsed = now - self._thread_switches_at
+            self._thread_switches_at = now
+        counters = {}
+        thread_switches = {}
+        usage = {}
+        for launch_key, members in self._members.items():
+            cpu_ticks = ctxt = other_threads = 0
+            rss_bytes = threads = processes = 0
+            for member in members:
+                values = read_process_usage(member[0])
+                if values is None:
+                    continue
+                ticks, rss, nthreads, switches = values
+                previous = self._counters.get(member)
+                if previous is not None:
+                    cpu_ticks += ticks - previous.cpu_ticks
+                    ctxt += switches - previous.ctxt_switches
+                counters[member] = _ProcessCounters(ticks, switches)
+                if read_threads:
+                    all_threads = read_thread_switches(member[0])
+                    if all_threads is not None:
+                        before = self._thread_switches.get(member)
+                        if before is not None:
+                            # Switches of threads that exited drop out of the sum
+                            other_threads += max(0, (all_threads - before[0]) - (switches - before[1]))
+                        thread_switches[member] = (all_threads, switches)
+                rss_bytes += rss
+                threads += nthreads
+                processes += 1
+            if thread_elapsed:
+                self._other_threads_rate[launch_key] = other_threads / thread_elapsed
+            if elapsed:
+                cpu_percent = 100.0 * cpu_ticks / CLOCK_TICKS / elapsed
+                ctxt_per_s = ctxt / elapsed + self._other_threads_rate.get(launch_key, 0.0)
+            else:
+                cpu_percent = ctxt_per_s = 0.0
+            usage[launch_key] = LaunchUsage(
+                time.time(), cpu_percent, rss_bytes, threads, ctxt_per_s, processes)
+        self._counters = counters
+        if read_threads:
+            self._thread_switches = thread_switches
+            for launch_key in list(self._other_threads_rate):
+                if launch_key not in usage:
+                    del self._other_threads_rate[launch_key]
+
+        with self._lock:
+            for launch_key in list(self.history):
+                if launch_key not in usage:
+                    del self.history[launch_key]
+            for launch_key, launch_usage in usage.items():
+                samples = self.history.get(launch_key)
+                if samples is None:
+                    samples = self.history[launch_key] = deque(maxlen=self.history_size)
+                samples.append(launch_usage)
+        return usage
+
+    def _rescan(self, launches):
+        snapshot = ProcessSnapshot.take()
+        members = {}
+        for launch_key, (pid, start_time) in launches.items():
+            processes = {info.pid: info for info in snapshot.tree(pid, start_time)}
+            if processes:
+                # Nodes reparented away from the launch still share its session
+                processes.update((info.pid, info) for info in snapshot.session(pid))
+            members[launch_key] = [(info.pid, info.start_time)
+                                   for info in processes.values() if info.state != 'Z']
+        self._members = members
+        self._roots = dict(launches)
+        self._samples_since_scan = 0
+
+    def _run(self):
+        started = time.monotonic()
+        sampling_cpu = 0.0
+        while not self._stop.wait(self.period):
+            cpu_before = time.thread_time()
+            try:
+                self.sample()
+            except Exception:
+                continue
+            sampling_cpu += time.thread_time() - cpu_before
+            self.overhead = sampling_cpu / (time.monotonic() - started)
@@ -0,0 +1,171 @@
+"""Resolve the environment a launch sees after sourcing the workspace setup script"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+from pathlib import Path
+
+ROS_SETUP_SCRIPT = Path.home() / 'ros2_ws' / 'install' / 'setup.bash'
+ROS_ENV_CACHE_FILE = Path.home() / '.cache' / 'slam_launch_manager' / 'ros_env.json'
+
+# Underlays chained by a colcon setup.bash, e.g. COLCON_CURRENT_PREFIX="/opt/ros/humble"
+_UNDERLAY_PATTERN = re.compile(r'^COLCON_CURRENT_PREFIX="(/[^"$`]+)"', re.MULTILINE)
+
+# Variables that only describe the helper bash process itself
+_SHELL_ONLY_VARS = ('_', 'SHLVL', 'PWD', 'OLDPWD')
+
+# Base environment variables that colcon/ament setup scripts read
+_SETUP_INPUT_PREFIXES = ('AMENT_', 'COLCON_', 'ROS_', 'RMW_')
+_SETUP_INPUT_VARS = ('PATH', 'LD_LIBRARY_PATH', 'PYTHONPATH', 'CMAKE_PREFIX_PATH',
+                     'PKG_CONFIG_PATH', 'SHELL')
+
+
+def resolve_environment(setup_script, base_env):
+    """Environment produced by sourcing setup_script in bash on top of base_env"""
+    setup_script = Path(setup_script)
+    if not setup_script.exists():
+        raise FileNotFoundError(f"ROS setup script not found: {setup_script}")
+
+    result = subprocess.run(
+        ['bash', '-c', 'source "$0" >/dev/null 2>&1 && env -0', str(setup_script)],
+        env=base_env,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        timeout=30,
+        check=True
+    )
+
+    env = {}
+    for entry in result.stdout.split(b'\0'):
+        key, sep, value = entry.decode('utf-8', 'surrogateescape').partition('=')
+        if sep and key not in _SHELL_ONLY_VARS:
+            env[key] = value
+    return env
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def install_tree_fingerprint(setup_script, base_env):
+    """Hash of everything that can change what sourcing setup_script produces
+
+    Covers the setup scripts, the mtimes of the install prefix, its package
+    directories and the chained underlays, the contents of every .dsv file
+    colcon's _local_setup_util evaluates, and the base environment.
+    """
+    setup_script = Path(setup_script)
+    install_dir = setup_script.parent
+    digest = hashlib.sha256()
+
+    def add(*parts):
+        digest.update(repr(parts).encode())
+
+    add('base_env', sorted((key, value) for key, value in base_env.items()
+                           if key in _SETUP_INPUT_VARS or key.startswith(_SETUP_INPUT_PREFIXES)))
+    for script in sorted(install_dir.glob('*setup*')):
+        add('script', str(script), _mtime_ns(script))
+    add('install', _mtime_ns(install_dir))
+
+    try:
+        text = setup_script.read_text()
+    except OSError:
+        text = ''
+    for underlay in _UNDERLAY_PATTERN.findall(text):
+        add('underlay', underlay, _mtime_ns(underlay), _mtime_ns(os.path.join(underlay, 'share')))
+
+    try:
+        package_dirs = sorted(p for p in install_dir.iterdir() if p.is_dir())
+    except OSError:
+        package_dirs = []
+    for package_dir in package_dirs:
+        add('package', package_dir.name, _mtime_ns(package_dir))
+        # Isolated layout: install/<pkg>/share/<pkg>; merged layout: install/share/<pkg>
+        share_dir = package_dir if package_dir.name == 'share' else package_dir / 'share'
+        for root, _dirs, files in os.walk(share_dir):
+            for name in sorted(files):
+                if name.endswith('.dsv'):
+                    path = os.path.join(root, name)
+                    try:
+                        with open(path, 'rb') as f:
+                            add('dsv', path, hashlib.sha1(f.read()).hexdigest())
+                    except OSError:
+                        add('dsv', path, None)
+    return digest.hexdigest()
+
+
+class RosEnvironmentCache:
+    """Resolved launch environments, rebuilt only when the install tree changes
+
+    Sourcing setup.bash re-runs colcon's package discovery and ordering and the
+    .dsv processing for every underlay, which costs hundreds of milliseconds.
+    The result only depends on the install tree and the base environment, so
+    it is kept in memory and on disk, keyed by install_tree_fingerprint().
+    Only the variables sourcing added or changed are stored and reapplied on
+    top of the caller's environment, so e.g. a new DISPLAY does not miss.
+    """
+
+    def __init__(self, setup_script=ROS_SETUP_SCRIPT, cache_file=ROS_ENV_CACHE_FILE):
+        self.setup_script = Path(setup_script)
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._lock = threading.Lock()
+        self._key = None
+        self._changed = None
+        self._removed = None
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def get(self, base_env):
+        """Resolved environment for base_env, sourcing setup.bash only on a cache miss"""
+        key = install_tree_fingerprint(self.setup_script, base_env)
+        with self._lock:
+            if key != self._key:
+                self.misses += 1
+                env = resolve_environment(self.setup_script, base_env)
+                self._key = key
+                self._changed = {k: v for k, v in env.items() if base_env.get(k) != v}
+                self._removed = [k for k in base_env if k not in env]
+                self._save()
+            else:
+                self.hits += 1
+            env = dict(base_env)
+            env.update(self._changed)
+            for name in self._removed:
+                env.pop(name, None)
+            return env
+
+    def invalidate(self):
+        with self._lock:
+            self._key = self._changed = self._removed = None
+
+    def _load(self):
+        if self.cache_file is None:
+            return
+        try:
+            data = json.loads(self.cache_file.read_text())
+            self._key, self._changed, self._removed = data['key'], data['changed'], data['removed']
+        except (OSError, ValueError, KeyError, TypeError):
+            self._key = self._changed = self._removed = None
+
+    def _save(self):
+        if self.cache_file is None:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            # The environment may contain credentials: the file is created
+            # private (a leftover temp file could have any mode, so it is not reused)
+            tmp_file.unlink(missing_ok=True)
+            fd = os.open(tmp_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'key': self._key, 'changed': self._changed, 'removed': self._removed}, f)
+            os.replace(tmp_file, self.cache_file)
+        except OSError:
+            pass
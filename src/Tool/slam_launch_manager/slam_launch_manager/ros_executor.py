@@ -0,0 +1,36 @@
+"""Spinning the manager node on a MultiThreadedExecutor in its own thread"""
+
+import threading
+
+from rclpy.executors import ExternalShutdownException, MultiThreadedExecutor
+
+
+class RosSpinThread:
+    """Runs node callbacks on a MultiThreadedExecutor owned by a background thread
+
+    Callbacks run on executor threads and never on the Qt thread, so a burst of
+    IMU messages does not wait for painting and nothing polls while idle.
+    Callbacks in different callback groups run in parallel (see the per-sensor
+    groups of SlamLaunchManagerNode); anything that must reach Qt widgets goes
+    through a Qt signal.
+    """
+
+    def __init__(self, node, num_threads=4):
+        self.node = node
+        self.executor = MultiThreadedExecutor(num_threads=num_threads)
+        self.executor.add_node(node)
+        self._thread = threading.Thread(target=self._spin, name='ros-executor', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Stop spinning, waiting up to timeout for running callbacks to return"""
+        self.executor.shutdown(timeout_sec=timeout)
+        self._thread.join(timeout)
+
+    def _spin(self):
+        try:
+            self.executor.spin()
+        except ExternalShutdownException:
+            pass  # rclpy.shutdown() raced with stop()
@@ -0,0 +1,146 @@
+"""Streaming rate, jitter, latency and drop estimates for sensor topics in O(1) memory"""
+
+import struct
+from collections import namedtuple
+
+# rate_hz and jitter_ms come from inter-arrival times, latency_ms from
+# header.stamp to receipt (None when the stamps are not wall-clock time, e.g.
+# simulation time). drops counts messages inferred missing from gaps in the
+# arrival times; loss is the recent fraction of them (0..1). size_bytes is
+# the smoothed serialized message size.
+SensorSnapshot = namedtuple('SensorSnapshot', [
+    'active', 'rate_hz', 'jitter_ms', 'latency_ms', 'drops', 'loss', 'count', 'last_time',
+    'size_bytes'])
+
+# builtin_interfaces/Time as read from a serialized header
+Stamp = namedtuple('Stamp', ['sec', 'nanosec'])
+
+_STAMP_LE = struct.Struct('<iI')
+_STAMP_BE = struct.Struct('>iI')
+
+# Stamps further than this from the receive time are not on the wall clock
+MAX_WALL_CLOCK_OFFSET = 60.0
+
+
+def peek_header_stamp(data):
+    """header.stamp of a CDR-serialized message that starts with a std_msgs/Header
+
+    Reads 8 bytes instead of deserializing the message: after the 4-byte
+    encapsulation header (byte 1 odd = little endian) come stamp.sec (int32)
+    and stamp.nanosec (uint32). Returns None if data is too short.
+    """
+    if len(data) < 12:
+        return None
+    layout = _STAMP_LE if data[1] & 1 else _STAMP_BE
+    return Stamp(*layout.unpack_from(data, 4))
+
+
+class SensorStats:
+    """Exponentially weighted estimators fed once per received message
+
+    Interval and jitter follow RFC 3550: the mean inter-arrival time and the
+    mean absolute deviation from it, each smoothed with weight alpha, so a
+    10 Hz sensor settles on a new rate within a second or two. A gap longer
+    than gap_factor mean intervals counts the messages that should have
+    arrived in it as dropped; loss is the smoothed fraction of those. A gap
+    longer than timeout is a restart of the stream, not a run of drops.
+    """
+
+    def __init__(self, alpha=0.1, gap_factor=1.5, timeout=2.0):
+        self.alpha = alpha
+        self.gap_factor = gap_factor
+        self.timeout = timeout
+        self.count = 0
+        self.drops = 0
+        self.last_time = None
+        self.interval = None
+        self.jitter = 0.0
+        self.latency = None
+        self.loss = 0.0
+        self.size = None
+
+    def update(self, receive_time, stamp=None, size=None):
+        """Account for one message received at receive_time (time.time()) with header.stamp"""
+        alpha = self.alpha
+        if size is not None:
+            self.size = size if self.size is None else self.size + alpha * (size - self.size)
+        if self.last_time is not None:
+            dt = receive_time - self.last_time
+            if dt >= self.timeout:
+                # The stream stopped and restarted (e.g. the bridge was
+                # relaunched); estimate the new stream from scratch
+                self.interval = None
+                self.jitter = 0.0
+                self.latency = None
+            elif dt > 0:
+                if self.interval is None:
+                    self.interval = dt
+                else:
+                    missed = 0
+                    if dt > self.gap_factor * self.interval:
+                        missed = max(round(dt / self.interval) - 1, 0)
+                        self.drops += missed
+                    self.loss += alpha * (missed / (missed + 1) - self.loss)
+                    self.jitter += alpha * (abs(dt - self.interval) - self.jitter)
+                    self.interval += alpha * (dt - self.interval)
+        self.last_time = receive_time
+        self.count += 1
+
+        if stamp is not None and (stamp.sec or stamp.nanosec):
+            latency = receive_time - (stamp.sec + stamp.nanosec * 1e-9)
+            if abs(latency) > MAX_WALL_CLOCK_OFFSET:
+                self.latency = None
+            elif self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += alpha * (latency - self.latency)
+
+    def snapshot(self, now):
+        """Current estimates; a sensor silent for longer than timeout is inactive"""
+        active = self.last_time is not None and now - self.last_time < self.timeout
+        rate = 1.0 / self.interval if active and self.interval else None
+        return SensorSnapshot(
+            active=active,
+            rate_hz=rate,
+            jitter_ms=self.jitter * 1000.0 if rate is not None else None,
+            latency_ms=self.latency * 1000.0 if active and self.latency is not None else None,
+            drops=self.drops,
+            loss=self.loss,
+            count=self.count,
+            last_time=self.last_time,
+            size_bytes=self.size)
+
+
+# A sensor is shown as degraded when more than this fraction of its messages
+# goes missing, or its arrival times wander by more than this fraction of
+# the interval
+DEGRADED_LOSS = 0.05
+DEGRADED_JITTER = 0.25
+
+
+def sensor_degraded(snapshot):
+    if not snapshot.active or not snapshot.rate_hz:
+        return False
+    interval_ms = 1000.0 / snapshot.rate_hz
+    return snapshot.loss > DEGRADED_LOSS or snapshot.jitter_ms > DEGRADED_JITTER * interval_ms
+
+
+def format_sensor_stats(snapshot):
+    """Multi-line summary of a SensorSnapshot for tooltips"""
+    if snapshot.count == 0:
+        return "No messages received"
+    lines = [
+        f"Rate: {snapshot.rate_hz:.2f} Hz" if snapshot.rate_hz else "Rate: --",
+        f"Jitter: {snapshot.jitter_ms:.1f} ms" if snapshot.jitter_ms is not None else "Jitter: --",
+        f"Latency: {snapshot.latency_ms:.1f} ms" if snapshot.latency_ms is not None
+        else "Latency: -- (no wall-clock header stamps)",
+        f"Dropped: {snapshot.drops} ({snapshot.loss * 100.0:.1f}% recently)",
+        f"Received: {snapshot.count}",
+    ]
+    if snapshot.size_bytes is not None:
+        lines.append(f"Size: {snapshot.size_bytes / 1024.0:.1f} KiB"
+                     + (f" ({snapshot.size_bytes * snapshot.rate_hz / 1048576.0:.1f} MiB/s)"
+                        if snapshot.rate_hz else ""))
+    if not snapshot.active:
+        lines.insert(0, "Inactive")
+    return '\n'.join(lines)
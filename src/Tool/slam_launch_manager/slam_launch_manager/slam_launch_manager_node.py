@@ -7,28 +7,85 @@ import signal
 from pathlib import Path
 
 import rclpy
+from rclpy.callback_groups import MutuallyExclusiveCallbackGroup
+from rclpy.executors import ExternalShutdownException, MultiThreadedExecutor
 from rclpy.node import Node
+from rclpy.utilities import remove_ros_args
 from rclpy.qos import QoSProfile, QoSReliabilityPolicy, QoSHistoryPolicy, QoSDurabilityPolicy
-from sensor_msgs.msg import PointCloud2, Imu, Image, NavSatFix
-from geometry_msgs.msg import PoseWithCovarianceStamped
-from std_srvs.srv import Empty
 import time
 import threading
-
-from PyQt5 import QtWidgets, uic
-from PyQt5.QtCore import QTimer, QDateTime
-from PyQt5.QtWidgets import QFileDialog, QMessageBox
+from concurrent.futures import ThreadPoolExecutor
+
+from slam_launch_manager.dds_cleanup import (
+    graph_node_names, remove_stale_fastdds_segments, restart_ros2_daemon, wait_nodes_gone)
+from slam_launch_manager.exit_watcher import ExitWatcher, ProcessTracker
+from slam_launch_manager.launch_arguments import LaunchArgumentIntrospector
+from slam_launch_manager.launch_index import BACKEND_PACKAGES, LaunchIndex
+from slam_launch_manager.launch_stacks import StackOrchestrator
+from slam_launch_manager.launch_supervisor import LaunchSupervisor, LaunchJobCancelled
+from slam_launch_manager.launch_worker_pool import LaunchWorkerPool
+from slam_launch_manager.log_sink import infer_level
+from slam_launch_manager.map_saver import MapSaver
+from slam_launch_manager.output_capture import OutputCapture
+from slam_launch_manager.proc_tree import ProcessSnapshot, is_alive
+from slam_launch_manager.readiness import LAUNCH_READINESS, ReadinessWaiter
+from slam_launch_manager.resource_monitor import ResourceMonitor
+from slam_launch_manager.ros_executor import RosSpinThread
+from slam_launch_manager.ros_env import RosEnvironmentCache
+from slam_launch_manager.sensor_stats import SensorStats, peek_header_stamp
+from slam_launch_manager.teardown import GroupTeardown, LaunchCgroups
 
 # Define workspace paths as relative paths
 ROS2_WORKSPACE = Path.home() / 'ros2_ws'
 SRC_PATH = ROS2_WORKSPACE / 'src'
 MAP_PATH = ROS2_WORKSPACE / 'map'
 
+# Launches whose topics the others consume; Stop All brings them down last
+PRODUCER_LAUNCH_KEYS = ('dss',)
+
+# Launches that leave DDS state behind badly enough to confirm their nodes
+# are gone from the graph before the stop counts as done
+DDS_CLEANUP_LAUNCH_KEYS = ('rtabmap',)
+
+# Launch file auto_detect_launch_files() picks for each key: (package, file
+# name, description); the package is looked up in the launch file index
+BACKEND_LAUNCH_FILES = {
+    'dss': ('dss_ros2_bridge', 'launch.py', 'DSS Bridge'),
+    'dss_lio_sam': ('dss_lio_sam', 'run.launch.py', 'DSS LIO-SAM'),
+    'dss_lio_sam_loc': ('dss_lio_sam', 'run_localization.launch.py', 'DSS LIO-SAM Localization'),
+    'rtabmap': ('dss_rtabmap_slam', 'rtabmap_with_rviz.launch.py', 'DSS RTAB-MAP'),
+    'rtabmap_loc': ('dss_rtabmap_localization', 'rtabmap_localization.launch.py',
+                    'DSS RTAB-MAP Localization'),
+    'kissicp': ('dss_kiss_icp', 'run.launch.py', 'DSS KISS-ICP'),
+    'slamtoolbox': ('dss_slam_toolbox', 'slam_mapping.launch.py', 'DSS SLAM-Toolbox'),
+    'slamtoolbox_loc': ('dss_slam_toolbox', 'slam_localization.launch.py',
+                        'DSS SLAM-Toolbox Localization'),
+    'hdl_slam': ('hdl_graph_slam', 'hdl_graph_slam.launch.py', 'HDL Graph SLAM'),
+    'hdl_loc': ('hdl_localization', 'hdl_localization.launch.py', 'HDL Localization'),
+}
+
+# Where each launch file sits in the DSS workspace (relative to SRC_PATH);
+# used until the launch file index has been built once
+DEFAULT_LAUNCH_FILES = {
+    'dss': 'dss_ros2_bridge/dss_ros2_bridge/launch/launch.py',
+    'dss_lio_sam': 'SLAM/LIO-SAM/dss_lio_sam/launch/run.launch.py',
+    'dss_lio_sam_loc': 'SLAM/LIO-SAM/dss_lio_sam/launch/run_localization.launch.py',
+    'rtabmap': 'SLAM/RTAB-MAP/dss_rtabmap_slam/launch/rtabmap_with_rviz.launch.py',
+    'rtabmap_loc': 'SLAM/RTAB-MAP/dss_rtabmap_localization/launch/rtabmap_localization.launch.py',
+    'kissicp': 'SLAM/KISS-ICP/dss_kiss_icp/launch/run.launch.py',
+    'slamtoolbox': 'SLAM/SLAM-Toolbox/dss_slam_toolbox/launch/slam_mapping.launch.py',
+    'slamtoolbox_loc': 'SLAM/SLAM-Toolbox/dss_slam_toolbox/launch/slam_localization.launch.py',
+    'hdl_slam': 'SLAM/HDL/hdl_graph_slam_ros2/launch/hdl_graph_slam.launch.py',
+    'hdl_loc': 'SLAM/HDL/hdl_localization_ros2/hdl_localization/launch/hdl_localization.launch.py',
+}
+
 
 class SlamLaunchManagerNode(Node):
-    def __init__(self, ui_window):
+    def __init__(self, log=None, defer_subscriptions=False):
         super().__init__('slam_launch_manager_node')
-        self.ui = ui_window
+        # log(message, level=None, launch_key=None): the Qt window's log sink,
+        # or the ROS logger when running headless
+        self.log = log or self._log_to_ros
 
         # Dictionary to store running processes
         self.processes = {
@@ -46,7 +103,9 @@ class SlamLaunchManagerNode(Node):
             'custom': None
         }
 
-        # Store launch file paths
+        # Store launch file paths; resolved on the Qt thread and the index
+        # refresh thread, so updates hold launch_files_lock
+        self.launch_files_lock = threading.Lock()
         self.launch_files = {
             'dss': None,  # DSS ROS2 Bridge
             'rtabmap': None,  # RTAB-MAP SLAM mode
@@ -62,18 +121,129 @@ class SlamLaunchManagerNode(Node):
             'custom': None
         }
 
+        # Arguments each launch was last started with
+        self.launch_args = {}
+
+        # Launch files of the workspace and installed packages, cached on disk;
+        # launch_index_listeners are called (from a background thread) when a
+        # refresh found different files
+        self.launch_index = LaunchIndex(SRC_PATH)
+        self.launch_index_listeners = []
+
         # Store map database path
         self.map_database_path = None
         self.slamtoolbox_map_path = None
 
-        # Sensor status tracking
-        self.sensor_last_time = {
-            'lidar': 0.0,
-            'imu': 0.0,
-            'camera': 0.0,
-            'gps': 0.0
-        }
+        # Sensor status tracking: rate/jitter/latency/drop estimates per topic.
+        # The two IMU topics get their own estimators so that both publishing
+        # does not look like one stream at twice the rate
         self.sensor_timeout = 2.0  # seconds
+        self.sensor_stats = {
+            name: SensorStats(timeout=self.sensor_timeout)
+            for name in ('lidar', 'imu', 'imu_livox', 'camera', 'gps')
+        }
+        # One callback group per estimator: a sensor's messages are handled in
+        # order, different sensors in parallel on a multi-threaded executor
+        self.sensor_callback_groups = {
+            name: MutuallyExclusiveCallbackGroup() for name in self.sensor_stats}
+        # sensor_listeners get (sensor_name) when a sensor starts publishing
+        # (again); they are called from executor threads
+        self.sensor_listeners = []
+
+        # Sensor/initialpose subscriptions; the window creates them after its
+        # first frame so that importing message types does not delay it
+        if not defer_subscriptions:
+            self.create_sensor_subscriptions()
+
+        # Service clients for localization reset
+        self.clear_localization_buffer_client = None
+        self.reset_odom_client = None
+
+        # Teardown: 'group' signals the launch's session and waits until it is
+        # empty, 'tree' is the legacy per-PID walk. use_cgroups additionally
+        # places each launch in its own cgroup v2 subtree (needs delegation)
+        self.declare_parameter('teardown_mode', 'group')
+        self.declare_parameter('use_cgroups', False)
+        self.teardown = GroupTeardown()
+        self.cgroups = LaunchCgroups()
+
+        # After an RTAB-Map stop its nodes are confirmed gone from the graph;
+        # restarting the ros2 daemon is only a fallback when they linger
+        self.declare_parameter('dds_cleanup_timeout', 5.0)
+        self.declare_parameter('restart_daemon_fallback', False)
+
+        # Sourced workspace environment shared by every launch; warmed in the
+        # background so the first start does not pay for sourcing setup.bash
+        self.ros_env_cache = RosEnvironmentCache()
+
+        # Declared arguments of every launch file, introspected in a sandboxed
+        # worker and cached by file hash; starts with bad arguments are refused
+        self.declare_parameter('validate_launch_args', True)
+        self.launch_arguments = LaunchArgumentIntrospector(self.prepare_launch_environment)
+
+        # Worker processes with launch/launch_ros already imported, so a start
+        # skips the `ros2 launch` interpreter and entry-point cold start
+        # (0 disables the pool and always uses the CLI)
+        self.declare_parameter('launch_worker_pool_size', 2)
+        self.launch_workers = LaunchWorkerPool(
+            self.get_parameter('launch_worker_pool_size').value,
+            self.prepare_launch_environment,
+            log=self.get_logger().warn)
+        threading.Thread(target=self._warm_launch_environment, daemon=True).start()
+
+        # Launch stdout/stderr go through a pty into a per-launch ring buffer
+        # (and optionally a rotating file in launch_log_dir) instead of our terminal
+        self.declare_parameter('capture_output', True)
+        self.declare_parameter('output_buffer_kb', 1024)
+        self.declare_parameter('launch_log_dir', '')
+        self.declare_parameter('launch_log_max_mb', 10)
+        self.output_capture = OutputCapture(
+            ring_bytes=self.get_parameter('output_buffer_kb').value * 1024,
+            log_dir=os.path.expanduser(self.get_parameter('launch_log_dir').value) or None,
+            max_log_bytes=self.get_parameter('launch_log_max_mb').value * 1024 * 1024,
+            log=lambda message, launch_key: self.log(message, level='WARN', launch_key=launch_key))
+
+        # JSON-lines mirror of the UI log, rotated at 5 MB ('' disables it)
+        self.declare_parameter('ui_log_file', '~/.ros/log/slam_launch_manager/manager_log.jsonl')
+
+        # Start/stop requests run on the supervisor's worker threads so the Qt
+        # event loop (and ROS spinning) never blocks on launch bring-up/teardown
+        self.supervisor = LaunchSupervisor()
+
+        # Maps are saved through service clients on this node, waited for on
+        # supervisor workers so a save is serialized with stops of its launch
+        self.map_saver = MapSaver(self)
+
+        # Launch exits are pushed by the exit watcher; listeners get (launch_key, ExitEvent)
+        self.exit_watcher = ExitWatcher()
+        self.exit_listeners = []
+        self.last_stop_latencies = {}
+
+        # A launch is ready once its expected nodes/topics/services are in the
+        # graph; listeners get (launch_key, time_to_ready) and times are kept
+        self.readiness_specs = dict(LAUNCH_READINESS)
+        self.readiness = ReadinessWaiter(self)
+        self.ready_listeners = []
+        self.time_to_ready = {}
+
+        # Stacks (the bridge plus a backend) start every launch as soon as
+        # the launches it requires are ready, see launch_stacks
+        self.stacks = StackOrchestrator(self)
+
+        # CPU/RSS/threads/context switches of every launch's processes, sampled
+        # off the Qt thread into fixed-size histories (0 disables sampling)
+        self.declare_parameter('resource_sample_period', 1.0)
+        self.resource_monitor = ResourceMonitor(
+            self._running_launch_roots, self.get_parameter('resource_sample_period').value)
+        if self.resource_monitor.period > 0:
+            self.resource_monitor.start()
+
+        self.get_logger().info('Launch Manager Node initialized')
+
+    def create_sensor_subscriptions(self):
+        """Subscribe to the sensor topics shown in the status panel and /initialpose"""
+        from sensor_msgs.msg import PointCloud2, Imu, Image, NavSatFix
+        from geometry_msgs.msg import PoseWithCovarianceStamped
 
         # QoS profile for sensor topics (best effort to match typical sensor publishers)
         sensor_qos = QoSProfile(
@@ -83,19 +253,26 @@ class SlamLaunchManagerNode(Node):
             depth=10
         )
 
-        # Create subscriptions for sensor topics with appropriate QoS
+        # Create subscriptions for sensor topics with appropriate QoS. They are
+        # raw: callbacks get the serialized bytes, and only the header stamp is
+        # read from them, so point clouds and images are never deserialized
         self.lidar_sub = self.create_subscription(
-            PointCloud2, '/dss/sensor/lidar3d', self.lidar_callback, sensor_qos)
+            PointCloud2, '/dss/sensor/lidar3d', self.lidar_callback, sensor_qos, raw=True,
+            callback_group=self.sensor_callback_groups['lidar'])
         # Subscribe to both DSS and Livox IMU topics so UI sees IMU
         # whether the bridge or native Livox driver is publishing.
         self.imu_sub = self.create_subscription(
-            Imu, '/dss/sensor/imu', self.imu_callback, sensor_qos)
+            Imu, '/dss/sensor/imu', self.imu_callback, sensor_qos, raw=True,
+            callback_group=self.sensor_callback_groups['imu'])
         self.imu_sub_alt = self.create_subscription(
-            Imu, '/livox/imu', self.imu_callback, sensor_qos)
+            Imu, '/livox/imu', self.livox_imu_callback, sensor_qos, raw=True,
+            callback_group=self.sensor_callback_groups['imu_livox'])
         self.camera_sub = self.create_subscription(
-            Image, '/dss/sensor/camera/rgb', self.camera_callback, sensor_qos)
+            Image, '/dss/sensor/camera/rgb', self.camera_callback, sensor_qos, raw=True,
+            callback_group=self.sensor_callback_groups['camera'])
         self.gps_sub = self.create_subscription(
-            NavSatFix, '/dss/sensor/gps/fix', self.gps_callback, sensor_qos)
+            NavSatFix, '/dss/sensor/gps/fix', self.gps_callback, sensor_qos, raw=True,
+            callback_group=self.sensor_callback_groups['gps'])
 
         # Subscribe to /initialpose for automatic localization reset
         initialpose_qos = QoSProfile(
@@ -105,37 +282,57 @@ class SlamLaunchManagerNode(Node):
             depth=1
         )
         self.initialpose_sub = self.create_subscription(
-            PoseWithCovarianceStamped, '/initialpose', self.initialpose_callback, initialpose_qos)
-
-        # Service clients for localization reset
-        self.clear_localization_buffer_client = None
-        self.reset_odom_client = None
-
-        self.get_logger().info('Launch Manager Node initialized')
-
-    def start_launch_file(self, launch_key, launch_file_path, extra_args=None):
-        """Start a ROS2 launch file"""
+            PoseWithCovarianceStamped, '/initialpose', self.initialpose_callback, initialpose_qos,
+            callback_group=MutuallyExclusiveCallbackGroup())
+
+    def start_launch_async(self, launch_key, launch_file_path, extra_args=None):
+        """Queue a launch start on the supervisor, returns the LaunchJob"""
+        return self.supervisor.submit('start', launch_key, self.start_launch_file,
+                                      launch_key, launch_file_path, extra_args)
+
+    def stop_launch_async(self, launch_key):
+        """Queue a launch stop on the supervisor, returns the LaunchJob"""
+        return self.supervisor.submit('stop', launch_key, self.stop_launch_file, launch_key)
+
+    def stop_all_async(self):
+        """Queue stopping of every running launch, returns the LaunchJob"""
+        # A stack bring-up in progress must not start anything after this
+        self.stacks.cancel_all()
+        return self.supervisor.submit('stop_all', None, self.stop_all_launches)
+
+    def start_launch_file(self, launch_key, launch_file_path, extra_args=None, job=None):
+        """Start a ROS2 launch file (blocking, normally run through start_launch_async)"""
         if self.processes[launch_key] is not None:
-            self.ui.log(f"Launch '{launch_key}' is already running!")
+            self.log(f"Launch '{launch_key}' is already running!", launch_key=launch_key)
             return False
 
         if not launch_file_path or not os.path.exists(launch_file_path):
-            self.ui.log(f"Launch file not found: {launch_file_path}")
+            self.log(f"Launch file not found: {launch_file_path}", launch_key=launch_key)
             return False
 
+        # Arguments are checked against what the file declares (cached by
+        # file hash) instead of failing inside ros2 launch; a file that was
+        # not introspected yet starts unchecked rather than waiting for it
+        if self.get_parameter('validate_launch_args').value:
+            check = self.launch_arguments.validate(launch_file_path, extra_args)
+            if check is None:
+                self.log(f"Launch arguments of {launch_file_path} not known yet, not checked",
+                         level='DEBUG', launch_key=launch_key)
+            else:
+                for warning in check.warnings:
+                    self.log(warning, level='WARN', launch_key=launch_key)
+                if check.errors:
+                    for problem in check.errors:
+                        self.log(f"Not starting: {problem}", level='ERROR', launch_key=launch_key)
+                    return False
+
+        output = None
+        process = None
         try:
-            # For RTAB-Map, ensure clean DDS state BEFORE starting
-            if launch_key == 'rtabmap':
-                self.ui.log("Cleaning DDS state before RTAB-Map start...")
-                import time
-                try:
-                    subprocess.run(['ros2', 'daemon', 'stop'], timeout=5, capture_output=True)
-                    time.sleep(0.5)
-                    subprocess.run(['ros2', 'daemon', 'start'], timeout=5, capture_output=True)
-                    time.sleep(1)  # Give daemon time to fully restart
-                    self.ui.log("DDS state cleaned")
-                except Exception as e:
-                    self.ui.log(f"Warning: Could not clean DDS state: {e}")
+            # For RTAB-Map, drop shared-memory segments left by crashed
+            # participants so the new ones do not try to attach to them
+            if launch_key in DDS_CLEANUP_LAUNCH_KEYS:
+                self._cleanup_stale_dds(launch_key)
 
             # Start the launch file using ros2 launch command
             cmd = ['ros2', 'launch', launch_file_path]
@@ -144,233 +341,387 @@ class SlamLaunchManagerNode(Node):
             if extra_args:
                 cmd.extend(extra_args)
 
-            # Inherit environment variables including DISPLAY for GUI applications
-            env = os.environ.copy()
-
-            # Ensure ROS_DOMAIN_ID is set (use default 0 if not set)
-            if 'ROS_DOMAIN_ID' not in env:
-                env['ROS_DOMAIN_ID'] = '0'
+            # Environment of a shell that sourced the workspace setup script
+            env = self.prepare_launch_environment()
+
+            # Optionally confine the launch to its own cgroup so it can be
+            # killed as a unit, including processes that leave the session
+            cgroup = self.cgroups.create(launch_key) if self.get_parameter('use_cgroups').value else None
+
+            # Last point where the start can be cancelled - nothing is running yet
+            if job is not None and job.cancel_requested:
+                if cgroup is not None:
+                    cgroup.remove()
+                job.check_cancelled()
+
+            # Nodes already in the graph, so the ones this launch adds can be told apart
+            graph_nodes_before = graph_node_names(self)
+
+            if self.get_parameter('capture_output').value:
+                output = self.output_capture.attach(launch_key)
+
+            # Prefer a pre-warmed worker that already imported the launch API;
+            # it becomes the launch process itself (own session, our child)
+            process = self.launch_workers.launch(
+                launch_file_path, extra_args,
+                cgroup_procs=cgroup.procs_file if cgroup is not None else None,
+                output=output.child_path if output is not None else None)
+            if process is not None:
+                self.get_logger().info(f"{launch_key} handed to warm launch worker")
+            else:
+                # A tiny sh shim joins the cgroup and then execs ros2 launch, so
+                # the PID stays the same and nothing escapes before the move
+                if cgroup is not None:
+                    cmd = ['sh', '-c', 'echo $$ > "$0" && exec "$@"', cgroup.procs_file] + cmd
+
+                # Exec ros2 launch directly in a new session (Ctrl-C-style group
+                # teardown relies on it). Popen only returns once exec succeeded,
+                # so process.pid is the launch itself and a child of ours: the
+                # exit watcher's pidfd is opened before anyone could reap it.
+                # The Popen stays on the tracker; the watcher is its only reaper.
+                # Output goes to the capture pty, so nodes still see a terminal
+                # and keep their usual line-buffered, colored output
+                child_output = output.child_fd if output is not None else None
+                process = subprocess.Popen(
+                    cmd,
+                    env=env,
+                    stdin=subprocess.DEVNULL,
+                    stdout=child_output,
+                    stderr=child_output,
+                    cwd=os.path.expanduser('~'),
+                    start_new_session=True
+                )
+            if output is not None:
+                # The launch holds its own copy of the write end by now
+                output.close_child_end()
+
+            # Store a pseudo-process object with the actual PID; its exit is
+            # reported by the exit watcher instead of being polled
+            actual_pid = process.pid
+            tracker = ProcessTracker(actual_pid, process)
+            tracker.cgroup = cgroup
+            tracker.graph_nodes_before = graph_nodes_before
+            self.processes[launch_key] = tracker
+            self.launch_args[launch_key] = list(extra_args or [])
+            self.exit_watcher.watch(
+                actual_pid, lambda event: self._on_launch_exit(launch_key, tracker, event), process)
+
+            spec = self.readiness_specs.get(launch_key)
+            if spec is None or spec.empty():
+                self._on_launch_ready(launch_key, tracker, False)
+            else:
+                self.readiness.wait(
+                    launch_key, spec,
+                    lambda key, _elapsed, timed_out: self._on_launch_ready(key, tracker, timed_out))
+            self.log(f"Started launch file: {launch_file_path}", launch_key=launch_key)
+            if extra_args:
+                self.log(f"  with args: {' '.join(extra_args)}", launch_key=launch_key)
+            self.get_logger().info(f"Started {launch_key}: PID={actual_pid}")
+            return True
 
-            # Clear any RMW implementation cache
-            env.pop('RMW_IMPLEMENTATION', None)
+        except LaunchJobCancelled:
+            self.log(f"Start of '{launch_key}' cancelled", launch_key=launch_key)
+            raise
+        except Exception as e:
+            if output is not None and process is None:
+                # Nothing holds the capture's write end, so nothing will ever end it
+                self.output_capture.detach(output)
+            self.log(f"Failed to start launch file: {str(e)}", launch_key=launch_key)
+            self.get_logger().error(f"Failed to start {launch_key}: {str(e)}")
+            return False
 
-            # Write PID to a temporary file so we can track the detached process
-            import tempfile
-            pid_file = tempfile.NamedTemporaryFile(mode='w', suffix='.pid', delete=False)
-            pid_file_path = pid_file.name
-            pid_file.close()
+    def prepare_launch_environment(self):
+        """Environment for a launch: ours plus everything the workspace setup script sets"""
+        # Inherit environment variables including DISPLAY for GUI applications
+        env = os.environ.copy()
 
-            # Create launch script with proper environment setup
-            script_content = f"""#!/bin/bash
-set -e
+        # Ensure ROS_DOMAIN_ID is set (use default 0 if not set)
+        if 'ROS_DOMAIN_ID' not in env:
+            env['ROS_DOMAIN_ID'] = '0'
 
-# Source ROS2 setup
-source {os.path.expanduser('~/ros2_ws/install/setup.bash')}
+        # Clear any RMW implementation cache
+        env.pop('RMW_IMPLEMENTATION', None)
 
-# Write PID for tracking
-echo $$ > {pid_file_path}
+        # Sourcing setup.bash is resolved once and reused until the install tree changes
+        return self.ros_env_cache.get(env)
 
-# Change to home directory (like terminal does)
-cd {os.path.expanduser('~')}
+    def _warm_launch_environment(self):
+        try:
+            self.prepare_launch_environment()
+        except Exception as e:
+            self.get_logger().warn(f"Could not resolve ROS environment: {e}")
+            return
+        self.launch_workers.start()
 
-# Execute launch command
-exec {' '.join(cmd)}
-"""
+    def stop_launch_file(self, launch_key, job=None):
+        """Stop a running launch file (blocking, normally run through stop_launch_async)"""
+        if self.processes[launch_key] is None:
+            self.log(f"Launch '{launch_key}' is not running!", launch_key=launch_key)
+            return False
 
-            # Create temporary script file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.sh', delete=False) as f:
-                script_path = f.name
-                f.write(script_content)
+        try:
+            stop_started = time.monotonic()
+            process = self.processes[launch_key]
+            process.stopping = True
+            self.readiness.cancel(launch_key)
 
-            os.chmod(script_path, 0o755)
+            launch_nodes = self._launch_graph_nodes(launch_key, process)
 
-            # Start the process completely detached using setsid
-            # DO NOT redirect stdout/stderr to allow ROS2 nodes to communicate properly
-            process = subprocess.Popen(
-                ['setsid', 'bash', script_path],
-                env=env,
-                stdin=subprocess.DEVNULL,
-                cwd=os.path.expanduser('~'),
-                preexec_fn=os.setpgrp  # Create new process group
-            )
+            teardown_mode = self.get_parameter('teardown_mode').value
+            if teardown_mode == 'tree':
+                self._stop_process_tree(launch_key, process)
+            else:
+                self._stop_process_group(launch_key, process)
 
-            # Wait a moment for PID file to be written
-            import time
-            time.sleep(0.5)
+            self.processes[launch_key] = None
 
-            # Read the actual PID from the file
-            actual_pid = None
-            try:
-                with open(pid_file_path, 'r') as f:
-                    actual_pid = int(f.read().strip())
-            except:
-                actual_pid = process.pid
-
-            # Clean up temp files after a delay
-            import threading
-            def cleanup_files():
-                import time
-                time.sleep(5)
-                try:
-                    os.unlink(script_path)
-                    os.unlink(pid_file_path)
-                except:
-                    pass
-            threading.Thread(target=cleanup_files, daemon=True).start()
+            # For RTAB-Map, confirm its nodes left the graph and clear stale
+            # SHM segments instead of restarting the ROS2 daemon
+            if launch_key in DDS_CLEANUP_LAUNCH_KEYS:
+                self._confirm_launch_nodes_gone(launch_key, launch_nodes)
 
-            # Store a pseudo-process object with the actual PID
-            class ProcessTracker:
-                def __init__(self, pid):
-                    self.pid = pid
+            self.log(f"Stopped launch: {launch_key} ({time.monotonic() - stop_started:.2f}s)", launch_key=launch_key)
+            self.get_logger().info(f"Stopped {launch_key}")
 
-                def poll(self):
-                    # Check if process is still running
-                    try:
-                        os.kill(self.pid, 0)  # Signal 0 just checks existence
-                        return None  # Still running
-                    except OSError:
-                        return 0  # Process ended
+            if teardown_mode == 'tree':
+                # Give sufficient time for all nodes, DDS participants, and topics to fully clean up
+                self.log("Waiting for cleanup to complete...", launch_key=launch_key)
+                time.sleep(2)
+                self.log("Cleanup complete", launch_key=launch_key)
 
-            self.processes[launch_key] = ProcessTracker(actual_pid)
-            self.ui.log(f"Started launch file: {launch_file_path}")
-            if extra_args:
-                self.ui.log(f"  with args: {' '.join(extra_args)}")
-            self.get_logger().info(f"Started {launch_key}: PID={actual_pid}")
             return True
 
         except Exception as e:
-            self.ui.log(f"Failed to start launch file: {str(e)}")
-            self.get_logger().error(f"Failed to start {launch_key}: {str(e)}")
+            self.log(f"Failed to stop launch: {str(e)}", launch_key=launch_key)
+            self.get_logger().error(f"Failed to stop {launch_key}: {str(e)}")
             return False
 
-    def stop_launch_file(self, launch_key):
-        """Stop a running launch file"""
-        if self.processes[launch_key] is None:
-            self.ui.log(f"Launch '{launch_key}' is not running!")
-            return False
+    def _launch_graph_nodes(self, launch_key, process):
+        """Graph nodes that appeared after launch_key started and no later launch could own"""
+        if process.graph_nodes_before is None:
+            return set()
+        nodes = graph_node_names(self) - process.graph_nodes_before
+        for key, other in self.processes.items():
+            if key == launch_key or other is None or other.graph_nodes_before is None:
+                continue
+            if other.started_at >= process.started_at:
+                # Started after us: whatever it did not see yet may be its own
+                nodes &= other.graph_nodes_before
+        return nodes
+
+    def _confirm_launch_nodes_gone(self, launch_key, launch_nodes):
+        if launch_nodes:
+            lingering = wait_nodes_gone(
+                self, launch_nodes, self.get_parameter('dds_cleanup_timeout').value)
+            if lingering:
+                self.log(f"Nodes still in the graph after stopping {launch_key}: "
+                            f"{', '.join(sorted(lingering))}", level='WARN', launch_key=launch_key)
+                if self.get_parameter('restart_daemon_fallback').value:
+                    self.log("Restarting ROS2 daemon for clean DDS state...", launch_key=launch_key)
+                    try:
+                        restart_ros2_daemon()
+                        self.log("ROS2 daemon restarted", launch_key=launch_key)
+                    except Exception as e:
+                        self.log(f"Warning: Could not restart daemon: {e}", launch_key=launch_key)
+        self._cleanup_stale_dds(launch_key)
 
+    def _cleanup_stale_dds(self, launch_key):
         try:
-            process = self.processes[launch_key]
-            import time
+            removed = remove_stale_fastdds_segments()
+        except Exception as e:
+            self.log(f"Warning: Could not clean DDS shared memory: {e}", launch_key=launch_key)
+            return
+        if removed:
+            self.get_logger().info(
+                f"Removed {len(removed)} stale Fast DDS SHM files around {launch_key}")
+
+    def _stop_process_group(self, launch_key, process):
+        """Signal the launch's whole session (and cgroup) and return once it is empty"""
+        # Launches run in their own session whose id is the leader's PID
+        self.log(f"Stopping session {process.pid} of '{launch_key}'", launch_key=launch_key)
+        result = self.teardown.stop(process.pid, cgroup=process.cgroup,
+                                    log=lambda message: self.log(message, launch_key=launch_key))
+        if result.survivors:
+            self.log(f"Warning: processes survived SIGKILL: {result.survivors}", launch_key=launch_key)
+        else:
+            stage = signal.Signals(result.last_signal).name if result.last_signal else 'no signal'
+            self.log(f"Session of '{launch_key}' empty after {stage} in {result.elapsed:.2f}s", launch_key=launch_key)
+
+    def _stop_process_tree(self, launch_key, process):
+        """Legacy teardown: signal every process of the tree one PID at a time"""
+        # Snapshot /proc once and collect the whole tree from the parent ->
+        # children index; start times guard against reused PIDs
+        snapshot = ProcessSnapshot.take()
+        tree = snapshot.tree(process.pid, process.start_time)
+
+        # For dss launch, also find processes by name pattern
+        if launch_key == 'dss':
+            tree_pids = {info.pid for info in tree}
+            tree.extend(info for info in snapshot.match_cmdline('dss_ros2_bridge')
+                        if info.pid not in tree_pids)
+
+        all_pids = [info.pid for info in tree]
+        self.log(f"Stopping process tree: {all_pids}", launch_key=launch_key)
+
+        # Send SIGINT to all processes
+        for pid in reversed(all_pids):  # Kill children first
+            try:
+                os.kill(pid, signal.SIGINT)
+            except ProcessLookupError:
+                pass
+            except Exception as e:
+                self.log(f"Warning: Could not send SIGINT to {pid}: {e}", launch_key=launch_key)
 
-            # Get all child processes recursively
-            def get_process_tree(pid):
-                """Get all child processes of a given PID"""
-                try:
-                    result = subprocess.run(
-                        ['pgrep', '-P', str(pid)],
-                        capture_output=True,
-                        text=True,
-                        timeout=2
-                    )
-                    child_pids = [int(p) for p in result.stdout.strip().split('\n') if p]
-                    all_pids = child_pids.copy()
-                    for child_pid in child_pids:
-                        all_pids.extend(get_process_tree(child_pid))
-                    return all_pids
-                except:
-                    return []
-
-            # Get all processes in the tree
-            all_pids = [process.pid] + get_process_tree(process.pid)
-
-            # For dss launch, also find processes by name pattern
-            if launch_key == 'dss':
-                try:
-                    # Find all dss_ros2_bridge related processes
-                    result = subprocess.run(
-                        ['pgrep', '-f', 'dss_ros2_bridge'],
-                        capture_output=True,
-                        text=True,
-                        timeout=2
-                    )
-                    dss_pids = [int(p) for p in result.stdout.strip().split('\n') if p]
-                    for pid in dss_pids:
-                        if pid not in all_pids:
-                            all_pids.append(pid)
-                except:
-                    pass
+        # Wait for processes to terminate
+        time.sleep(2)
 
-            self.ui.log(f"Stopping process tree: {all_pids}")
+        # Check if any processes are still alive and force kill them
+        surviving_pids = [info.pid for info in tree if is_alive(info)]
 
-            # Send SIGINT to all processes
-            for pid in reversed(all_pids):  # Kill children first
+        if surviving_pids:
+            self.log(f"Force killing surviving processes: {surviving_pids}", launch_key=launch_key)
+            for pid in reversed(surviving_pids):
                 try:
-                    os.kill(pid, signal.SIGINT)
+                    os.kill(pid, signal.SIGKILL)
                 except ProcessLookupError:
                     pass
                 except Exception as e:
-                    self.ui.log(f"Warning: Could not send SIGINT to {pid}: {e}")
-
-            # Wait for processes to terminate
-            time.sleep(2)
-
-            # Check if any processes are still alive and force kill them
-            surviving_pids = []
-            for pid in all_pids:
-                try:
-                    os.kill(pid, 0)  # Check if process exists
-                    surviving_pids.append(pid)
-                except ProcessLookupError:
-                    pass
-
-            if surviving_pids:
-                self.ui.log(f"Force killing surviving processes: {surviving_pids}")
-                for pid in reversed(surviving_pids):
-                    try:
-                        os.kill(pid, signal.SIGKILL)
-                    except ProcessLookupError:
-                        pass
-                    except Exception as e:
-                        self.ui.log(f"Warning: Could not force kill {pid}: {e}")
+                    self.log(f"Warning: Could not force kill {pid}: {e}", launch_key=launch_key)
+
+            time.sleep(1)
+
+    def stop_all_launches(self, job=None):
+        """Stop all running launch files, consumers in parallel first, then producers"""
+        started = time.monotonic()
+        running = [key for key in self.processes if self.processes[key] is not None]
+        consumers = [key for key in running if key not in PRODUCER_LAUNCH_KEYS]
+        producers = [key for key in running if key in PRODUCER_LAUNCH_KEYS]
+
+        # SLAM/localization/custom launches consume the bridge's topics, so they
+        # go down together before the bridge itself
+        latencies = {}
+        for stage in (consumers, producers):
+            latencies.update(self._stop_concurrently(stage))
+
+        self.last_stop_latencies = latencies
+        if latencies:
+            summary = ', '.join(f"{key} {latency:.2f}s" for key, latency in latencies.items())
+            self.log(f"Stop latency: {summary}")
+        self.log(f"All launches stopped in {time.monotonic() - started:.2f}s")
+        return True
 
-                time.sleep(1)
+    def _stop_concurrently(self, launch_keys):
+        """Stop the given launches in parallel, returns {launch_key: stop latency in s}"""
+        def stop(key):
+            t0 = time.monotonic()
+            # Serialize with any start/stop job already queued for this key
+            with self.supervisor.key_lock(key):
+                if self.processes[key] is not None:
+                    self.stop_launch_file(key)
+            return time.monotonic() - t0
+
+        if not launch_keys:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(launch_keys), thread_name_prefix='stop-all') as pool:
+            futures = {key: pool.submit(stop, key) for key in launch_keys}
+        latencies = {}
+        for key, future in futures.items():
+            try:
+                latencies[key] = future.result()
+            except Exception as e:
+                self.log(f"Failed to stop '{key}': {e}", launch_key=key)
+        return latencies
+
+    def shutdown(self):
+        """Stop every launch and the supervisor worker threads (blocking, used on exit)"""
+        self.resource_monitor.stop()
+        self.launch_arguments.shutdown()
+        self.stacks.cancel_all()
+        self.supervisor.cancel_all()
+        self.stop_all_launches()
+        self.supervisor.shutdown(wait=True)
+        self.launch_workers.shutdown()
+        self.exit_watcher.close()
+        self.output_capture.close()
+
+    def _running_launch_roots(self):
+        """{launch_key: (pid, start_time)} of launches whose process has not exited"""
+        return {key: (tracker.pid, tracker.start_time)
+                for key, tracker in list(self.processes.items())
+                if tracker is not None and not tracker.exited.is_set()}
+
+    def _on_launch_ready(self, launch_key, tracker, timed_out):
+        """Record that a launch exposes its interfaces (or gave up waiting for them)"""
+        if self.processes.get(launch_key) is not tracker or tracker.exited.is_set():
+            return
+        tracker.ready_at = time.time()
+        tracker.time_to_ready = tracker.ready_at - tracker.started_at
+        self.time_to_ready[launch_key] = tracker.time_to_ready
+
+        if timed_out:
+            missing = ', '.join(self.readiness.missing(self.readiness_specs[launch_key]))
+            self.log(f"Warning: '{launch_key}' not ready after {tracker.time_to_ready:.1f}s "
+                        f"(missing: {missing}), treating it as ready", launch_key=launch_key)
+        else:
+            self.log(f"'{launch_key}' ready after {tracker.time_to_ready:.2f}s", launch_key=launch_key)
 
-            self.processes[launch_key] = None
-            self.ui.log(f"Stopped launch: {launch_key}")
-            self.get_logger().info(f"Stopped {launch_key}")
+        for callback in list(self.ready_listeners):
+            try:
+                callback(launch_key, tracker.time_to_ready)
+            except Exception:
+                pass
 
-            # For RTAB-Map, restart ROS2 daemon to ensure clean DDS state
-            if launch_key == 'rtabmap':
-                self.ui.log("Restarting ROS2 daemon for clean DDS state...")
-                try:
-                    subprocess.run(['ros2', 'daemon', 'stop'], timeout=5, capture_output=True)
-                    time.sleep(0.5)
-                    subprocess.run(['ros2', 'daemon', 'start'], timeout=5, capture_output=True)
-                    self.ui.log("ROS2 daemon restarted")
-                except Exception as e:
-                    self.ui.log(f"Warning: Could not restart daemon: {e}")
+    def _on_launch_exit(self, launch_key, tracker, event):
+        """Called from the exit watcher thread the moment a launch process exits"""
+        tracker.set_exited(event)
+        if tracker.cgroup is not None and not tracker.stopping and not tracker.cgroup.pids():
+            # A stop removes the cgroup in its teardown; a launch that ended by
+            # itself would leave it behind. Nodes that outlived the launch keep
+            # it (and are still torn down with it) until the next stop
+            tracker.cgroup.remove()
+        if self.processes.get(launch_key) is not tracker:
+            return
 
-            # Give sufficient time for all nodes, DDS participants, and topics to fully clean up
-            self.ui.log("Waiting for cleanup to complete...")
-            time.sleep(2)
-            self.ui.log("Cleanup complete")
+        self.readiness.cancel(launch_key)
+        if not tracker.stopping:
+            status = 'unknown status' if event.returncode is None else f'code {event.returncode}'
+            uptime = event.exit_time - tracker.started_at
+            self.log(f"Launch '{launch_key}' exited unexpectedly ({status}) after {uptime:.1f}s", launch_key=launch_key)
+            self.get_logger().warn(f"{launch_key} (PID={event.pid}) exited with {status}")
 
-            return True
+        for callback in list(self.exit_listeners):
+            try:
+                callback(launch_key, event)
+            except Exception:
+                pass
 
-        except Exception as e:
-            self.ui.log(f"Failed to stop launch: {str(e)}")
-            self.get_logger().error(f"Failed to stop {launch_key}: {str(e)}")
-            return False
+    def lidar_callback(self, data):
+        self._on_sensor_message('lidar', data)
 
-    def stop_all_launches(self):
-        """Stop all running launch files"""
-        for key in self.processes.keys():
-            if self.processes[key] is not None:
-                self.stop_launch_file(key)
-        self.ui.log("All launches stopped")
+    def imu_callback(self, data):
+        self._on_sensor_message('imu', data)
 
-    def lidar_callback(self, msg):
-        self.sensor_last_time['lidar'] = time.time()
+    def livox_imu_callback(self, data):
+        self._on_sensor_message('imu_livox', data)
 
-    def imu_callback(self, msg):
-        self.sensor_last_time['imu'] = time.time()
+    def camera_callback(self, data):
+        self._on_sensor_message('camera', data)
 
-    def camera_callback(self, msg):
-        self.sensor_last_time['camera'] = time.time()
+    def gps_callback(self, data):
+        self._on_sensor_message('gps', data)
 
-    def gps_callback(self, msg):
-        self.sensor_last_time['gps'] = time.time()
+    def _on_sensor_message(self, sensor_name, data):
+        now = time.time()
+        stats = self.sensor_stats[sensor_name]
+        was_active = stats.last_time is not None and now - stats.last_time < stats.timeout
+        stats.update(now, peek_header_stamp(data), len(data))
+        if not was_active:
+            sensor_name = 'imu' if sensor_name == 'imu_livox' else sensor_name
+            for callback in list(self.sensor_listeners):
+                try:
+                    callback(sensor_name)
+                except Exception:
+                    pass
 
     def initialpose_callback(self, msg):
         """Handle /initialpose messages for automatic localization reset"""
@@ -379,10 +730,11 @@ exec {' '.join(cmd)}
             return
 
         self.get_logger().info(f'Received /initialpose: x={msg.pose.pose.position.x:.2f}, y={msg.pose.pose.position.y:.2f}')
-        self.ui.log(f'Received /initialpose: x={msg.pose.pose.position.x:.2f}, y={msg.pose.pose.position.y:.2f}')
+        self.log(f'Received /initialpose: x={msg.pose.pose.position.x:.2f}, y={msg.pose.pose.position.y:.2f}')
 
         # Call services in a separate thread to avoid blocking
         def reset_localization():
+            from std_srvs.srv import Empty
             try:
                 # 1. Clear SLAM-Toolbox localization buffer
                 if self.clear_localization_buffer_client is None:
@@ -392,10 +744,10 @@ exec {' '.join(cmd)}
                 if self.clear_localization_buffer_client.wait_for_service(timeout_sec=2.0):
                     future = self.clear_localization_buffer_client.call_async(Empty.Request())
                     self.get_logger().info('Called /slam_toolbox/clear_localization_buffer')
-                    self.ui.log('Cleared SLAM-Toolbox localization buffer')
+                    self.log('Cleared SLAM-Toolbox localization buffer')
                 else:
                     self.get_logger().warn('clear_localization_buffer service not available')
-                    self.ui.log('Warning: clear_localization_buffer service not available')
+                    self.log('Warning: clear_localization_buffer service not available')
 
                 # 2. Reset ICP odometry
                 if self.reset_odom_client is None:
@@ -404,16 +756,16 @@ exec {' '.join(cmd)}
                 if self.reset_odom_client.wait_for_service(timeout_sec=2.0):
                     future = self.reset_odom_client.call_async(Empty.Request())
                     self.get_logger().info('Called /reset_odom')
-                    self.ui.log('Reset ICP odometry')
+                    self.log('Reset ICP odometry')
                 else:
                     self.get_logger().warn('reset_odom service not available')
-                    self.ui.log('Warning: reset_odom service not available')
+                    self.log('Warning: reset_odom service not available')
 
-                self.ui.log('Localization reset complete - scan matching will start from new position')
+                self.log('Localization reset complete - scan matching will start from new position')
 
             except Exception as e:
                 self.get_logger().error(f'Error resetting localization: {e}')
-                self.ui.log(f'Error resetting localization: {e}')
+                self.log(f'Error resetting localization: {e}')
 
         # Run in separate thread
         reset_thread = threading.Thread(target=reset_localization, daemon=True)
@@ -421,17 +773,24 @@ exec {' '.join(cmd)}
 
     def get_sensor_status(self, sensor_name):
         """Check if sensor is active (received data within timeout)"""
-        last_time = self.sensor_last_time.get(sensor_name, 0.0)
-        if last_time == 0.0:
-            return False
-        return (time.time() - last_time) < self.sensor_timeout
+        return self.get_sensor_stats(sensor_name).active
+
+    def get_sensor_stats(self, sensor_name):
+        """SensorSnapshot of a sensor; for 'imu' the most recently active IMU topic"""
+        now = time.time()
+        snapshot = self.sensor_stats[sensor_name].snapshot(now)
+        if sensor_name == 'imu':
+            livox = self.sensor_stats['imu_livox'].snapshot(now)
+            if (livox.last_time or 0.0) > (snapshot.last_time or 0.0):
+                return livox
+        return snapshot
 
     def is_running(self, launch_key):
         """Check if a launch file is currently running"""
         if self.processes[launch_key] is None:
             return False
 
-        # Check if process is still alive
+        # Exit status is pushed by the exit watcher, so this is just a field read
         poll = self.processes[launch_key].poll()
         if poll is not None:
             # Process has terminated
@@ -440,1044 +799,187 @@ exec {' '.join(cmd)}
 
         return True
 
-
-class SlamLaunchManagerUI(QtWidgets.QMainWindow):
-    def __init__(self):
-        super().__init__()
-
-        # Load UI file
-        ui_file = Path(__file__).parent / 'ui' / 'slam_launch_manager.ui'
-        uic.loadUi(ui_file, self)
-
-        # ROS2 node (will be initialized later)
-        self.node = None
-
-        # Connect buttons - DSS Bridge
-        self.btnStartDSS.clicked.connect(self.on_start_dss)
-        self.btnStopDSS.clicked.connect(self.on_stop_dss)
-
-        # Livox and LIO-SAM tabs removed (DSS-only environment)
-
-        self.btnStartDssLioSam.clicked.connect(self.on_start_dss_lio_sam)
-        self.btnStopDssLioSam.clicked.connect(self.on_stop_dss_lio_sam)
-        self.btnSaveDssLioSamMap.clicked.connect(self.on_save_dss_lio_sam_map)
-
-        self.btnBrowseDssLioSamMap.clicked.connect(self.on_browse_dss_lio_sam_map)
-        self.btnStartDssLioSamLoc.clicked.connect(self.on_start_dss_lio_sam_loc)
-        self.btnStopDssLioSamLoc.clicked.connect(self.on_stop_dss_lio_sam_loc)
-
-        # Connect buttons - RTAB-MAP SLAM
-        self.btnBrowseRtabmapDb.clicked.connect(self.on_browse_rtabmap_db)
-        self.btnStartRtabmap.clicked.connect(self.on_start_rtabmap)
-        self.btnStopRtabmap.clicked.connect(self.on_stop_rtabmap)
-        self.btnSaveRtabmapMap.clicked.connect(self.on_save_rtabmap_map)
-
-        # Connect buttons - RTAB-MAP Localization
-        self.btnBrowseRtabmapLocDb.clicked.connect(self.on_browse_rtabmap_loc_db)
-        self.btnStartRtabmapLoc.clicked.connect(self.on_start_rtabmap_loc)
-        self.btnStopRtabmapLoc.clicked.connect(self.on_stop_rtabmap_loc)
-
-        # Connect buttons - KISS-ICP
-        self.btnStartKissIcp.clicked.connect(self.on_start_kissicp)
-        self.btnStopKissIcp.clicked.connect(self.on_stop_kissicp)
-        self.btnSaveKissIcpMap.clicked.connect(self.on_save_kissicp_map)
-
-        # Connect buttons - SLAM-Toolbox
-        self.btnStartSlamToolbox.clicked.connect(self.on_start_slamtoolbox)
-        self.btnStopSlamToolbox.clicked.connect(self.on_stop_slamtoolbox)
-        self.btnSaveSlamToolboxMap.clicked.connect(self.on_save_slamtoolbox_map)
-        self.btnBrowseSlamToolboxMap.clicked.connect(self.on_browse_slamtoolbox_map)
-        self.btnStartSlamToolboxLoc.clicked.connect(self.on_start_slamtoolbox_loc)
-        self.btnStopSlamToolboxLoc.clicked.connect(self.on_stop_slamtoolbox_loc)
-
-        # Connect buttons - HDL Graph SLAM
-        self.btnStartHdlSlam.clicked.connect(self.on_start_hdl_slam)
-        self.btnStopHdlSlam.clicked.connect(self.on_stop_hdl_slam)
-        self.btnSaveHdlMap.clicked.connect(self.on_save_hdl_map)
-        self.btnBrowseHdlMap.clicked.connect(self.on_browse_hdl_map)
-        self.btnStartHdlLoc.clicked.connect(self.on_start_hdl_loc)
-        self.btnStopHdlLoc.clicked.connect(self.on_stop_hdl_loc)
-
-        self.btnStartCustom.clicked.connect(self.on_start_custom)
-        self.btnStopCustom.clicked.connect(self.on_stop_custom)
-        self.btnBrowse.clicked.connect(self.on_browse)
-
-        self.btnStopAll.clicked.connect(self.on_stop_all)
-
-        # Timer to check process status
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.update_button_states)
-        self.status_timer.start(500)  # Check every 500ms
-
-        # Timer to update sensor status
-        self.sensor_timer = QTimer()
-        self.sensor_timer.timeout.connect(self.update_sensor_status)
-        self.sensor_timer.start(500)  # Check every 500ms
-
-        self.log("Launch Manager UI Ready")
-
-    def set_node(self, node):
-        """Set the ROS2 node"""
-        self.node = node
-
-        # Try to auto-detect launch files
-        self.auto_detect_launch_files()
-
-    def auto_detect_launch_files(self):
-        """Auto-detect launch files in the workspace"""
-        # Look for DSS ROS2 Bridge launch file
-        dss_launch = SRC_PATH / 'dss_ros2_bridge' / 'dss_ros2_bridge' / 'launch' / 'launch.py'
-        if dss_launch.exists():
-            self.node.launch_files['dss'] = str(dss_launch)
-            self.log(f"Found DSS Bridge launch: {dss_launch}")
-
-        # Look for DSS LIO-SAM launch file (for simulation)
-        dss_lio_sam_launch = SRC_PATH / 'SLAM' / 'LIO-SAM' / 'dss_lio_sam' / 'launch' / 'run.launch.py'
-        if dss_lio_sam_launch.exists():
-            self.node.launch_files['dss_lio_sam'] = str(dss_lio_sam_launch)
-            self.log(f"Found DSS LIO-SAM launch: {dss_lio_sam_launch}")
-
-        # Look for DSS LIO-SAM Localization launch file
-        dss_lio_sam_loc_launch = SRC_PATH / 'SLAM' / 'LIO-SAM' / 'dss_lio_sam' / 'launch' / 'run_localization.launch.py'
-        if dss_lio_sam_loc_launch.exists():
-            self.node.launch_files['dss_lio_sam_loc'] = str(dss_lio_sam_loc_launch)
-            self.log(f"Found DSS LIO-SAM Localization launch: {dss_lio_sam_loc_launch}")
-
-        # Look for DSS RTAB-MAP SLAM launch file (for simulation)
-        dss_rtabmap_launch = SRC_PATH / 'SLAM' / 'RTAB-MAP' / 'dss_rtabmap_slam' / 'launch' / 'rtabmap_with_rviz.launch.py'
-        if dss_rtabmap_launch.exists():
-            self.node.launch_files['rtabmap'] = str(dss_rtabmap_launch)
-            self.log(f"Found DSS RTAB-MAP launch: {dss_rtabmap_launch}")
-
-        # Look for DSS RTAB-MAP Localization launch file (dedicated localization package)
-        dss_rtabmap_loc_launch = SRC_PATH / 'SLAM' / 'RTAB-MAP' / 'dss_rtabmap_localization' / 'launch' / 'rtabmap_localization.launch.py'
-        if dss_rtabmap_loc_launch.exists():
-            self.node.launch_files['rtabmap_loc'] = str(dss_rtabmap_loc_launch)
-            self.log(f"Found DSS RTAB-MAP Localization launch: {dss_rtabmap_loc_launch}")
-
-        # Look for DSS KISS-ICP launch file
-        dss_kissicp_launch = SRC_PATH / 'SLAM' / 'KISS-ICP' / 'dss_kiss_icp' / 'launch' / 'run.launch.py'
-        if dss_kissicp_launch.exists():
-            self.node.launch_files['kissicp'] = str(dss_kissicp_launch)
-            self.log(f"Found DSS KISS-ICP launch: {dss_kissicp_launch}")
-
-        # Look for DSS SLAM-Toolbox launch files
-        dss_slamtoolbox_launch = SRC_PATH / 'SLAM' / 'SLAM-Toolbox' / 'dss_slam_toolbox' / 'launch' / 'slam_mapping.launch.py'
-        if dss_slamtoolbox_launch.exists():
-            self.node.launch_files['slamtoolbox'] = str(dss_slamtoolbox_launch)
-            self.log(f"Found DSS SLAM-Toolbox launch: {dss_slamtoolbox_launch}")
-
-        dss_slamtoolbox_loc_launch = SRC_PATH / 'SLAM' / 'SLAM-Toolbox' / 'dss_slam_toolbox' / 'launch' / 'slam_localization.launch.py'
-        if dss_slamtoolbox_loc_launch.exists():
-            self.node.launch_files['slamtoolbox_loc'] = str(dss_slamtoolbox_loc_launch)
-            self.log(f"Found DSS SLAM-Toolbox Localization launch: {dss_slamtoolbox_loc_launch}")
-
-        # Look for HDL Graph SLAM launch files
-        hdl_slam_launch = SRC_PATH / 'SLAM' / 'HDL' / 'hdl_graph_slam_ros2' / 'launch' / 'hdl_graph_slam.launch.py'
-        if hdl_slam_launch.exists():
-            self.node.launch_files['hdl_slam'] = str(hdl_slam_launch)
-            self.log(f"Found HDL Graph SLAM launch: {hdl_slam_launch}")
-
-        hdl_loc_launch = SRC_PATH / 'SLAM' / 'HDL' / 'hdl_localization_ros2' / 'hdl_localization' / 'launch' / 'hdl_localization.launch.py'
-        if hdl_loc_launch.exists():
-            self.node.launch_files['hdl_loc'] = str(hdl_loc_launch)
-            self.log(f"Found HDL Localization launch: {hdl_loc_launch}")
-
-    def log(self, message):
-        """Add message to log"""
-        timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
-        self.txtLog.append(f"[{timestamp}] {message}")
-
-    def on_start_dss(self):
-        if self.node.launch_files['dss']:
-            extra_args = ['use_sim_time:=true']
-            if self.node.start_launch_file('dss', self.node.launch_files['dss'], extra_args):
-                self.update_button_states()
-        else:
-            self.log("DSS launch file not configured!")
-            QMessageBox.warning(self, "Error", "DSS launch file not found!")
-
-    def on_stop_dss(self):
-        if self.node.stop_launch_file('dss'):
-            self.update_button_states()
-
-    def on_start_dss_lio_sam(self):
-        if self.node.launch_files['dss_lio_sam']:
-            if self.node.start_launch_file('dss_lio_sam', self.node.launch_files['dss_lio_sam']):
-                self.update_button_states()
-        else:
-            self.log("DSS LIO-SAM launch file not configured!")
-            QMessageBox.warning(self, "Error", "DSS LIO-SAM launch file not found!")
-
-    def on_stop_dss_lio_sam(self):
-        if self.node.stop_launch_file('dss_lio_sam'):
-            self.update_button_states()
-
-    def on_save_dss_lio_sam_map(self):
-        """Save DSS LIO-SAM map using service call with folder selection"""
-        try:
-            # Open folder selection dialog
-            default_path = str(SRC_PATH / "SLAM/LIO-SAM/dss_lio_sam/map")
-            save_dir = QFileDialog.getExistingDirectory(
-                self,
-                "Select Directory to Save Map",
-                default_path,
-                QFileDialog.ShowDirsOnly
-            )
-
-            if not save_dir:
-                self.log("Map save cancelled by user")
-                return
-
-            # Ask for map name
-            from PyQt5.QtWidgets import QInputDialog
-            map_name, ok = QInputDialog.getText(
-                self,
-                "Map Name",
-                "Enter map name (without extension):",
-                text="dss_map"
-            )
-
-            if not ok or not map_name:
-                self.log("Map save cancelled by user")
-                return
-
-            # Full save path
-            save_path = os.path.join(save_dir, map_name)
-
-            self.log(f"Saving map to: {save_path}")
-
-            import subprocess
-
-            # First check if service exists
-            check_result = subprocess.run(
-                ['ros2', 'service', 'list'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if '/lio_sam/save_map' not in check_result.stdout:
-                self.log("Error: /lio_sam/save_map service not found!")
-                self.log("Make sure DSS LIO-SAM is running.")
-                QMessageBox.warning(self, "Error", "save_map service not found!\n\nMake sure DSS LIO-SAM is running.")
-                return
-
-            self.log("Calling save_map service...")
-            result = subprocess.run(
-                ['ros2', 'service', 'call', '/lio_sam/save_map',
-                 'dss_lio_sam/srv/SaveMap',
-                 f'{{"resolution": 0.2, "destination": "{save_path}"}}'],
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-
-            self.log(f"Service call stdout: {result.stdout}")
-            if result.stderr:
-                self.log(f"Service call stderr: {result.stderr}")
-
-            if result.returncode == 0 and 'success=True' in result.stdout:
-                self.log(f"DSS LIO-SAM map saved successfully to: {save_path}")
-                QMessageBox.information(self, "Success", f"Map saved successfully!\n\nLocation: {save_path}")
-            elif result.returncode == 0:
-                self.log(f"Map save completed: {result.stdout}")
-                QMessageBox.information(self, "Complete", f"Map save completed.\n\nCheck: {save_path}")
-            else:
-                self.log(f"Failed to save map: {result.stderr}")
-                QMessageBox.warning(self, "Error", f"Failed to save map:\n{result.stderr}")
-
-        except Exception as e:
-            self.log(f"Failed to save map: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to save map:\n{str(e)}")
-
-    def on_browse_dss_lio_sam_map(self):
-        """Browse for DSS LIO-SAM map folder"""
-        default_path = str(MAP_PATH)
-        map_dir = QFileDialog.getExistingDirectory(
-            self,
-            "Select Map Folder (containing GlobalMap.pcd)",
-            default_path,
-            QFileDialog.ShowDirsOnly
-        )
-        if map_dir:
-            # Check if GlobalMap.pcd exists
-            global_map_path = os.path.join(map_dir, "GlobalMap.pcd")
-            if os.path.exists(global_map_path):
-                self.txtDssLioSamMapPath.setText(global_map_path)
-                self.log(f"Selected map: {global_map_path}")
-            else:
-                self.log(f"Warning: GlobalMap.pcd not found in {map_dir}")
-                QMessageBox.warning(self, "Warning", f"GlobalMap.pcd not found in:\n{map_dir}\n\nPlease select a valid map folder.")
-
-    def on_start_dss_lio_sam_loc(self):
-        """Start DSS LIO-SAM Localization mode"""
-        map_path = self.txtDssLioSamMapPath.text()
-        if not map_path:
-            self.log("Please select a map file first!")
-            QMessageBox.warning(self, "Error", "Please select a map file first!")
-            return
-
-        if not os.path.exists(map_path):
-            self.log(f"Map file not found: {map_path}")
-            QMessageBox.warning(self, "Error", f"Map file not found:\n{map_path}")
-            return
-
-        if self.node.launch_files.get('dss_lio_sam_loc'):
-            extra_args = [f'map_path:={map_path}']
-            if self.node.start_launch_file('dss_lio_sam_loc', self.node.launch_files['dss_lio_sam_loc'], extra_args):
-                self.log(f"Started DSS LIO-SAM Localization with map: {map_path}")
-                self.update_button_states()
-        else:
-            self.log("DSS LIO-SAM Localization launch file not found!")
-            QMessageBox.warning(self, "Error", "DSS LIO-SAM Localization launch file not found!")
-
-    def on_stop_dss_lio_sam_loc(self):
-        """Stop DSS LIO-SAM Localization mode"""
-        if self.node.stop_launch_file('dss_lio_sam_loc'):
-            self.update_button_states()
-
-    def on_browse_rtabmap_db(self):
-        """Browse for RTAB-MAP database path (SLAM mode)"""
-        default_path = str(MAP_PATH)
-        db_path, _ = QFileDialog.getSaveFileName(
-            self,
-            "Select RTAB-MAP Database Path",
-            os.path.join(default_path, "rtabmap.db"),
-            "Database Files (*.db);;All Files (*)"
-        )
-        if db_path:
-            self.txtRtabmapDbPath.setText(db_path)
-            self.log(f"Selected RTAB-MAP database: {db_path}")
-
-    def on_start_rtabmap(self):
-        """Start RTAB-MAP SLAM mode"""
-        db_path = self.txtRtabmapDbPath.text()
-
-        if self.node.launch_files.get('rtabmap'):
-            extra_args = ['use_sim_time:=true']  # Always use simulation time
-            if db_path:
-                extra_args.append(f'database_path:={db_path}')
-                extra_args.append('delete_db_on_start:=true')
-            if self.node.start_launch_file('rtabmap', self.node.launch_files['rtabmap'], extra_args):
-                self.log(f"Started RTAB-MAP SLAM mode")
-                if db_path:
-                    self.log(f"  Database: {db_path}")
-                self.update_button_states()
-        else:
-            self.log("RTAB-MAP launch file not found!")
-            QMessageBox.warning(self, "Error", "RTAB-MAP launch file not found!")
-
-    def on_stop_rtabmap(self):
-        """Stop RTAB-MAP SLAM mode"""
-        if self.node.stop_launch_file('rtabmap'):
-            self.update_button_states()
-
-    def on_save_rtabmap_map(self):
-        """Save RTAB-MAP map by copying database file"""
-        try:
-            # Open folder selection dialog
-            default_path = str(MAP_PATH)
-            save_dir = QFileDialog.getExistingDirectory(
-                self,
-                "Select Directory to Save Map",
-                default_path,
-                QFileDialog.ShowDirsOnly
-            )
-
-            if not save_dir:
-                self.log("Map save cancelled by user")
-                return
-
-            # Ask for map name
-            from PyQt5.QtWidgets import QInputDialog
-            map_name, ok = QInputDialog.getText(
-                self,
-                "Map Name",
-                "Enter map name (without extension):",
-                text="rtabmap_map"
-            )
-
-            if not ok or not map_name:
-                self.log("Map save cancelled by user")
-                return
-
-            # Full save path
-            save_path = os.path.join(save_dir, f"{map_name}.db")
-
-            self.log(f"Saving RTAB-MAP map to: {save_path}")
-
-            # Get current database path from UI or use default
-            current_db_path = self.txtRtabmapDbPath.text()
-            if not current_db_path:
-                current_db_path = os.path.expanduser("~/.ros/rtabmap.db")
-
-            # Expand path
-            current_db_path = os.path.expanduser(current_db_path)
-
-            if not os.path.exists(current_db_path):
-                self.log(f"Database file not found: {current_db_path}")
-                QMessageBox.warning(self, "Error", f"Database file not found:\n{current_db_path}")
-                return
-
-            # Copy the database file
-            import shutil
-            shutil.copy2(current_db_path, save_path)
-
-            self.log(f"RTAB-MAP map saved successfully to: {save_path}")
-            QMessageBox.information(self, "Success", f"Map saved successfully!\n\nLocation: {save_path}")
-
-        except Exception as e:
-            self.log(f"Failed to save map: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to save map:\n{str(e)}")
-
-    def on_browse_rtabmap_loc_db(self):
-        """Browse for existing RTAB-MAP database (Localization mode)"""
-        default_path = str(MAP_PATH)
-        db_path, _ = QFileDialog.getOpenFileName(
-            self,
-            "Select RTAB-MAP Database for Localization",
-            default_path,
-            "Database Files (*.db);;All Files (*)"
-        )
-        if db_path:
-            if os.path.exists(db_path):
-                self.txtRtabmapLocDbPath.setText(db_path)
-                self.log(f"Selected RTAB-MAP map database: {db_path}")
-            else:
-                self.log(f"Database file not found: {db_path}")
-                QMessageBox.warning(self, "Error", f"Database file not found:\n{db_path}")
-
-    def on_start_rtabmap_loc(self):
-        """Start RTAB-MAP Localization mode"""
-        db_path = self.txtRtabmapLocDbPath.text()
-        if not db_path:
-            self.log("Please select a database file first!")
-            QMessageBox.warning(self, "Error", "Please select a database file first!")
-            return
-
-        if not os.path.exists(db_path):
-            self.log(f"Database file not found: {db_path}")
-            QMessageBox.warning(self, "Error", f"Database file not found:\n{db_path}")
-            return
-
-        if self.node.launch_files.get('rtabmap_loc'):
-            # New dedicated localization launch file only needs database_path
-            extra_args = [f'database_path:={db_path}']
-            if self.node.start_launch_file('rtabmap_loc', self.node.launch_files['rtabmap_loc'], extra_args):
-                self.log(f"Started RTAB-MAP Localization with database: {db_path}")
-                self.update_button_states()
-        else:
-            self.log("RTAB-MAP Localization launch file not found!")
-            QMessageBox.warning(self, "Error", "RTAB-MAP Localization launch file not found!")
-
-    def on_stop_rtabmap_loc(self):
-        """Stop RTAB-MAP Localization mode"""
-        if self.node.stop_launch_file('rtabmap_loc'):
-            self.update_button_states()
-
-    def on_start_kissicp(self):
-        """Start KISS-ICP odometry"""
-        if self.node.launch_files.get('kissicp'):
-            extra_args = ['use_sim_time:=true']
-            if self.node.start_launch_file('kissicp', self.node.launch_files['kissicp'], extra_args):
-                self.log("Started KISS-ICP odometry")
-                self.update_button_states()
-        else:
-            self.log("KISS-ICP launch file not found!")
-            QMessageBox.warning(self, "Error", "KISS-ICP launch file not found!")
-
-    def on_stop_kissicp(self):
-        """Stop KISS-ICP odometry"""
-        if self.node.stop_launch_file('kissicp'):
-            self.update_button_states()
-
-    def on_save_kissicp_map(self):
-        """Save KISS-ICP map by calling save_map service"""
-        try:
-            # Open folder selection dialog
-            default_path = str(Path.home() / "ros2_ws/map/kiss_icp_map")
-            save_dir = QFileDialog.getExistingDirectory(
-                self,
-                "Select Directory to Save Map",
-                default_path,
-                QFileDialog.ShowDirsOnly
-            )
-
-            if not save_dir:
-                self.log("Map save cancelled by user")
-                return
-
-            # Ask for map name
-            from PyQt5.QtWidgets import QInputDialog
-            map_name, ok = QInputDialog.getText(
-                self,
-                "Map Name",
-                "Enter map name (without extension):",
-                text="kiss_icp_map"
-            )
-
-            if not ok or not map_name:
-                self.log("Map save cancelled by user")
-                return
-
-            # Full save path
-            save_path = os.path.join(save_dir, f"{map_name}.pcd")
-
-            self.log(f"Saving KISS-ICP map to: {save_path}")
-
-            # Call KISS-ICP save service
-            result = subprocess.run(
-                ['ros2', 'service', 'call', '/kiss_icp/save_map',
-                 'std_srvs/srv/Empty', '{}'],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode == 0:
-                self.log(f"KISS-ICP map save triggered")
-                # Note: KISS-ICP typically saves to a default location
-                # You may need to copy from default location to save_path
-                QMessageBox.information(self, "Info",
-                    f"Map save triggered.\n\nCheck KISS-ICP output for the saved map location.")
-            else:
-                self.log(f"Failed to save map: {result.stderr}")
-                QMessageBox.warning(self, "Error", f"Failed to save map:\n{result.stderr}")
-
-        except Exception as e:
-            self.log(f"Failed to save map: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to save map:\n{str(e)}")
-
-    def on_start_slamtoolbox(self):
-        """Start SLAM-Toolbox mapping mode"""
-        if self.node.launch_files.get('slamtoolbox'):
-            extra_args = ['use_sim_time:=true']
-            if self.node.start_launch_file('slamtoolbox', self.node.launch_files['slamtoolbox'], extra_args):
-                self.log("Started SLAM-Toolbox mapping")
-                self.update_button_states()
-        else:
-            self.log("SLAM-Toolbox launch file not found!")
-            QMessageBox.warning(self, "Error", "SLAM-Toolbox launch file not found!")
-
-    def on_stop_slamtoolbox(self):
-        """Stop SLAM-Toolbox mapping mode"""
-        if self.node.stop_launch_file('slamtoolbox'):
-            self.update_button_states()
-
-    def on_save_slamtoolbox_map(self):
-        """Save SLAM-Toolbox map using service call"""
-        try:
-            # First check if the service exists
-            check_result = subprocess.run(
-                ['ros2', 'service', 'list'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if '/slam_toolbox/serialize_map' not in check_result.stdout:
-                self.log("Error: /slam_toolbox/serialize_map service not found!")
-                self.log("Make sure SLAM-Toolbox is running.")
-                QMessageBox.warning(self, "Error", "serialize_map service not found!\n\nMake sure SLAM-Toolbox is running.")
-                return
-
-            # Create default map directory if it doesn't exist
-            default_map_dir = MAP_PATH / "slam_toolbox_map"
-            default_map_dir.mkdir(parents=True, exist_ok=True)
-
-            # Open folder selection dialog
-            save_dir = QFileDialog.getExistingDirectory(
-                self,
-                "Select Directory to Save Map",
-                str(default_map_dir),
-                QFileDialog.ShowDirsOnly
-            )
-
-            if not save_dir:
-                self.log("Map save cancelled by user")
-                return
-
-            # Ask for map name
-            from PyQt5.QtWidgets import QInputDialog
-            map_name, ok = QInputDialog.getText(
-                self,
-                "Map Name",
-                "Enter map name (without extension):",
-                text="slam_toolbox_map"
-            )
-
-            if not ok or not map_name:
-                self.log("Map save cancelled by user")
-                return
-
-            # Full save path (without extension - SLAM Toolbox adds .posegraph and .data)
-            save_path = os.path.join(save_dir, map_name)
-
-            self.log(f"Saving SLAM-Toolbox map to: {save_path}")
-            self.log("Calling serialize_map service...")
-
-            # Call SLAM-Toolbox serialize_map service
-            result = subprocess.run(
-                ['ros2', 'service', 'call', '/slam_toolbox/serialize_map',
-                 'slam_toolbox/srv/SerializePoseGraph',
-                 f'{{"filename": "{save_path}"}}'],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-
-            self.log(f"Service call stdout: {result.stdout}")
-            if result.stderr:
-                self.log(f"Service call stderr: {result.stderr}")
-
-            # Check result - RESULT_SUCCESS=0, RESULT_FAILED_TO_WRITE_FILE=255
-            if result.returncode == 0 and 'result=0' in result.stdout:
-                # Verify files were created
-                posegraph_file = f"{save_path}.posegraph"
-                data_file = f"{save_path}.data"
-
-                if os.path.exists(posegraph_file) and os.path.exists(data_file):
-                    posegraph_size = os.path.getsize(posegraph_file)
-                    data_size = os.path.getsize(data_file)
-                    self.log(f"SLAM-Toolbox map saved successfully!")
-                    self.log(f"  - {posegraph_file} ({posegraph_size} bytes)")
-                    self.log(f"  - {data_file} ({data_size} bytes)")
-                    QMessageBox.information(self, "Success",
-                        f"Map saved successfully!\n\nFiles:\n- {posegraph_file}\n- {data_file}")
-                else:
-                    self.log(f"Warning: Service returned success but files not found")
-                    QMessageBox.warning(self, "Warning",
-                        f"Service returned success but map files were not found.\n\nExpected:\n- {posegraph_file}\n- {data_file}")
-            elif result.returncode == 0 and 'result=255' in result.stdout:
-                self.log(f"Failed to save map: Could not write to file")
-                QMessageBox.warning(self, "Error",
-                    f"Failed to write map file.\n\nCheck that the directory exists and is writable:\n{save_dir}")
-            else:
-                self.log(f"Failed to save map: {result.stderr if result.stderr else result.stdout}")
-                QMessageBox.warning(self, "Error", f"Failed to save map:\n{result.stderr if result.stderr else 'Unknown error'}")
-
-        except subprocess.TimeoutExpired:
-            self.log("Map save timed out - service call took too long")
-            QMessageBox.warning(self, "Timeout", "Map save operation timed out.\n\nThe map might be too large or the service is not responding.")
-        except Exception as e:
-            self.log(f"Failed to save map: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to save map:\n{str(e)}")
-
-    def on_browse_slamtoolbox_map(self):
-        """Browse for SLAM-Toolbox map file"""
-        default_path = str(MAP_PATH)
-        map_file, _ = QFileDialog.getOpenFileName(
-            self,
-            "Select SLAM-Toolbox Map File",
-            default_path,
-            "PoseGraph Files (*.posegraph);;All Files (*)"
-        )
-        if map_file:
-            # Remove .posegraph extension for SLAM-Toolbox
-            if map_file.endswith('.posegraph'):
-                map_file = map_file[:-10]  # Remove .posegraph
-            self.txtSlamToolboxMapPath.setText(map_file)
-            self.node.slamtoolbox_map_path = map_file
-            self.log(f"Selected SLAM-Toolbox map: {map_file}")
-
-    def on_start_slamtoolbox_loc(self):
-        """Start SLAM-Toolbox localization mode"""
-        map_file = self.txtSlamToolboxMapPath.text()
-        if not map_file:
-            self.log("Please select a map file first!")
-            QMessageBox.warning(self, "Error", "Please select a map file first!")
-            return
-
-        # Check if map files exist
-        if not os.path.exists(f"{map_file}.posegraph"):
-            self.log(f"Map file not found: {map_file}.posegraph")
-            QMessageBox.warning(self, "Error", f"Map file not found:\n{map_file}.posegraph")
-            return
-
-        if self.node.launch_files.get('slamtoolbox_loc'):
-            extra_args = ['use_sim_time:=true', f'map_file:={map_file}']
-            if self.node.start_launch_file('slamtoolbox_loc', self.node.launch_files['slamtoolbox_loc'], extra_args):
-                self.log(f"Started SLAM-Toolbox Localization with map: {map_file}")
-                self.update_button_states()
-        else:
-            self.log("SLAM-Toolbox Localization launch file not found!")
-            QMessageBox.warning(self, "Error", "SLAM-Toolbox Localization launch file not found!")
-
-    def on_stop_slamtoolbox_loc(self):
-        """Stop SLAM-Toolbox localization mode"""
-        if self.node.stop_launch_file('slamtoolbox_loc'):
-            self.update_button_states()
-
-    def on_start_hdl_slam(self):
-        """Start HDL Graph SLAM"""
-        if self.node.launch_files.get('hdl_slam'):
-            if self.node.start_launch_file('hdl_slam', self.node.launch_files['hdl_slam']):
-                self.log("Started HDL Graph SLAM")
-                self.update_button_states()
-        else:
-            self.log("HDL Graph SLAM launch file not found!")
-            QMessageBox.warning(self, "Error", "HDL Graph SLAM launch file not found!")
-
-    def on_stop_hdl_slam(self):
-        """Stop HDL Graph SLAM"""
-        if self.node.stop_launch_file('hdl_slam'):
-            self.update_button_states()
-
-    def on_save_hdl_map(self):
-        """Save HDL Graph SLAM map using service call"""
-        try:
-            # First check if the service exists
-            check_result = subprocess.run(
-                ['ros2', 'service', 'list'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if '/hdl_graph_slam/save_map' not in check_result.stdout:
-                self.log("Error: /hdl_graph_slam/save_map service not found!")
-                self.log("Make sure HDL Graph SLAM is running.")
-                QMessageBox.warning(self, "Error", "save_map service not found!\n\nMake sure HDL Graph SLAM is running.")
-                return
-
-            # Create default map directory if it doesn't exist
-            default_map_dir = Path.home() / "ros2_ws/src/SLAM/HDL/hdl_graph_slam_ros2/map"
-            default_map_dir.mkdir(parents=True, exist_ok=True)
-
-            # Open folder selection dialog
-            save_dir = QFileDialog.getExistingDirectory(
-                self,
-                "Select Directory to Save Map",
-                str(default_map_dir),
-                QFileDialog.ShowDirsOnly
-            )
-
-            if not save_dir:
-                self.log("Map save cancelled by user")
-                return
-
-            # Generate timestamped folder name
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            map_folder = f"map_21_{timestamp}"
-            full_save_dir = os.path.join(save_dir, map_folder)
-            os.makedirs(full_save_dir, exist_ok=True)
-
-            # Full save path (including map.pcd filename)
-            save_path = os.path.join(full_save_dir, "map.pcd")
-
-            self.log(f"Saving HDL map to: {save_path}")
-            self.log("Calling save_map service...")
-
-            # Call HDL Graph SLAM save_map service
-            result = subprocess.run(
-                ['ros2', 'service', 'call', '/hdl_graph_slam/save_map',
-                 'hdl_graph_slam/srv/SaveMap',
-                 f'{{"utm": false, "resolution": 0.05, "destination": "{save_path}"}}'],
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-
-            self.log(f"Service call stdout: {result.stdout}")
-            if result.stderr:
-                self.log(f"Service call stderr: {result.stderr}")
-
-            if result.returncode == 0 and 'success=True' in result.stdout:
-                self.log(f"HDL map saved successfully to: {save_path}")
-                QMessageBox.information(self, "Success", f"Map saved successfully!\n\nLocation: {save_path}")
-            elif result.returncode == 0:
-                self.log(f"Map save completed: {result.stdout}")
-                QMessageBox.information(self, "Complete", f"Map save completed.\n\nCheck: {save_path}")
-            else:
-                self.log(f"Failed to save map: {result.stderr}")
-                QMessageBox.warning(self, "Error", f"Failed to save map:\n{result.stderr}")
-
-        except subprocess.TimeoutExpired:
-            self.log("Map save timed out - service call took too long")
-            QMessageBox.warning(self, "Timeout", "Map save operation timed out.")
-        except Exception as e:
-            self.log(f"Failed to save map: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to save map:\n{str(e)}")
-
-    def on_browse_hdl_map(self):
-        """Browse for HDL map PCD file"""
-        default_path = str(SRC_PATH / "SLAM/HDL/hdl_graph_slam_ros2/map")
-        map_file, _ = QFileDialog.getOpenFileName(
-            self,
-            "Select HDL Map File",
-            default_path,
-            "PCD Files (*.pcd);;All Files (*)"
-        )
-        if map_file:
-            self.txtHdlMapPath.setText(map_file)
-            self.log(f"Selected HDL map: {map_file}")
-
-    def on_start_hdl_loc(self):
-        """Start HDL Localization"""
-        map_file = self.txtHdlMapPath.text()
-        if not map_file:
-            self.log("Please select a map file first!")
-            QMessageBox.warning(self, "Error", "Please select a map file first!")
-            return
-
-        if not os.path.exists(map_file):
-            self.log(f"Map file not found: {map_file}")
-            QMessageBox.warning(self, "Error", f"Map file not found:\n{map_file}")
-            return
-
-        if self.node.launch_files.get('hdl_loc'):
-            # HDL Localization uses params.yaml for map path, so we need to update it
-            # For now, just launch and user can configure params.yaml manually
-            if self.node.start_launch_file('hdl_loc', self.node.launch_files['hdl_loc']):
-                self.log(f"Started HDL Localization")
-                self.log(f"Note: Set initial pose in RViz using '2D Pose Estimate'")
-                self.update_button_states()
-        else:
-            self.log("HDL Localization launch file not found!")
-            QMessageBox.warning(self, "Error", "HDL Localization launch file not found!")
-
-    def on_stop_hdl_loc(self):
-        """Stop HDL Localization"""
-        if self.node.stop_launch_file('hdl_loc'):
-            self.update_button_states()
-
-    def on_start_custom(self):
-        custom_path = self.txtLaunchFile.text()
-        if custom_path:
-            self.node.launch_files['custom'] = custom_path
-            if self.node.start_launch_file('custom', custom_path):
-                self.update_button_states()
-        else:
-            self.log("Please specify a launch file!")
-            QMessageBox.warning(self, "Error", "Please specify a launch file path!")
-
-    def on_stop_custom(self):
-        if self.node.stop_launch_file('custom'):
-            self.update_button_states()
-
-    def on_browse(self):
-        file_path, _ = QFileDialog.getOpenFileName(
-            self,
-            "Select Launch File",
-            str(SRC_PATH),
-            "Launch Files (*.py *.launch.py);;All Files (*)"
-        )
-        if file_path:
-            self.txtLaunchFile.setText(file_path)
-
-    def on_stop_all(self):
-        reply = QMessageBox.question(
-            self,
-            "Confirm",
-            "Stop all running launch files?",
-            QMessageBox.Yes | QMessageBox.No
-        )
-        if reply == QMessageBox.Yes:
-            self.node.stop_all_launches()
-            self.update_button_states()
-
-    def update_sensor_status(self):
-        """Update sensor status labels"""
-        if self.node is None:
-            return
-
-        # LiDAR status
-        lidar_active = self.node.get_sensor_status('lidar')
-        if lidar_active:
-            self.lblLidarStatus.setText("LiDAR: OK")
-            self.lblLidarStatus.setStyleSheet("color: #4CAF50; font-weight: bold;")
-        else:
-            self.lblLidarStatus.setText("LiDAR: --")
-            self.lblLidarStatus.setStyleSheet("color: #666666;")
-
-        # IMU status
-        imu_active = self.node.get_sensor_status('imu')
-        if imu_active:
-            self.lblImuStatus.setText("IMU: OK")
-            self.lblImuStatus.setStyleSheet("color: #4CAF50; font-weight: bold;")
-        else:
-            self.lblImuStatus.setText("IMU: --")
-            self.lblImuStatus.setStyleSheet("color: #666666;")
-
-        # Camera status
-        camera_active = self.node.get_sensor_status('camera')
-        if camera_active:
-            self.lblCameraStatus.setText("Camera: OK")
-            self.lblCameraStatus.setStyleSheet("color: #4CAF50; font-weight: bold;")
-        else:
-            self.lblCameraStatus.setText("Camera: --")
-            self.lblCameraStatus.setStyleSheet("color: #666666;")
-
-        # GPS status
-        gps_active = self.node.get_sensor_status('gps')
-        if gps_active:
-            self.lblGpsStatus.setText("GPS: OK")
-            self.lblGpsStatus.setStyleSheet("color: #4CAF50; font-weight: bold;")
-        else:
-            self.lblGpsStatus.setText("GPS: --")
-            self.lblGpsStatus.setStyleSheet("color: #666666;")
-
-    def update_button_states(self):
-        """Update button enabled/disabled states based on running processes"""
-        if self.node is None:
-            return
-
-        # DSS Bridge
-        dss_running = self.node.is_running('dss')
-        self.btnStartDSS.setEnabled(not dss_running)
-        self.btnStopDSS.setEnabled(dss_running)
-        if dss_running:
-            self.btnStartDSS.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; padding: 10px; }")
-        else:
-            self.btnStartDSS.setStyleSheet("QPushButton { background-color: #2196F3; color: white; font-weight: bold; padding: 10px; } QPushButton:disabled { background-color: #cccccc; color: #666666; }")
-
-        # Livox MID-360 and LIO-SAM tabs removed (DSS-only environment)
-
-        # DSS LIO-SAM (for simulation - requires DSS Bridge)
-        dss_lio_sam_running = self.node.is_running('dss_lio_sam')
-        dss_lio_sam_loc_running = self.node.is_running('dss_lio_sam_loc')
-        self.btnStartDssLioSam.setEnabled(dss_running and not dss_lio_sam_running and not dss_lio_sam_loc_running)
-        self.btnStopDssLioSam.setEnabled(dss_lio_sam_running)
-        self.btnSaveDssLioSamMap.setEnabled(dss_lio_sam_running)
-        if dss_lio_sam_running:
-            self.btnStartDssLioSam.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; padding: 10px; }")
-        else:
-            self.btnStartDssLioSam.setStyleSheet("QPushButton { background-color: #FF5722; color: white; font-weight: bold; padding: 10px; } QPushButton:disabled { background-color: #cccccc; color: #666666; }")
-
-        # DSS LIO-SAM Localization
-        self.btnStartDssLioSamLoc.setEnabled(dss_running and not dss_lio_sam_loc_running and not dss_lio_sam_running)
-        self.btnStopDssLioSamLoc.setEnabled(dss_lio_sam_loc_running)
-        if dss_lio_sam_loc_running:
-            self.btnStartDssLioSamLoc.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; padding: 10px; }")
-        else:
-            self.btnStartDssLioSamLoc.setStyleSheet("QPushButton { background-color: #FF9800; color: white; font-weight: bold; padding: 10px; } QPushButton:disabled { background-color: #cccccc; color: #666666; }")
-
-        # RTAB-MAP SLAM (for simulation - requires DSS Bridge)
-        rtabmap_running = self.node.is_running('rtabmap')
-        rtabmap_loc_running = self.node.is_running('rtabmap_loc')
-        self.btnStartRtabmap.setEnabled(dss_running and not rtabmap_running and not rtabmap_loc_running)
-        self.btnStopRtabmap.setEnabled(rtabmap_running)
-        self.btnSaveRtabmapMap.setEnabled(rtabmap_running)
-        if rtabmap_running:
-            self.btnStartRtabmap.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; padding: 10px; }")
-        else:
-            self.btnStartRtabmap.setStyleSheet("QPushButton { background-color: #00BCD4; color: white; font-weight: bold; padding: 10px; } QPushButton:disabled { background-color: #cccccc; color: #666666; }")
-
-        # RTAB-MAP Localization
-        self.btnStartRtabmapLoc.setEnabled(dss_running and not rtabmap_loc_running and not rtabmap_running)
-        self.btnStopRtabmapLoc.setEnabled(rtabmap_loc_running)
-        if rtabmap_loc_running:
-            self.btnStartRtabmapLoc.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; padding: 10px; }")
-        else:
-            self.btnStartRtabmapLoc.setStyleSheet("QPushButton { background-color: #FF9800; color: white; font-weight: bold; padding: 10px; } QPushButton:disabled { background-color: #cccccc; color: #666666; }")
-
-        # KISS-ICP (requires DSS Bridge for simulation)
-        kissicp_running = self.node.is_running('kissicp')
-        self.btnStartKissIcp.setEnabled(dss_running and not kissicp_running)
-        self.btnStopKissIcp.setEnabled(kissicp_running)
-        self.btnSaveKissIcpMap.setEnabled(kissicp_running)
-        if kissicp_running:
-            self.btnStartKissIcp.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; padding: 10px; }")
-        else:
-            self.btnStartKissIcp.setStyleSheet("QPushButton { background-color: #E91E63; color: white; font-weight: bold; padding: 10px; } QPushButton:disabled { background-color: #cccccc; color: #666666; }")
-
-        # SLAM-Toolbox (requires DSS Bridge for simulation)
-        slamtoolbox_running = self.node.is_running('slamtoolbox')
-        slamtoolbox_loc_running = self.node.is_running('slamtoolbox_loc')
-        self.btnStartSlamToolbox.setEnabled(dss_running and not slamtoolbox_running and not slamtoolbox_loc_running)
-        self.btnStopSlamToolbox.setEnabled(slamtoolbox_running)
-        self.btnSaveSlamToolboxMap.setEnabled(slamtoolbox_running)
-        if slamtoolbox_running:
-            self.btnStartSlamToolbox.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; padding: 10px; }")
-        else:
-            self.btnStartSlamToolbox.setStyleSheet("QPushButton { background-color: #673AB7; color: white; font-weight: bold; padding: 10px; } QPushButton:disabled { background-color: #cccccc; color: #666666; }")
-
-        # SLAM-Toolbox Localization
-        self.btnStartSlamToolboxLoc.setEnabled(dss_running and not slamtoolbox_loc_running and not slamtoolbox_running)
-        self.btnStopSlamToolboxLoc.setEnabled(slamtoolbox_loc_running)
-        if slamtoolbox_loc_running:
-            self.btnStartSlamToolboxLoc.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; padding: 10px; }")
+    def is_ready(self, launch_key):
+        """Check if a launch is running and exposes its expected graph interfaces"""
+        return self.is_running(launch_key) and self.processes[launch_key].ready_at is not None
+
+    def _log_to_ros(self, message, level=None, launch_key=None):
+        if launch_key:
+            message = f"[{launch_key}] {message}"
+        logger = self.get_logger()
+        level = level or infer_level(message)
+        if level == 'ERROR':
+            logger.error(message)
+        elif level == 'WARN':
+            logger.warn(message)
+        elif level == 'DEBUG':
+            logger.debug(message)
         else:
-            self.btnStartSlamToolboxLoc.setStyleSheet("QPushButton { background-color: #FF9800; color: white; font-weight: bold; padding: 10px; } QPushButton:disabled { background-color: #cccccc; color: #666666; }")
-
-        # HDL Graph SLAM (requires DSS Bridge for simulation)
-        hdl_slam_running = self.node.is_running('hdl_slam')
-        hdl_loc_running = self.node.is_running('hdl_loc')
-        self.btnStartHdlSlam.setEnabled(dss_running and not hdl_slam_running and not hdl_loc_running)
-        self.btnStopHdlSlam.setEnabled(hdl_slam_running)
-        self.btnSaveHdlMap.setEnabled(hdl_slam_running)
-        if hdl_slam_running:
-            self.btnStartHdlSlam.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; padding: 10px; }")
+            logger.info(message)
+
+    def launch_argument(self, launch_key, name):
+        """Value of a name:=value argument the running launch_key was started with"""
+        for argument in self.launch_args.get(launch_key) or ():
+            key, sep, value = argument.partition(':=')
+            if sep and key == name:
+                return value
+        return None
+
+    def auto_detect_launch_files(self, wait=False):
+        """Auto-detect launch files from the launch file index (workspace and installed)
+
+        Never scans on the calling thread unless wait is set: without a cached
+        index the DSS workspace defaults are used until the background scan
+        resolves the rest.
+        """
+        index = self.launch_index
+        if index.load():
+            self._resolve_launch_files(index)
+        elif wait:
+            index.rebuild()
+            self._resolve_launch_files(index)
         else:
-            self.btnStartHdlSlam.setStyleSheet("QPushButton { background-color: #009688; color: white; font-weight: bold; padding: 10px; } QPushButton:disabled { background-color: #cccccc; color: #666666; }")
-
-        # HDL Localization
-        self.btnStartHdlLoc.setEnabled(dss_running and not hdl_loc_running and not hdl_slam_running)
-        self.btnStopHdlLoc.setEnabled(hdl_loc_running)
-        if hdl_loc_running:
-            self.btnStartHdlLoc.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; padding: 10px; }")
-        else:
-            self.btnStartHdlLoc.setStyleSheet("QPushButton { background-color: #FF9800; color: white; font-weight: bold; padding: 10px; } QPushButton:disabled { background-color: #cccccc; color: #666666; }")
-
-        # Custom
-        custom_running = self.node.is_running('custom')
-        self.btnStartCustom.setEnabled(not custom_running)
-        self.btnStopCustom.setEnabled(custom_running)
-
-    def closeEvent(self, event):
-        """Handle window close event"""
-        reply = QMessageBox.question(
-            self,
-            "Confirm Exit",
-            "Stop all launches and exit?",
-            QMessageBox.Yes | QMessageBox.No
-        )
-
-        if reply == QMessageBox.Yes:
-            if self.node:
-                self.node.stop_all_launches()
-            event.accept()
-        else:
-            event.ignore()
+            # First start (or workspace moved): nothing cached yet
+            self._use_default_launch_files()
+            self.log("Indexing launch files in the background...")
+        # The cached index may be out of date; a refresh re-resolves if it was
+        index.refresh_async(self._on_launch_index_changed)
+
+    def _use_default_launch_files(self):
+        with self.launch_files_lock:
+            for launch_key, relative_path in DEFAULT_LAUNCH_FILES.items():
+                path = SRC_PATH / relative_path
+                if self.launch_files.get(launch_key) is None and path.exists():
+                    self.launch_files[launch_key] = str(path)
+                    self.log(f"Found {BACKEND_LAUNCH_FILES[launch_key][2]} launch: {path}")
+            paths = [path for path in self.launch_files.values() if path]
+        self.launch_arguments.prefetch(paths)
+
+    def _resolve_launch_files(self, index):
+        with self.launch_files_lock:
+            for launch_key, (package, filename, description) in BACKEND_LAUNCH_FILES.items():
+                # The package, or failing that a known alias (e.g. the workspace directory name)
+                candidates = (package,) + BACKEND_PACKAGES.get(launch_key, ())
+                path = next(filter(None, (index.find(name, filename) for name in candidates)), None)
+                current = self.launch_files.get(launch_key)
+                if path is not None and path != current:
+                    self.launch_files[launch_key] = path
+                    self.log(f"Found {description} launch: {path}")
+                elif path is None and current is not None and not os.path.exists(current):
+                    self.launch_files[launch_key] = None
+                    self.log(f"{description} launch file is gone: {current}", level='WARN')
+            paths = [path for path in self.launch_files.values() if path]
+        # Have the declared arguments ready before the first start
+        self.launch_arguments.prefetch(paths)
+
+    def _on_launch_index_changed(self, index):
+        """Called from the index refresh thread when the set of launch files changed"""
+        self._resolve_launch_files(index)
+        for callback in list(self.launch_index_listeners):
+            try:
+                callback()
+            except Exception:
+                pass
 
 
-def main(args=None):
-    # Initialize ROS2
-    rclpy.init(args=args)
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def run_headless(node):
+    """Serve the launch services until SIGINT/SIGTERM, then stop every launch"""
+    from slam_launch_manager.launch_services import LaunchServices
+
+    # No window to keep responsive; the services need the paths right away
+    node.auto_detect_launch_files(wait=True)
+    services = LaunchServices(node, MAP_PATH)
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    node.get_logger().info('Running headless; use the ~/start, ~/stop, ~/status and ~/save_map services')
+    executor = MultiThreadedExecutor()
+    executor.add_node(node)
+    try:
+        executor.spin()
+    except (KeyboardInterrupt, ExternalShutdownException):
+        pass
+    finally:
+        executor.shutdown()
+        node.shutdown()
+        services.destroy()
+    return 0
+
+
+def run_gui(args):
+    """Qt window driving the node in-process (the services stay available)"""
+    # Qt is only imported here so that headless mode works without PyQt5/a display
+    from PyQt5 import QtWidgets
+    from PyQt5.QtCore import QSocketNotifier
+    from slam_launch_manager.launch_manager_ui import SlamLaunchManagerUI
+    from slam_launch_manager.launch_services import LaunchServices
 
     # Create Qt Application
-    app = QtWidgets.QApplication(sys.argv)
+    app = QtWidgets.QApplication(args)
 
     # Create UI
     ui = SlamLaunchManagerUI()
 
     # Create ROS2 Node
-    node = SlamLaunchManagerNode(ui)
+    node = SlamLaunchManagerNode(log=ui.log, defer_subscriptions=True)
     ui.set_node(node)
 
-    # Show UI
+    # Show UI; everything the first frame does not need is set up after it
     ui.show()
+    services = []
+    ui.after_first_paint(node.create_sensor_subscriptions)
+    ui.after_first_paint(lambda: services.append(LaunchServices(node, MAP_PATH)))
+
+    # Callbacks run on executor threads; the UI hears about them through
+    # the Qt signals connected in set_node()
+    spin_thread = RosSpinThread(node)
+    spin_thread.start()
+
+    # SIGINT/SIGTERM close the window (stopping every launch) without asking.
+    # Python only runs signal handlers between bytecodes, so the wakeup fd
+    # makes a signal wake the Qt loop instead of waiting for other events
+    def request_shutdown(signum, frame):
+        ui.shutdown_requested = True
+        ui.close()
+
+    wakeup_read, wakeup_write = os.pipe()
+    os.set_blocking(wakeup_read, False)
+    os.set_blocking(wakeup_write, False)
+    signal.set_wakeup_fd(wakeup_write)
+    wakeup_notifier = QSocketNotifier(wakeup_read, QSocketNotifier.Read)
+    wakeup_notifier.activated.connect(lambda _fd: os.read(wakeup_read, 512))
+    signal.signal(signal.SIGINT, request_shutdown)
+    signal.signal(signal.SIGTERM, request_shutdown)
 
-    # Timer for ROS2 spinning
-    ros_timer = QTimer()
+    # Run Qt event loop
+    exit_code = app.exec_()
 
-    def spin_ros():
-        if rclpy.ok():
-            try:
-                rclpy.spin_once(node, timeout_sec=0)
-            except Exception:
-                pass
+    # Cleanup - stop spinning (waiting for running callbacks) before rclpy shuts down
+    signal.set_wakeup_fd(-1)
+    wakeup_notifier.setEnabled(False)
+    os.close(wakeup_read)
+    os.close(wakeup_write)
+    spin_thread.stop()
+    for launch_services in services:
+        launch_services.destroy()
+    return exit_code, node
 
-    ros_timer.timeout.connect(spin_ros)
-    ros_timer.start(10)  # Spin every 10ms
 
-    # Run Qt event loop
-    exit_code = app.exec_()
+def main(args=None):
+    argv = sys.argv if args is None else args
+    headless = '--headless' in remove_ros_args(argv)
+
+    # Initialize ROS2
+    rclpy.init(args=args)
+
+    if headless:
+        node = SlamLaunchManagerNode()
+        exit_code = run_headless(node)
+    else:
+        exit_code, node = run_gui([arg for arg in argv if arg != '--headless'])
 
-    # Cleanup - stop timer first before shutting down rclpy
-    ros_timer.stop()
     node.destroy_node()
     rclpy.shutdown()
 
@@ -0,0 +1,224 @@
+"""Session/process-group and cgroup v2 scoped teardown of launches"""
+
+import errno
+import os
+import select
+import signal
+import time
+from collections import namedtuple
+
+from slam_launch_manager.proc_tree import ProcessSnapshot, read_process
+
+TeardownResult = namedtuple('TeardownResult', ['stopped', 'last_signal', 'elapsed', 'survivors'])
+
+
+def cgroup2_mount():
+    """Mount point of the cgroup v2 hierarchy (/sys/fs/cgroup, or .../unified on hybrid setups)"""
+    try:
+        with open('/proc/self/mounts') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) > 2 and fields[2] == 'cgroup2':
+                    return fields[1]
+    except OSError:
+        pass
+    return None
+
+
+def session_members(sid, snapshot=None):
+    """Live (non-zombie) processes of a session"""
+    snapshot = snapshot or ProcessSnapshot.take()
+    return [info for info in snapshot.session(sid) if info.state != 'Z']
+
+
+class LaunchCgroup:
+    """A cgroup v2 directory holding every process of one launch"""
+
+    def __init__(self, path):
+        self.path = path
+
+    @property
+    def procs_file(self):
+        return os.path.join(self.path, 'cgroup.procs')
+
+    def add(self, pid):
+        with open(self.procs_file, 'w') as f:
+            f.write(str(pid))
+
+    def pids(self):
+        """Live (non-zombie) processes in the cgroup"""
+        try:
+            with open(self.procs_file) as f:
+                pids = [int(line) for line in f if line.strip()]
+        except OSError:
+            return []
+        # An unreaped zombie stays listed until its parent collects it
+        return [pid for pid in pids
+                if (info := read_process(pid)) is not None and info.state != 'Z']
+
+    def populated(self):
+        return bool(self.pids())
+
+    def wait_empty(self, timeout):
+        """Block until the cgroup has no processes; cgroup.events wakes poll() on change"""
+        deadline = time.monotonic() + timeout
+        try:
+            fd = os.open(os.path.join(self.path, 'cgroup.events'), os.O_RDONLY)
+        except OSError:
+            fd = None
+        try:
+            poller = select.poll()
+            if fd is not None:
+                poller.register(fd, select.POLLPRI | select.POLLERR)
+            while self.populated():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                # Cap the wait in case notifications are unsupported on this kernel
+                poller.poll(min(remaining, 0.2) * 1000.0)
+            return True
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+    def kill(self):
+        """SIGKILL everything in the cgroup with a single cgroup.kill write"""
+        try:
+            with open(os.path.join(self.path, 'cgroup.kill'), 'w') as f:
+                f.write('1')
+            return
+        except OSError as e:
+            if e.errno not in (errno.ENOENT, errno.EINVAL, errno.EACCES, errno.EPERM):
+                raise
+        # Kernels before 5.14 have no cgroup.kill
+        for pid in self.pids():
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def remove(self):
+        try:
+            os.rmdir(self.path)
+        except OSError:
+            pass
+
+
+class LaunchCgroups:
+    """Creates one cgroup per launch below the manager's own (delegated) cgroup"""
+
+    def __init__(self, base_path=None):
+        self.base_path = base_path or self._default_base_path()
+
+    @staticmethod
+    def _default_base_path():
+        mount = cgroup2_mount()
+        if mount is None:
+            return None
+        try:
+            with open('/proc/self/cgroup') as f:
+                for line in f:
+                    # cgroup v2 unified hierarchy entry: "0::/user.slice/..."
+                    if line.startswith('0::'):
+                        own = line[3:].strip().lstrip('/')
+                        return os.path.join(mount, own, 'slam_launch_manager')
+        except OSError:
+            pass
+        return None
+
+    def available(self):
+        if self.base_path is None:
+            return False
+        # The parent must be a real cgroup directory, not e.g. a tmpfs
+        if not os.path.exists(os.path.join(os.path.dirname(self.base_path), 'cgroup.procs')):
+            return False
+        try:
+            os.makedirs(self.base_path, exist_ok=True)
+        except OSError:
+            return False
+        return os.access(self.base_path, os.W_OK)
+
+    def create(self, launch_key):
+        """New empty cgroup for a launch, None if cgroups cannot be used here"""
+        if not self.available():
+            return None
+        path = os.path.join(self.base_path, f'{launch_key}-{os.getpid()}-{time.monotonic_ns()}')
+        try:
+            os.mkdir(path)
+        except OSError:
+            return None
+        return LaunchCgroup(path)
+
+
+class GroupTeardown:
+    """Stops a launch by signalling its whole session instead of PID by PID
+
+    Every launch runs in its own session, so SIGINT goes to each process group
+    of that session - exactly what Ctrl-C in a terminal does. The stop returns
+    as soon as the session (or the launch's cgroup) is empty, escalating to
+    SIGTERM and then SIGKILL only when a stage's timeout runs out.
+    """
+
+    STAGES = ((signal.SIGINT, 'sigint_timeout'),
+              (signal.SIGTERM, 'sigterm_timeout'),
+              (signal.SIGKILL, 'sigkill_timeout'))
+
+    def __init__(self, sigint_timeout=5.0, sigterm_timeout=3.0, sigkill_timeout=2.0,
+                 poll_interval=0.05):
+        self.sigint_timeout = sigint_timeout
+        self.sigterm_timeout = sigterm_timeout
+        self.sigkill_timeout = sigkill_timeout
+        self.poll_interval = poll_interval
+
+    def stop(self, sid, cgroup=None, log=None):
+        """Tear down session sid (and cgroup if given), returns a TeardownResult"""
+        started = time.monotonic()
+        last_signal = None
+        for sig, timeout_attr in self.STAGES:
+            if self._empty(sid, cgroup):
+                break
+            if sig == signal.SIGKILL and cgroup is not None:
+                cgroup.kill()
+            else:
+                self.signal_session(sid, sig)
+            last_signal = sig
+            if log is not None and sig != signal.SIGINT:
+                log(f"Escalating to {signal.Signals(sig).name} for session {sid}")
+            if self._wait_empty(sid, cgroup, getattr(self, timeout_attr)):
+                break
+
+        survivors = [info.pid for info in session_members(sid)]
+        if cgroup is not None:
+            survivors.extend(pid for pid in cgroup.pids() if pid not in survivors)
+            if not survivors:
+                cgroup.remove()
+        return TeardownResult(not survivors, last_signal, time.monotonic() - started, survivors)
+
+    @staticmethod
+    def signal_session(sid, sig):
+        """Send sig to every process group of the session"""
+        pgids = {info.pgid for info in session_members(sid)}
+        pgids.add(sid)
+        for pgid in pgids:
+            try:
+                os.killpg(pgid, sig)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+    @staticmethod
+    def _empty(sid, cgroup):
+        if session_members(sid):
+            return False
+        return cgroup is None or not cgroup.populated()
+
+    def _wait_empty(self, sid, cgroup, timeout):
+        deadline = time.monotonic() + timeout
+        if cgroup is not None:
+            # The cgroup also holds processes that left the session (setsid daemons)
+            if not cgroup.wait_empty(timeout):
+                return False
+        while not self._empty(sid, None):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+        return True
@@ -0,0 +1,97 @@
+"""Precompiled Qt Designer forms: build-time pyuic compile with a runtime loadUi fallback
+
+    python3 -m slam_launch_manager.ui_compiler [path/to/form.ui ...]
+
+compiles each form to ui_<name>.py next to it (the build/install step).
+load_ui() uses that module when it is at least as new as the .ui file;
+otherwise it parses the .ui with uic.loadUi as before and writes a compiled
+copy to the user cache in the background, so the next start is fast even
+without the build step.
+"""
+
+import importlib.util
+import io
+import os
+import sys
+import threading
+from pathlib import Path
+
+UI_CACHE_DIR = Path.home() / '.cache' / 'slam_launch_manager' / 'ui'
+
+
+def compiled_path(ui_file):
+    ui_file = Path(ui_file)
+    return ui_file.with_name(f'ui_{ui_file.stem}.py')
+
+
+def compile_ui(ui_file, py_file=None):
+    """Compile ui_file with pyuic into py_file (written atomically), returns py_file"""
+    from PyQt5 import uic
+
+    ui_file = Path(ui_file)
+    py_file = Path(py_file) if py_file else compiled_path(ui_file)
+    source = io.StringIO()
+    uic.compileUi(str(ui_file), source, from_imports=False)
+    py_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = py_file.with_name(f'.{py_file.name}.{os.getpid()}.tmp')
+    tmp_file.write_text(source.getvalue())
+    os.replace(tmp_file, py_file)
+    return py_file
+
+
+def _fresh(py_file, ui_file):
+    try:
+        return py_file.stat().st_mtime >= ui_file.stat().st_mtime
+    except OSError:
+        return False
+
+
+def _form_class(py_file):
+    spec = importlib.util.spec_from_file_location(f'_compiled_{py_file.stem}', py_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for name, value in vars(module).items():
+        if name.startswith('Ui_') and isinstance(value, type):
+            return value
+    raise ImportError(f'no Ui_* class in {py_file}')
+
+
+def load_ui(ui_file, widget):
+    """Set up widget from ui_file, preferring a precompiled module; returns 'compiled' or 'loadUi'"""
+    ui_file = Path(ui_file)
+    for py_file in (compiled_path(ui_file), UI_CACHE_DIR / compiled_path(ui_file).name):
+        if _fresh(py_file, ui_file):
+            try:
+                form = _form_class(py_file)()
+                form.setupUi(widget)
+            except Exception:
+                continue  # e.g. compiled by an incompatible pyuic, use the .ui file
+            # loadUi puts the child widgets on the widget itself; do the same
+            for name, value in vars(form).items():
+                setattr(widget, name, value)
+            return 'compiled'
+
+    from PyQt5 import uic
+    uic.loadUi(str(ui_file), widget)
+    cache_file = UI_CACHE_DIR / compiled_path(ui_file).name
+    threading.Thread(target=_compile_quietly, args=(ui_file, cache_file), daemon=True).start()
+    return 'loadUi'
+
+
+def _compile_quietly(ui_file, py_file):
+    try:
+        compile_ui(ui_file, py_file)
+    except Exception:
+        pass
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    ui_files = argv or [str(Path(__file__).parent / 'ui' / 'slam_launch_manager.ui')]
+    for ui_file in ui_files:
+        print(f'{ui_file} -> {compile_ui(ui_file)}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())